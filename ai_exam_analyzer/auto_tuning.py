@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from ai_exam_analyzer.llm_clients import build_llm_client, call_json_schema
 from ai_exam_analyzer.model_profiles import QUALITY_PROFILE_LABELS, QUALITY_PROFILE_OPTIONS, get_quality_cost_profile
-from ai_exam_analyzer.preprocessing import compute_preprocessing_assessment
+from ai_exam_analyzer.preprocessing import compute_preprocessing_assessments
 from ai_exam_analyzer.cost_tracking import add_records, estimate_tokens_from_text, format_eur, make_cost_record
 
 
@@ -22,7 +22,7 @@ def _load_context_doc() -> str:
 
 def _dataset_profile(questions: List[Dict[str, Any]]) -> Dict[str, Any]:
     total = max(1, len(questions))
-    assessments = [compute_preprocessing_assessment(q) for q in questions]
+    assessments = compute_preprocessing_assessments(questions)
     avg_quality = sum(float((a.get("qualityScore") or 0.0)) for a in assessments) / float(total)
     force_manual = sum(1 for a in assessments if bool((a.get("gates") or {}).get("forceManualReview")))
     blocked_auto = sum(1 for a in assessments if not bool((a.get("gates") or {}).get("allowAutoChange", True)))
@@ -1,52 +1,180 @@
 """Dataset cleanup helpers based on a JSON whitelist spec."""
 
 from copy import deepcopy
-from typing import Any, Dict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 _DROP = object()
 
+RuleFn = Callable[[Any], Any]
 
-def _filter_by_rule(value: Any, rule: Any) -> Any:
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _fast_json_copy(value: Any) -> Any:
+    """Copy JSON-shaped data; immutable scalars are shared instead of copied."""
+    if isinstance(value, _JSON_SCALARS):
+        return value
+    if isinstance(value, dict):
+        return {k: _fast_json_copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fast_json_copy(v) for v in value]
+    return deepcopy(value)
+
+
+def _share(value: Any) -> Any:
+    return value
+
+
+def _drop_all(value: Any) -> Any:
+    return _DROP
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSpec:
+    """A compiled whitelist rule; keeps the raw rule for in-place pruning."""
+
+    rule: Any
+    fn: RuleFn
+
+    def __call__(self, value: Any) -> Any:
+        return self.fn(value)
+
+
+def compile_spec(rule: Any, *, share_leaves: bool = False) -> CompiledSpec:
+    """Compile a whitelist rule once into a tree of filter functions.
+
+    The returned callable takes a value and returns its filtered copy (or the
+    internal drop marker when the rule does not match the value type).
+    With ``share_leaves`` whitelisted subtrees are referenced instead of copied;
+    use it only when the cleaned result is serialized and never mutated.
+    """
+    return CompiledSpec(rule=rule, fn=_compile(rule, _share if share_leaves else _fast_json_copy)[1])
+
+
+def _compile(rule: Any, copy_leaf: RuleFn) -> Tuple[bool, RuleFn]:
+    """Return ``(is_total, fn)``; total functions never return ``_DROP``."""
+    if rule is True:
+        return True, copy_leaf
+
+    if isinstance(rule, list):
+        keys = list(rule)
+
+        def keep_keys(value: Any) -> Any:
+            if not isinstance(value, dict):
+                return _DROP
+            return {k: copy_leaf(value[k]) for k in keys if k in value}
+
+        return False, keep_keys
+
+    if not isinstance(rule, dict):
+        return False, _drop_all
+
+    compiled = {k: (None if v is None else _compile(v, copy_leaf)) for k, v in rule.items()}
+    children_total = all(c is None or c[0] for c in compiled.values())
+    per_key: Dict[str, Optional[RuleFn]] = {k: (None if c is None else c[1]) for k, c in compiled.items() if k != "*"}
+    wildcard = None if compiled.get("*") is None else compiled["*"][1]
+
+    if children_total:
+        # No child can drop its value, so skip the per-item drop check.
+        def filter_node(value: Any) -> Any:
+            if isinstance(value, dict):
+                return {
+                    key: fn(item)
+                    for key, item in value.items()
+                    if (fn := per_key.get(key, wildcard)) is not None
+                }
+            if isinstance(value, list):
+                return [] if wildcard is None else list(map(wildcard, value))
+            return _DROP
+
+        return False, filter_node
+
+    def filter_node(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: out
+                for key, item in value.items()
+                if (fn := per_key.get(key, wildcard)) is not None and (out := fn(item)) is not _DROP
+            }
+
+        if isinstance(value, list):
+            if wildcard is None:
+                return []
+            return [out for out in map(wildcard, value) if out is not _DROP]
+
+        return _DROP
+
+    return False, filter_node
+
+
+def _prune_in_place(value: Any, rule: Any) -> Any:
+    """Apply ``rule`` by deleting keys from ``value`` instead of copying it.
+
+    Mirrors the compiled filters: returns the (mutated) value, a replacement
+    for it, or ``_DROP``.
+    """
     if rule is True:
-        return deepcopy(value)
+        return value
 
     if isinstance(rule, list):
         if not isinstance(value, dict):
             return _DROP
-        return {k: deepcopy(value[k]) for k in rule if k in value}
+        # Rebuilt rather than pruned so key order follows the spec like the copy path.
+        return {k: value[k] for k in rule if k in value}
 
     if not isinstance(rule, dict):
         return _DROP
 
+    wildcard = rule.get("*")
     if isinstance(value, dict):
-        wildcard_rule = rule.get("*")
-        filtered: Dict[str, Any] = {}
-        for key, item in value.items():
-            chosen_rule = rule.get(key, wildcard_rule)
-            if chosen_rule is None:
+        for key in list(value.keys()):
+            child_rule = wildcard if key == "*" else rule.get(key, wildcard)
+            if child_rule is None:
+                del value[key]
                 continue
-            out = _filter_by_rule(item, chosen_rule)
-            if out is not _DROP:
-                filtered[key] = out
-        return filtered
+            item = value[key]
+            out = _prune_in_place(item, child_rule)
+            if out is _DROP:
+                del value[key]
+            elif out is not item:
+                value[key] = out
+        return value
 
     if isinstance(value, list):
-        item_rule = rule.get("*")
-        if item_rule is None:
-            return []
-        filtered_list = []
-        for item in value:
-            out = _filter_by_rule(item, item_rule)
-            if out is not _DROP:
-                filtered_list.append(out)
-        return filtered_list
+        if wildcard is None:
+            value.clear()
+        else:
+            value[:] = [out for out in (_prune_in_place(v, wildcard) for v in value) if out is not _DROP]
+        return value
 
     return _DROP
 
 
-def cleanup_dataset(data: Any, cleanup_spec: Dict[str, Any]) -> Any:
-    """Return a cleaned copy of ``data`` that only keeps keys listed in ``cleanup_spec``."""
-    cleaned = _filter_by_rule(data, cleanup_spec)
+def cleanup_dataset(
+    data: Any,
+    cleanup_spec: Union[Dict[str, Any], RuleFn],
+    *,
+    inplace: bool = False,
+) -> Any:
+    """Return a cleaned copy of ``data`` that only keeps keys listed in ``cleanup_spec``.
+
+    ``cleanup_spec`` may be a raw whitelist spec or the result of ``compile_spec``.
+    With ``inplace`` the non-whitelisted keys are deleted from ``data`` itself
+    (whitelisted values are kept by reference); only use it when ``data`` is not
+    needed anymore, e.g. right before the final dump.
+    """
+    if inplace:
+        rule = cleanup_spec.rule if isinstance(cleanup_spec, CompiledSpec) else cleanup_spec
+        if not callable(rule):
+            cleaned = _prune_in_place(data, rule)
+            if cleaned is _DROP:
+                raise ValueError("Cleanup spec does not match dataset root type.")
+            return cleaned
+    if cleanup_spec is True:
+        return _fast_json_copy(data)
+    rule_fn = cleanup_spec if callable(cleanup_spec) else compile_spec(cleanup_spec)
+    cleaned = rule_fn(data)
     if cleaned is _DROP:
         raise ValueError("Cleanup spec does not match dataset root type.")
     return cleaned
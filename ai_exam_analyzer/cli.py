@@ -1,162 +1,168 @@
 """Command line interface for the analyzer pipeline."""
 
 import argparse
+import hashlib
+import json
 import os
+import pickle
+import sys
+import tempfile
+from typing import Any, Tuple
 
+from ai_exam_analyzer.cleanup import compile_spec
 from ai_exam_analyzer.config import CONFIG
-from ai_exam_analyzer.image_store import QuestionImageStore
-from ai_exam_analyzer.io_utils import load_json
+from ai_exam_analyzer.io_utils import extract_questions, load_json
 from ai_exam_analyzer.model_profiles import QUALITY_PROFILE_OPTIONS, apply_model_optimized_defaults
-from ai_exam_analyzer.knowledge_base import (
-    build_knowledge_base_from_zip,
-    load_index_json,
-    save_index_json,
-)
-from ai_exam_analyzer.processor import process_questions
-from ai_exam_analyzer.schemas import (
-    schema_abstraction_cluster_refinement,
-    schema_explainer_pass,
-    schema_pass_a,
-    schema_pass_b,
-    schema_reconstruction_pass,
-    schema_review_pass,
-)
-from ai_exam_analyzer.topic_catalog import build_topic_catalog, format_topic_catalog_for_prompt
+
+_TOPIC_CACHE_SUBDIR = "topics"
+
+# Heavier pipeline modules (processor, image store, knowledge base, schemas)
+# are imported inside main() so `--help` and early argument errors stay cheap.
 
 
 def build_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser()
 
-    ap.add_argument("--input", default=CONFIG["INPUT_PATH"], help="Input dataset JSON (original or in-progress annotated)")
-    ap.add_argument("--topics", default=CONFIG["TOPICS_PATH"], help="Topic tree JSON (superTopics/subtopics)")
-    ap.add_argument("--output", default=CONFIG["OUTPUT_PATH"], help="Output JSON path")
+    ap.add_argument("--input", default=CONFIG.INPUT_PATH, help="Input dataset JSON (original or in-progress annotated)")
+    ap.add_argument("--topics", default=CONFIG.TOPICS_PATH, help="Topic tree JSON (superTopics/subtopics)")
+    ap.add_argument("--output", default=CONFIG.OUTPUT_PATH, help="Output JSON path")
 
-    ap.add_argument("--resume", dest="resume", action="store_true", default=CONFIG["RESUME"],
+    ap.add_argument("--resume", dest="resume", action="store_true", default=CONFIG.RESUME,
                     help="Skip questions already completed with this pipelineVersion")
     ap.add_argument("--no-resume", dest="resume", action="store_false",
                     help="Do not skip completed questions")
-    ap.add_argument("--limit", type=int, default=CONFIG["LIMIT"], help="Only process first N questions (0 = all)")
-    ap.add_argument("--checkpoint-every", type=int, default=CONFIG["CHECKPOINT_EVERY"],
+    ap.add_argument("--limit", type=int, default=CONFIG.LIMIT, help="Only process first N questions (0 = all)")
+    ap.add_argument("--checkpoint-every", type=int, default=CONFIG.CHECKPOINT_EVERY,
                     help="Save after every N processed questions")
-    ap.add_argument("--sleep", type=float, default=CONFIG["SLEEP"], help="Sleep seconds between questions")
+    ap.add_argument("--sleep", type=float, default=CONFIG.SLEEP, help="Sleep seconds between questions")
 
-    ap.add_argument("--llm-provider", default=CONFIG["LLM_PROVIDER"], choices=["openai", "gemini"],
+    ap.add_argument("--llm-provider", default=CONFIG.LLM_PROVIDER, choices=["openai", "gemini"],
                     help="LLM provider for all passes")
-    ap.add_argument("--quality-cost-profile", default=CONFIG["QUALITY_COST_PROFILE"], choices=QUALITY_PROFILE_OPTIONS,
+    ap.add_argument("--quality-cost-profile", default=CONFIG.QUALITY_COST_PROFILE, choices=QUALITY_PROFILE_OPTIONS,
                     help="Workflow priority: highest_quality, quality, cost_optimized, or fully_cost_optimized")
-    ap.add_argument("--passA-model", default=CONFIG["PASSA_MODEL"])
-    ap.add_argument("--passB-model", default=CONFIG["PASSB_MODEL"])
-    ap.add_argument("--passA-temperature", type=float, default=CONFIG["PASSA_TEMPERATURE"])
-    ap.add_argument("--passB-reasoning-effort", default=CONFIG["PASSB_REASONING_EFFORT"],
+    ap.add_argument("--passA-model", default=CONFIG.PASSA_MODEL)
+    ap.add_argument("--passB-model", default=CONFIG.PASSB_MODEL)
+    ap.add_argument("--passA-temperature", type=float, default=CONFIG.PASSA_TEMPERATURE)
+    ap.add_argument("--passA-reuse-similarity", type=float, default=CONFIG.PASSA_REUSE_SIMILARITY,
+                    help="Reuse confident Pass-A results for reworded duplicates at this question-text similarity (e.g. 0.93; 0 = off)")
+    ap.add_argument("--passA-concurrency", type=int, default=CONFIG.PASSA_CONCURRENCY,
+                    help="Number of Pass-A requests kept in flight for upcoming questions (1 = sequential; ignored with --passA-reuse-similarity)")
+    ap.add_argument("--passA-group-size", type=int, default=CONFIG.PASSA_GROUP_SIZE,
+                    help="Answer up to N upcoming image-less questions in one Pass-A call (1 = one call per question; ignored with --passA-reuse-similarity)")
+    ap.add_argument("--passAB-fused", dest="passAB_fused", action="store_true", default=CONFIG.PASSAB_FUSED,
+                    help="Let Pass A verify its own answer in the same call; used instead of Pass B when confident enough (disables --passA-group-size)")
+    ap.add_argument("--passAB-fused-min-conf", type=float, default=CONFIG.PASSAB_FUSED_MIN_CONF,
+                    help="Minimum self-check confidence for the fused result to replace a separate Pass B call")
+    ap.add_argument("--passB-reasoning-effort", default=CONFIG.PASSB_REASONING_EFFORT,
                     choices=["low", "medium", "high", "xhigh"])
 
-    ap.add_argument("--trigger-answer-conf", type=float, default=CONFIG["TRIGGER_ANSWER_CONF"])
-    ap.add_argument("--trigger-topic-conf", type=float, default=CONFIG["TRIGGER_TOPIC_CONF"])
+    ap.add_argument("--trigger-answer-conf", type=float, default=CONFIG.TRIGGER_ANSWER_CONF)
+    ap.add_argument("--trigger-topic-conf", type=float, default=CONFIG.TRIGGER_TOPIC_CONF)
 
-    ap.add_argument("--apply-change-min-conf-b", type=float, default=CONFIG["APPLY_CHANGE_MIN_CONF_B"])
+    ap.add_argument("--apply-change-min-conf-b", type=float, default=CONFIG.APPLY_CHANGE_MIN_CONF_B)
     ap.add_argument("--low-conf-maintenance-threshold", type=float,
-                    default=CONFIG["LOW_CONF_MAINTENANCE_THRESHOLD"],
+                    default=CONFIG.LOW_CONF_MAINTENANCE_THRESHOLD,
                     help="Below this confidence, auto-flag question as maintenance candidate")
 
     ap.add_argument("--write-top-level", dest="write_top_level", action="store_true",
-                    default=CONFIG["WRITE_TOP_LEVEL"],
+                    default=CONFIG.WRITE_TOP_LEVEL,
                     help="Also write ai* convenience fields on question level")
     ap.add_argument("--no-write-top-level", dest="write_top_level", action="store_false",
                     help="Do not write ai* convenience fields")
 
-    ap.add_argument("--cleanup-spec", default=CONFIG["CLEANUP_SPEC_PATH"],
+    ap.add_argument("--cleanup-spec", default=CONFIG.CLEANUP_SPEC_PATH,
                     help="Optional JSON whitelist spec to keep only selected fields in output")
 
-    ap.add_argument("--images-zip", default=CONFIG["IMAGES_ZIP_PATH"],
+    ap.add_argument("--images-zip", default=CONFIG.IMAGES_ZIP_PATH,
                     help="Optional ZIP with question images (default: images.zip)")
 
-    ap.add_argument("--knowledge-zip", default=CONFIG["KNOWLEDGE_ZIP_PATH"],
+    ap.add_argument("--knowledge-zip", default=CONFIG.KNOWLEDGE_ZIP_PATH,
                     help="Optional ZIP with PDFs/TXT/MD files used as retrieval knowledge base")
-    ap.add_argument("--knowledge-index", default=CONFIG["KNOWLEDGE_INDEX_PATH"],
+    ap.add_argument("--knowledge-index", default=CONFIG.KNOWLEDGE_INDEX_PATH,
                     help="Optional path to load/save parsed knowledge index JSON")
-    ap.add_argument("--knowledge-subject-hint", default=CONFIG["KNOWLEDGE_SUBJECT_HINT"],
+    ap.add_argument("--knowledge-subject-hint", default=CONFIG.KNOWLEDGE_SUBJECT_HINT,
                     help="Optional subject hint for knowledge-base matching")
-    ap.add_argument("--knowledge-top-k", type=int, default=CONFIG["KNOWLEDGE_TOP_K"],
+    ap.add_argument("--knowledge-top-k", type=int, default=CONFIG.KNOWLEDGE_TOP_K,
                     help="How many evidence chunks to include per question")
-    ap.add_argument("--knowledge-max-chars", type=int, default=CONFIG["KNOWLEDGE_MAX_CHARS"],
+    ap.add_argument("--knowledge-max-chars", type=int, default=CONFIG.KNOWLEDGE_MAX_CHARS,
                     help="Max cumulative evidence characters sent per question")
-    ap.add_argument("--knowledge-min-score", type=float, default=CONFIG["KNOWLEDGE_MIN_SCORE"],
+    ap.add_argument("--knowledge-min-score", type=float, default=CONFIG.KNOWLEDGE_MIN_SCORE,
                     help="Minimum retrieval score for evidence chunk inclusion")
-    ap.add_argument("--knowledge-chunk-chars", type=int, default=CONFIG["KNOWLEDGE_CHUNK_CHARS"],
+    ap.add_argument("--knowledge-chunk-chars", type=int, default=CONFIG.KNOWLEDGE_CHUNK_CHARS,
                     help="Chunk size when parsing files from knowledge ZIP")
 
-    ap.add_argument("--text-cluster-similarity", type=float, default=CONFIG["TEXT_CLUSTER_SIMILARITY"],
+    ap.add_argument("--text-cluster-similarity", type=float, default=CONFIG.TEXT_CLUSTER_SIMILARITY,
                     help="Weighted-Jaccard threshold for question-content clustering (with retrieval top-k candidates)")
-    ap.add_argument("--abstraction-cluster-similarity", type=float, default=CONFIG["ABSTRACTION_CLUSTER_SIMILARITY"],
+    ap.add_argument("--abstraction-cluster-similarity", type=float, default=CONFIG.ABSTRACTION_CLUSTER_SIMILARITY,
                     help="Weighted-Jaccard threshold for abstraction clustering")
 
     ap.add_argument("--enable-review-pass", dest="enable_review_pass", action="store_true",
-                    default=CONFIG["ENABLE_REVIEW_PASS"],
+                    default=CONFIG.ENABLE_REVIEW_PASS,
                     help="Enable optional deep review pass for maintenance-heavy questions")
     ap.add_argument("--no-enable-review-pass", dest="enable_review_pass", action="store_false",
                     help="Disable optional deep review pass")
-    ap.add_argument("--review-model", default=CONFIG["REVIEW_MODEL"])
-    ap.add_argument("--review-min-maintenance-severity", type=int, default=CONFIG["REVIEW_MIN_MAINTENANCE_SEVERITY"],
+    ap.add_argument("--review-model", default=CONFIG.REVIEW_MODEL)
+    ap.add_argument("--review-min-maintenance-severity", type=int, default=CONFIG.REVIEW_MIN_MAINTENANCE_SEVERITY,
                     help="Run review pass only for maintenance severity >= this value")
-    ap.add_argument("--topic-candidate-top-k", type=int, default=CONFIG["TOPIC_CANDIDATE_TOP_K"],
+    ap.add_argument("--topic-candidate-top-k", type=int, default=CONFIG.TOPIC_CANDIDATE_TOP_K,
                     help="How many deterministic topic candidates to attach per question")
     ap.add_argument("--topic-candidate-ambiguous-relative-score", type=float,
-                    default=CONFIG["TOPIC_CANDIDATE_AMBIGUOUS_RELATIVE_SCORE"],
+                    default=CONFIG.TOPIC_CANDIDATE_AMBIGUOUS_RELATIVE_SCORE,
                     help="Run Pass B when the second deterministic topic candidate is this close to the first")
-    ap.add_argument("--run-report", default=CONFIG["RUN_REPORT_PATH"],
+    ap.add_argument("--run-report", default=CONFIG.RUN_REPORT_PATH,
                     help="Optional JSON path for workflow run metrics/report")
-    ap.add_argument("--cost-report", default=CONFIG["COST_REPORT_PATH"],
+    ap.add_argument("--cost-report", default=CONFIG.COST_REPORT_PATH,
                     help="Optional JSON path for detailed per-question/per-step token and cost records (default: <output>.costs.json)")
     ap.add_argument("--topic-candidate-outside-force-passb-conf", type=float,
-                    default=CONFIG["TOPIC_CANDIDATE_OUTSIDE_FORCE_PASSB_CONF"],
+                    default=CONFIG.TOPIC_CANDIDATE_OUTSIDE_FORCE_PASSB_CONF,
                     help="Run Pass B when Pass A picks topic outside candidates below this confidence")
     ap.add_argument("--enable-repeat-reconstruction", dest="enable_repeat_reconstruction", action="store_true",
-                    default=CONFIG["ENABLE_REPEAT_RECONSTRUCTION"],
+                    default=CONFIG.ENABLE_REPEAT_RECONSTRUCTION,
                     help="Enable repeat-pattern reconstruction suggestions across exam years")
     ap.add_argument("--no-enable-repeat-reconstruction", dest="enable_repeat_reconstruction", action="store_false",
                     help="Disable repeat-pattern reconstruction suggestions")
     ap.add_argument("--auto-apply-repeat-reconstruction", dest="auto_apply_repeat_reconstruction", action="store_true",
-                    default=CONFIG["AUTO_APPLY_REPEAT_RECONSTRUCTION"],
+                    default=CONFIG.AUTO_APPLY_REPEAT_RECONSTRUCTION,
                     help="Automatically apply repeat reconstruction suggestions when allowed by preprocessing gates")
     ap.add_argument("--no-auto-apply-repeat-reconstruction", dest="auto_apply_repeat_reconstruction", action="store_false",
                     help="Do not auto-apply repeat reconstruction suggestions")
-    ap.add_argument("--repeat-min-similarity", type=float, default=CONFIG["REPEAT_MIN_SIMILARITY"],
+    ap.add_argument("--repeat-min-similarity", type=float, default=CONFIG.REPEAT_MIN_SIMILARITY,
                     help="Minimum similarity for repeat-pattern clustering")
-    ap.add_argument("--repeat-min-anchor-conf", type=float, default=CONFIG["REPEAT_MIN_ANCHOR_CONF"],
+    ap.add_argument("--repeat-min-anchor-conf", type=float, default=CONFIG.REPEAT_MIN_ANCHOR_CONF,
                     help="Minimum combined confidence for high-quality repeat anchors")
-    ap.add_argument("--repeat-min-anchor-consensus", type=int, default=CONFIG["REPEAT_MIN_ANCHOR_CONSENSUS"],
+    ap.add_argument("--repeat-min-anchor-consensus", type=int, default=CONFIG.REPEAT_MIN_ANCHOR_CONSENSUS,
                     help="Minimum number of high-quality anchors that must vote for a correct answer text")
-    ap.add_argument("--repeat-min-match-ratio", type=float, default=CONFIG["REPEAT_MIN_MATCH_RATIO"],
+    ap.add_argument("--repeat-min-match-ratio", type=float, default=CONFIG.REPEAT_MIN_MATCH_RATIO,
                     help="Minimum overlap ratio between anchor-correct texts and target answers")
 
     ap.add_argument("--enable-reconstruction-pass", dest="enable_reconstruction_pass", action="store_true",
-                    default=CONFIG["ENABLE_RECONSTRUCTION_PASS"],
+                    default=CONFIG.ENABLE_RECONSTRUCTION_PASS,
                     help="Run reconstruction/legacy assessment annotation for every question after core passes")
     ap.add_argument("--no-enable-reconstruction-pass", dest="enable_reconstruction_pass", action="store_false",
                     help="Disable reconstruction/legacy assessment annotation")
-    ap.add_argument("--reconstruction-model", default=CONFIG["RECONSTRUCTION_MODEL"])
+    ap.add_argument("--reconstruction-model", default=CONFIG.RECONSTRUCTION_MODEL)
 
     ap.add_argument("--enable-explainer-pass", dest="enable_explainer_pass", action="store_true",
-                    default=CONFIG["ENABLE_EXPLAINER_PASS"],
+                    default=CONFIG.ENABLE_EXPLAINER_PASS,
                     help="Run optional explainer annotation for every question")
     ap.add_argument("--no-enable-explainer-pass", dest="enable_explainer_pass", action="store_false",
                     help="Disable optional explainer annotation")
-    ap.add_argument("--explainer-model", default=CONFIG["EXPLAINER_MODEL"])
+    ap.add_argument("--explainer-model", default=CONFIG.EXPLAINER_MODEL)
 
     ap.add_argument("--enable-llm-abstraction-cluster-refinement", dest="enable_llm_abstraction_cluster_refinement", action="store_true",
-                    default=CONFIG["ENABLE_LLM_ABSTRACTION_CLUSTER_REFINEMENT"],
+                    default=CONFIG.ENABLE_LLM_ABSTRACTION_CLUSTER_REFINEMENT,
                     help="Use LLM to refine abstraction clusters (remove thematic outliers + merge similar clusters)")
     ap.add_argument("--no-enable-llm-abstraction-cluster-refinement", dest="enable_llm_abstraction_cluster_refinement", action="store_false",
                     help="Disable LLM-based abstraction cluster refinement")
-    ap.add_argument("--cluster-refinement-model", default=CONFIG["CLUSTER_REFINEMENT_MODEL"])
-    ap.add_argument("--cluster-refinement-max-clusters", type=int, default=CONFIG["CLUSTER_REFINEMENT_MAX_CLUSTERS"],
+    ap.add_argument("--cluster-refinement-model", default=CONFIG.CLUSTER_REFINEMENT_MODEL)
+    ap.add_argument("--cluster-refinement-max-clusters", type=int, default=CONFIG.CLUSTER_REFINEMENT_MAX_CLUSTERS,
                     help="Max abstraction clusters to review with LLM (largest first)")
-    ap.add_argument("--cluster-refinement-min-cluster-size", type=int, default=CONFIG["CLUSTER_REFINEMENT_MIN_CLUSTER_SIZE"],
+    ap.add_argument("--cluster-refinement-min-cluster-size", type=int, default=CONFIG.CLUSTER_REFINEMENT_MIN_CLUSTER_SIZE,
                     help="Minimum cluster size to be reviewed by LLM")
-    ap.add_argument("--cluster-refinement-merge-candidates", type=int, default=CONFIG["CLUSTER_REFINEMENT_MERGE_CANDIDATES"],
+    ap.add_argument("--cluster-refinement-merge-candidates", type=int, default=CONFIG.CLUSTER_REFINEMENT_MERGE_CANDIDATES,
                     help="How many neighbor clusters to offer as merge candidates to LLM")
 
-    ap.add_argument("--debug", dest="debug", action="store_true", default=CONFIG["DEBUG"],
+    ap.add_argument("--debug", dest="debug", action="store_true", default=CONFIG.DEBUG,
                     help="Store raw pass outputs under aiAudit._debug")
     ap.add_argument("--no-debug", dest="debug", action="store_false",
                     help="Do not store raw pass outputs")
@@ -214,6 +220,62 @@ def _derive_output_path(input_path: str, requested_output: str) -> str:
     return os.path.join(input_dir, output_name) if input_dir else output_name
 
 
+def _load_topic_artifacts(topics_path: str) -> Tuple[Any, ...]:
+    """Return topic tree, catalog, key map, prompt text and topic-keyed schemas.
+
+    When ``AI_EXAM_CACHE_DIR`` is set (as for the response cache), the result is
+    cached below it keyed by a hash of the topics file and the builder modules,
+    so resumed runs on the same topic tree skip rebuilding it.
+    """
+    from ai_exam_analyzer import schemas, topic_catalog
+    from ai_exam_analyzer.openai_client import RESPONSE_CACHE_DIR_ENV
+
+    with open(topics_path, "rb") as f:
+        raw = f.read()
+
+    cache_root = os.environ.get(RESPONSE_CACHE_DIR_ENV, "").strip()
+    cache_dir = os.path.join(os.path.expanduser(cache_root), _TOPIC_CACHE_SUBDIR) if cache_root else ""
+    cache_path = ""
+    if cache_dir:
+        digest = hashlib.blake2b(raw, digest_size=16)
+        for module in (schemas, topic_catalog):
+            with open(module.__file__, "rb") as f:
+                digest.update(f.read())
+        cache_path = os.path.join(cache_dir, f"{digest.hexdigest()}.pkl")
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    topic_tree = json.loads(raw.decode("utf-8"))
+    catalog, key_map = topic_catalog.build_topic_catalog(topic_tree)
+    topic_keys = [row["topicKey"] for row in catalog]
+    artifacts = (
+        topic_tree,
+        catalog,
+        key_map,
+        topic_catalog.format_topic_catalog_for_prompt(catalog),
+        schemas.schema_pass_a(topic_keys),
+        schemas.schema_pass_b(topic_keys),
+        schemas.schema_review_pass(topic_keys),
+    )
+
+    if cache_path:
+        # Write to a temp file and rename, so concurrent runs never read a partial file.
+        tmp_path = ""
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile("wb", dir=cache_dir, suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                pickle.dump(artifacts, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return artifacts
+
+
 def main() -> None:
     args = build_parser().parse_args()
     args.output = _derive_output_path(args.input, args.output)
@@ -226,48 +288,41 @@ def main() -> None:
         if not os.getenv("GEMINI_API_KEY"):
             raise RuntimeError("GEMINI_API_KEY environment variable is not set.")
 
-    if provider == "gemini" and args.passA_model == CONFIG["PASSA_MODEL"]:
-        args.passA_model = CONFIG["PASSA_MODEL_GEMINI"]
-    if provider == "gemini" and args.passB_model == CONFIG["PASSB_MODEL"]:
-        args.passB_model = CONFIG["PASSB_MODEL_GEMINI"]
+    if provider == "gemini" and args.passA_model == CONFIG.PASSA_MODEL:
+        args.passA_model = CONFIG.PASSA_MODEL_GEMINI
+    if provider == "gemini" and args.passB_model == CONFIG.PASSB_MODEL:
+        args.passB_model = CONFIG.PASSB_MODEL_GEMINI
 
-    if provider == "gemini" and args.review_model == CONFIG["REVIEW_MODEL"]:
-        args.review_model = CONFIG["REVIEW_MODEL_GEMINI"]
-    if provider == "gemini" and args.reconstruction_model == CONFIG["RECONSTRUCTION_MODEL"]:
-        args.reconstruction_model = CONFIG["RECONSTRUCTION_MODEL_GEMINI"]
-    if provider == "gemini" and args.explainer_model == CONFIG["EXPLAINER_MODEL"]:
-        args.explainer_model = CONFIG["EXPLAINER_MODEL_GEMINI"]
-    if provider == "gemini" and args.cluster_refinement_model == CONFIG["CLUSTER_REFINEMENT_MODEL"]:
-        args.cluster_refinement_model = CONFIG["CLUSTER_REFINEMENT_MODEL_GEMINI"]
+    if provider == "gemini" and args.review_model == CONFIG.REVIEW_MODEL:
+        args.review_model = CONFIG.REVIEW_MODEL_GEMINI
+    if provider == "gemini" and args.reconstruction_model == CONFIG.RECONSTRUCTION_MODEL:
+        args.reconstruction_model = CONFIG.RECONSTRUCTION_MODEL_GEMINI
+    if provider == "gemini" and args.explainer_model == CONFIG.EXPLAINER_MODEL:
+        args.explainer_model = CONFIG.EXPLAINER_MODEL_GEMINI
+    if provider == "gemini" and args.cluster_refinement_model == CONFIG.CLUSTER_REFINEMENT_MODEL:
+        args.cluster_refinement_model = CONFIG.CLUSTER_REFINEMENT_MODEL_GEMINI
 
     apply_model_optimized_defaults(args)
 
-    topic_tree = load_json(args.topics)
-    catalog, key_map = build_topic_catalog(topic_tree)
-    topic_keys = [row["topicKey"] for row in catalog]
-    topic_catalog_text = format_topic_catalog_for_prompt(catalog)
+    from ai_exam_analyzer.schemas import (
+        schema_abstraction_cluster_refinement,
+        schema_explainer_pass,
+        schema_reconstruction_pass,
+    )
 
-    schema_a = schema_pass_a(topic_keys)
-    schema_b = schema_pass_b(topic_keys)
-    schema_review = schema_review_pass(topic_keys)
+    topic_tree, catalog, key_map, topic_catalog_text, schema_a, schema_b, schema_review = _load_topic_artifacts(args.topics)
+    # One shared catalog string is embedded into every Pass A/B prompt.
+    topic_catalog_text = sys.intern(topic_catalog_text)
     schema_reconstruction = schema_reconstruction_pass()
     schema_explainer = schema_explainer_pass()
     schema_cluster_refinement = schema_abstraction_cluster_refinement()
 
-    data = load_json(args.input)
-
-    if isinstance(data, dict) and "questions" in data:
-        questions = data["questions"]
-        container = data
-    elif isinstance(data, list):
-        questions = data
-        container = None
-    else:
-        raise ValueError("Input must be a list of questions or {questions:[...]} object.")
+    questions, container = extract_questions(load_json(args.input))
 
     cleanup_spec = None
     if args.cleanup_spec:
-        cleanup_spec = load_json(args.cleanup_spec)
+        # The cleaned output is only serialized, so whitelisted subtrees can be shared.
+        cleanup_spec = compile_spec(load_json(args.cleanup_spec), share_leaves=True)
 
     subject_hint = args.knowledge_subject_hint
     if not subject_hint and isinstance(topic_tree, dict):
@@ -278,11 +333,20 @@ def main() -> None:
     image_store = None
     if args.images_zip:
         if os.path.exists(args.images_zip):
+            from ai_exam_analyzer.image_store import QuestionImageStore
+
             image_store = QuestionImageStore.from_zip(args.images_zip)
-        elif args.images_zip != CONFIG["IMAGES_ZIP_PATH"]:
+        elif args.images_zip != CONFIG.IMAGES_ZIP_PATH:
             raise FileNotFoundError(f"--images-zip file not found: {args.images_zip}")
 
     knowledge_base = None
+    if args.knowledge_index or args.knowledge_zip:
+        from ai_exam_analyzer.knowledge_base import (
+            build_knowledge_base_from_zip,
+            load_index_json,
+            save_index_json,
+        )
+
     if args.knowledge_index:
         index_path = args.knowledge_index
         if os.path.exists(index_path):
@@ -305,24 +369,30 @@ def main() -> None:
 
     progress_callback = _build_progress_printer()
 
-    process_questions(
-        args=args,
-        questions=questions,
-        container=container,
-        key_map=key_map,
-        topic_catalog_text=topic_catalog_text,
-        topic_catalog=catalog,
-        schema_a=schema_a,
-        schema_b=schema_b,
-        schema_review=schema_review,
-        schema_reconstruction=schema_reconstruction,
-        schema_explainer=schema_explainer,
-        schema_cluster_refinement=schema_cluster_refinement,
-        cleanup_spec=cleanup_spec,
-        knowledge_base=knowledge_base,
-        image_store=image_store,
-        progress_callback=progress_callback,
-    )
+    from ai_exam_analyzer.processor import process_questions
+
+    try:
+        process_questions(
+            args=args,
+            questions=questions,
+            container=container,
+            key_map=key_map,
+            topic_catalog_text=topic_catalog_text,
+            topic_catalog=catalog,
+            schema_a=schema_a,
+            schema_b=schema_b,
+            schema_review=schema_review,
+            schema_reconstruction=schema_reconstruction,
+            schema_explainer=schema_explainer,
+            schema_cluster_refinement=schema_cluster_refinement,
+            cleanup_spec=cleanup_spec,
+            knowledge_base=knowledge_base,
+            image_store=image_store,
+            progress_callback=progress_callback,
+        )
+    finally:
+        if image_store is not None:
+            image_store.close()
 
 
 if __name__ == "__main__":
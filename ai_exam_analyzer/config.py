@@ -1,66 +1,85 @@
 """Configuration defaults for the analyzer CLI."""
 
-CONFIG = {
-    "INPUT_PATH": "export.json",
-    "TOPICS_PATH": "topic-tree.json",
-    "OUTPUT_PATH": "",
-    "RESUME": False,
-    "LIMIT": 0,
-    "CHECKPOINT_EVERY": 10,
-    "SLEEP": 0.15,
-    "LLM_PROVIDER": "openai",
-    "QUALITY_COST_PROFILE": "quality",
-    "PASSA_MODEL": "gpt-5.4-mini",
-    "PASSB_MODEL": "gpt-5.5",
-    "PASSA_MODEL_GEMINI": "gemini-3.5-flash",
-    "PASSB_MODEL_GEMINI": "gemini-3.1-pro-preview",
-    "PASSA_TEMPERATURE": 0.0,
-    "PASSB_REASONING_EFFORT": "high",
-    "TRIGGER_ANSWER_CONF": 0.80,
-    "TRIGGER_TOPIC_CONF": 0.85,
-    "APPLY_CHANGE_MIN_CONF_B": 0.80,
-    "LOW_CONF_MAINTENANCE_THRESHOLD": 0.65,
-    "CLEANUP_SPEC_PATH": "",
-    "IMAGES_ZIP_PATH": "images.zip",
-    "KNOWLEDGE_ZIP_PATH": "",
-    "KNOWLEDGE_INDEX_PATH": "",
-    "KNOWLEDGE_SUBJECT_HINT": "",
-    "KNOWLEDGE_TOP_K": 6,
-    "KNOWLEDGE_MAX_CHARS": 4000,
-    "KNOWLEDGE_MIN_SCORE": 0.06,
-    "KNOWLEDGE_CHUNK_CHARS": 1200,
-    "WRITE_TOP_LEVEL": True,
-    "DEBUG": False,
-    "TEXT_CLUSTER_SIMILARITY": 0.15,
-    "ABSTRACTION_CLUSTER_SIMILARITY": 0.22,
-    "ENABLE_REVIEW_PASS": False,
-    "REVIEW_MODEL": "gpt-5.5",
-    "REVIEW_MODEL_GEMINI": "gemini-3.1-pro-preview",
-    "REVIEW_MIN_MAINTENANCE_SEVERITY": 2,
-    "TOPIC_CANDIDATE_TOP_K": 5,
-    "TOPIC_CANDIDATE_AMBIGUOUS_RELATIVE_SCORE": 0.82,
-    "RUN_REPORT_PATH": "",
-    "COST_REPORT_PATH": "",
-    "TOPIC_CANDIDATE_OUTSIDE_FORCE_PASSB_CONF": 0.92,
-    "ENABLE_REPEAT_RECONSTRUCTION": True,
-    "AUTO_APPLY_REPEAT_RECONSTRUCTION": False,
-    "REPEAT_MIN_SIMILARITY": 0.72,
-    "REPEAT_MIN_ANCHOR_CONF": 0.82,
-    "REPEAT_MIN_ANCHOR_CONSENSUS": 1,
-    "REPEAT_MIN_MATCH_RATIO": 0.6,
+from dataclasses import dataclass, fields
 
-    "ENABLE_RECONSTRUCTION_PASS": True,
-    "RECONSTRUCTION_MODEL": "gpt-5.5",
-    "RECONSTRUCTION_MODEL_GEMINI": "gemini-3.1-pro-preview",
-    "ENABLE_EXPLAINER_PASS": False,
-    "ENABLE_LLM_ABSTRACTION_CLUSTER_REFINEMENT": True,
-    "CLUSTER_REFINEMENT_MODEL": "gpt-5.4-mini",
-    "CLUSTER_REFINEMENT_MODEL_GEMINI": "gemini-3.5-flash",
-    "CLUSTER_REFINEMENT_MAX_CLUSTERS": 30,
-    "CLUSTER_REFINEMENT_MIN_CLUSTER_SIZE": 2,
-    "CLUSTER_REFINEMENT_MERGE_CANDIDATES": 5,
-    "EXPLAINER_MODEL": "gpt-5.5",
-    "EXPLAINER_MODEL_GEMINI": "gemini-3.5-flash",
-}
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    INPUT_PATH: str = "export.json"
+    TOPICS_PATH: str = "topic-tree.json"
+    OUTPUT_PATH: str = ""
+    RESUME: bool = False
+    LIMIT: int = 0
+    CHECKPOINT_EVERY: int = 10
+    SLEEP: float = 0.15
+    LLM_PROVIDER: str = "openai"
+    QUALITY_COST_PROFILE: str = "quality"
+    PASSA_MODEL: str = "gpt-5.4-mini"
+    PASSB_MODEL: str = "gpt-5.5"
+    PASSA_MODEL_GEMINI: str = "gemini-3.5-flash"
+    PASSB_MODEL_GEMINI: str = "gemini-3.1-pro-preview"
+    PASSA_TEMPERATURE: float = 0.0
+    PASSA_REUSE_SIMILARITY: float = 0.0
+    PASSA_CONCURRENCY: int = 1
+    PASSA_GROUP_SIZE: int = 1
+    PASSAB_FUSED: bool = False
+    PASSAB_FUSED_MIN_CONF: float = 0.85
+    PASSB_REASONING_EFFORT: str = "high"
+    TRIGGER_ANSWER_CONF: float = 0.80
+    TRIGGER_TOPIC_CONF: float = 0.85
+    APPLY_CHANGE_MIN_CONF_B: float = 0.80
+    LOW_CONF_MAINTENANCE_THRESHOLD: float = 0.65
+    CLEANUP_SPEC_PATH: str = ""
+    IMAGES_ZIP_PATH: str = "images.zip"
+    KNOWLEDGE_ZIP_PATH: str = ""
+    KNOWLEDGE_INDEX_PATH: str = ""
+    KNOWLEDGE_SUBJECT_HINT: str = ""
+    KNOWLEDGE_TOP_K: int = 6
+    KNOWLEDGE_MAX_CHARS: int = 4000
+    KNOWLEDGE_MIN_SCORE: float = 0.06
+    KNOWLEDGE_CHUNK_CHARS: int = 1200
+    WRITE_TOP_LEVEL: bool = True
+    DEBUG: bool = False
+    TEXT_CLUSTER_SIMILARITY: float = 0.15
+    ABSTRACTION_CLUSTER_SIMILARITY: float = 0.22
+    ENABLE_REVIEW_PASS: bool = False
+    REVIEW_MODEL: str = "gpt-5.5"
+    REVIEW_MODEL_GEMINI: str = "gemini-3.1-pro-preview"
+    REVIEW_MIN_MAINTENANCE_SEVERITY: int = 2
+    TOPIC_CANDIDATE_TOP_K: int = 5
+    TOPIC_CANDIDATE_AMBIGUOUS_RELATIVE_SCORE: float = 0.82
+    RUN_REPORT_PATH: str = ""
+    COST_REPORT_PATH: str = ""
+    TOPIC_CANDIDATE_OUTSIDE_FORCE_PASSB_CONF: float = 0.92
+    ENABLE_REPEAT_RECONSTRUCTION: bool = True
+    AUTO_APPLY_REPEAT_RECONSTRUCTION: bool = False
+    REPEAT_MIN_SIMILARITY: float = 0.72
+    REPEAT_MIN_ANCHOR_CONF: float = 0.82
+    REPEAT_MIN_ANCHOR_CONSENSUS: int = 1
+    REPEAT_MIN_MATCH_RATIO: float = 0.6
+
+    ENABLE_RECONSTRUCTION_PASS: bool = True
+    RECONSTRUCTION_MODEL: str = "gpt-5.5"
+    RECONSTRUCTION_MODEL_GEMINI: str = "gemini-3.1-pro-preview"
+    ENABLE_EXPLAINER_PASS: bool = False
+    ENABLE_LLM_ABSTRACTION_CLUSTER_REFINEMENT: bool = True
+    CLUSTER_REFINEMENT_MODEL: str = "gpt-5.4-mini"
+    CLUSTER_REFINEMENT_MODEL_GEMINI: str = "gemini-3.5-flash"
+    CLUSTER_REFINEMENT_MAX_CLUSTERS: int = 30
+    CLUSTER_REFINEMENT_MIN_CLUSTER_SIZE: int = 2
+    CLUSTER_REFINEMENT_MERGE_CANDIDATES: int = 5
+    EXPLAINER_MODEL: str = "gpt-5.5"
+    EXPLAINER_MODEL_GEMINI: str = "gemini-3.5-flash"
+
+    def __post_init__(self) -> None:
+        # Defaults feed argparse directly (argparse only converts CLI strings),
+        # so make sure each default already has its declared type.
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if not isinstance(value, field.type):
+                raise TypeError(f"CONFIG.{field.name} must be {field.type.__name__}, got {type(value).__name__}.")
+
+
+CONFIG = Config()
 
 PIPELINE_VERSION = "2pass-merged-v9-annotate-only-reconstruct-explain"
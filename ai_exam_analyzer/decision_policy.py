@@ -2,9 +2,29 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import mul
 from typing import Any, Dict, Optional
 
 
+# Confidence inputs are quantized to 4 decimals (the output precision) so the
+# cached composition can be keyed on small ints.
+_CONF_SCALE = 10000
+
+# Weight vectors for (answer, topic, agreement[, retrieval, evidence prior]).
+_WEIGHTS_WITHOUT_KNOWLEDGE = (0.34, 0.24, 0.14)
+_WEIGHTS_WITH_KNOWLEDGE = _WEIGHTS_WITHOUT_KNOWLEDGE + (0.2, 0.08)
+_DENOMINATOR_WITHOUT_KNOWLEDGE = sum(_WEIGHTS_WITHOUT_KNOWLEDGE)
+_DENOMINATOR_WITH_KNOWLEDGE = sum(_WEIGHTS_WITH_KNOWLEDGE)
+
+# Lookup tables: verifier agreement (agreed / not run / disagreed) and evidence
+# prior by clamped evidence count 0..3.
+_AGREEMENT_CODE = {True: 0, None: 1, False: 2}
+_AGREEMENT = (1.0, 0.45, 0.2)
+_EVIDENCE_PRIOR = (0.35, 0.55, 0.8, 1.0)
+
+
 def compose_confidence(
     *,
     answer_conf: float,
@@ -15,22 +35,36 @@ def compose_confidence(
     knowledge_enabled: bool,
 ) -> float:
     """Calibrated confidence heuristic with evidence prior."""
-    agreement = 1.0 if verifier_agreed is True else (0.45 if verifier_agreed is None else 0.2)
-    evidence_prior = 1.0 if evidence_count >= 3 else (0.8 if evidence_count == 2 else (0.55 if evidence_count == 1 else 0.35))
-
-    weighted_terms = [
-        (0.34, float(answer_conf)),
-        (0.24, float(topic_conf)),
-        (0.14, agreement),
-    ]
+    return _compose_confidence_cached(
+        round(float(answer_conf) * _CONF_SCALE),
+        round(float(topic_conf) * _CONF_SCALE),
+        round(float(retrieval_quality) * _CONF_SCALE),
+        _AGREEMENT_CODE.get(verifier_agreed, 2),
+        max(0, min(int(evidence_count), 3)),
+        bool(knowledge_enabled),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _compose_confidence_cached(
+    answer_q: int,
+    topic_q: int,
+    retrieval_q: int,
+    agreement_code: int,
+    evidence_bucket: int,
+    knowledge_enabled: bool,
+) -> float:
+    agreement = _AGREEMENT[agreement_code]
+    evidence_prior = _EVIDENCE_PRIOR[evidence_bucket]
+
     if knowledge_enabled:
-        weighted_terms.extend([
-            (0.2, float(retrieval_quality)),
-            (0.08, evidence_prior),
-        ])
+        weights, denominator = _WEIGHTS_WITH_KNOWLEDGE, _DENOMINATOR_WITH_KNOWLEDGE
+        values = (answer_q / _CONF_SCALE, topic_q / _CONF_SCALE, agreement, retrieval_q / _CONF_SCALE, evidence_prior)
+    else:
+        weights, denominator = _WEIGHTS_WITHOUT_KNOWLEDGE, _DENOMINATOR_WITHOUT_KNOWLEDGE
+        values = (answer_q / _CONF_SCALE, topic_q / _CONF_SCALE, agreement)
 
-    denominator = sum(weight for weight, _ in weighted_terms) or 1.0
-    score = sum(weight * value for weight, value in weighted_terms) / denominator
+    score = sum(map(mul, weights, values)) / denominator
     return max(0.0, min(1.0, round(score, 4)))
 
 
@@ -52,37 +86,56 @@ def should_apply_pass_b_change(
         return False
     if not agree_with_change:
         return False
-    if not verified_indices or verified_indices == current_indices:
-        return False
     if confidence_b < apply_min_conf_b:
         return False
+    if not verified_indices:
+        return False
     if evidence_count <= 0 and retrieval_quality < 0.08:
         return False
+    # Unequal lengths already mean a change; only compare elements when needed.
+    if len(verified_indices) == len(current_indices) and verified_indices == current_indices:
+        return False
     return True
 
 
+@dataclass(frozen=True, slots=True)
+class ReviewPolicy:
+    """Review-pass trigger settings, resolved once per run from CLI args."""
+
+    enabled: bool
+    min_maintenance_severity: int
+    low_conf_maintenance_threshold: float
+
+    @classmethod
+    def from_args(cls, args: Any) -> "ReviewPolicy":
+        return cls(
+            enabled=bool(getattr(args, "enable_review_pass", False)),
+            min_maintenance_severity=int(getattr(args, "review_min_maintenance_severity", 2)),
+            low_conf_maintenance_threshold=float(getattr(args, "low_conf_maintenance_threshold", 0.65)),
+        )
+
+
 def should_run_review_pass(
     *,
-    args: Any,
+    policy: ReviewPolicy,
     maintenance: Dict[str, Any],
     ai_disagrees_with_dataset: bool,
     final_combined_confidence: float,
     pass_a_topic_key: str,
     final_topic_key: str,
 ) -> bool:
-    if not bool(getattr(args, "enable_review_pass", False)):
+    if not policy.enabled:
         return False
 
     severity = int(maintenance.get("severity", 1))
     needs_maintenance = bool(maintenance.get("needsMaintenance"))
-    min_sev = int(getattr(args, "review_min_maintenance_severity", 2))
 
-    if needs_maintenance and severity >= min_sev:
+    if needs_maintenance and severity >= policy.min_maintenance_severity:
         return True
     if ai_disagrees_with_dataset and final_combined_confidence < 0.85:
         return True
     if pass_a_topic_key != final_topic_key:
         return True
-    if final_combined_confidence < max(0.45, float(getattr(args, "low_conf_maintenance_threshold", 0.65)) - 0.1):
+    if final_combined_confidence < max(0.45, policy.low_conf_maintenance_threshold - 0.1):
         return True
     return False
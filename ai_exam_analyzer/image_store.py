@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import base64
-import binascii
 import mimetypes
 import os
+import threading
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -18,8 +19,7 @@ class _ImageEntry:
     stem: str
     question_id: str
     mime_type: str
-    data_url: str
-    perceptual_hash: str
+    phash_u64: int
 
 
 class QuestionImageStore:
@@ -36,13 +36,22 @@ class QuestionImageStore:
         for values in self._by_question_id.values():
             values.sort(key=lambda item: item.stem)
 
+        # Data URLs are built on first use: most images are never sent to the
+        # model, and base64 inflates each one by a third. The archive stays open
+        # for those reads until close(); ZipFile is not thread-safe, hence the lock.
+        self._data_urls: Dict[str, str] = {}
+        self._zip_lock = threading.Lock()
+        self._zip_file: Optional[zipfile.ZipFile] = None
+
     @classmethod
     def from_zip(cls, zip_path: str) -> "QuestionImageStore":
         if not os.path.exists(zip_path):
             raise FileNotFoundError(f"Images ZIP not found: {zip_path}")
 
-        entries: List[_ImageEntry] = []
-        with zipfile.ZipFile(zip_path) as zf:
+        # ZipFile reads stay on this thread; PIL decode/hash runs on the pool
+        # (PIL releases the GIL) and overlaps the reads.
+        futures: List[Future[_ImageEntry]] = []
+        with zipfile.ZipFile(zip_path) as zf, ThreadPoolExecutor() as pool:
             for name in zf.namelist():
                 if name.endswith("/"):
                     continue
@@ -58,18 +67,9 @@ class QuestionImageStore:
 
                 mime_type = mimetypes.types_map.get(ext.lower(), "application/octet-stream")
                 raw_bytes = zf.read(name)
-                b64_data = base64.b64encode(raw_bytes).decode("ascii")
-                data_url = f"data:{mime_type};base64,{b64_data}"
-                perceptual_hash = _compute_perceptual_hash(raw_bytes)
-                entries.append(_ImageEntry(
-                    archive_path=name,
-                    stem=stem,
-                    question_id=question_id,
-                    mime_type=mime_type,
-                    data_url=data_url,
-                    perceptual_hash=perceptual_hash,
-                ))
+                futures.append(pool.submit(_build_entry, name, stem, question_id, mime_type, raw_bytes))
 
+        entries = [future.result() for future in futures]
         return cls(zip_path=zip_path, entries=entries)
 
     def prepare_question_images(self, q: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
@@ -86,26 +86,63 @@ class QuestionImageStore:
                 continue
             selected[entry.archive_path] = entry
 
-        if question_id:
-            for entry in self._by_question_id.get(question_id, []):
-                selected.setdefault(entry.archive_path, entry)
-
-        ordered_entries = sorted(selected.values(), key=lambda item: item.stem)
-        input_images = [{"type": "input_image", "image_url": entry.data_url} for entry in ordered_entries]
+        question_entries = self._by_question_id.get(question_id, []) if question_id else []
+        for entry in question_entries:
+            selected.setdefault(entry.archive_path, entry)
+
+        if len(selected) == len(question_entries):
+            # Every referenced image belongs to the question itself; its entry
+            # list is already sorted by stem in __init__.
+            ordered_entries = question_entries
+        else:
+            ordered_entries = sorted(selected.values(), key=lambda item: item.stem)
+        input_images: List[Dict[str, Any]] = []
+        provided_refs: List[str] = []
+        provided_paths: List[str] = []
+        for entry in ordered_entries:
+            input_images.append({"type": "input_image", "image_url": self._data_url(entry)})
+            provided_refs.append(entry.stem)
+            provided_paths.append(entry.archive_path)
 
         payload_image_context = {
-            "questionHasImageReference": bool(expected_refs or q.get("imageUrls")),
+            "questionHasImageReference": bool(expected_refs) or bool(q.get("imageUrls")),
             "imageZipConfigured": True,
             "imageZipPath": self.zip_path,
             "expectedImageRefs": expected_refs,
             "missingExpectedImageRefs": missing_expected_refs,
             "providedImageCount": len(ordered_entries),
-            "providedImageRefs": [entry.stem for entry in ordered_entries],
-            "providedImageArchivePaths": [entry.archive_path for entry in ordered_entries],
+            "providedImageRefs": provided_refs,
+            "providedImageArchivePaths": provided_paths,
         }
 
         return input_images, payload_image_context
 
+    def _data_url(self, entry: _ImageEntry) -> str:
+        data_url = self._data_urls.get(entry.archive_path)
+        if data_url is None:
+            with self._zip_lock:
+                if self._zip_file is None:
+                    self._zip_file = zipfile.ZipFile(self.zip_path)
+                raw_bytes = self._zip_file.read(entry.archive_path)
+            # Assemble as bytes and decode once instead of decoding the base64
+            # payload and then copying it again into an f-string.
+            data_url = (b"data:%s;base64," % entry.mime_type.encode("ascii") + base64.b64encode(raw_bytes)).decode("ascii")
+            self._data_urls[entry.archive_path] = data_url
+        return data_url
+
+    def close(self) -> None:
+        """Close the archive opened for data URLs (reopened on the next read)."""
+        with self._zip_lock:
+            if self._zip_file is not None:
+                self._zip_file.close()
+                self._zip_file = None
+
+    def __enter__(self) -> "QuestionImageStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def build_image_clusters(self, questions: List[Dict[str, Any]], max_hamming_distance: int = 8) -> Dict[str, Any]:
         question_to_images: Dict[str, List[_ImageEntry]] = {}
         for q in questions:
@@ -118,13 +155,16 @@ class QuestionImageStore:
         clusters: List[Dict[str, Any]] = []
         question_cluster_refs: Dict[str, List[str]] = {}
 
+        hash_index = _MultiIndexHashIndex(self._entries, max_hamming_distance)
         seen: set[str] = set()
         for qid, entries in question_to_images.items():
             assigned: List[str] = []
             for entry in entries:
                 if entry.archive_path in seen:
                     continue
-                similar = [e for e in self._entries if _hamming_distance_hex(entry.perceptual_hash, e.perceptual_hash) <= max_hamming_distance]
+                # Members already placed in an earlier cluster stay there, so the
+                # clusters partition the images instead of overlapping.
+                similar = [e for e in hash_index.query(entry.phash_u64) if e.archive_path not in seen]
                 cluster_id = f"img-cluster-{cluster_counter}"
                 cluster_counter += 1
                 clusters.append({
@@ -155,7 +195,7 @@ class QuestionImageStore:
                 continue
             matches: List[Dict[str, Any]] = []
             for entry in self._by_question_id.get(qid, []):
-                for hit in knowledge_base.find_similar_images(entry.perceptual_hash, max_hamming_distance=max_hamming_distance):
+                for hit in knowledge_base.find_similar_images(entry.phash_u64, max_hamming_distance=max_hamming_distance):
                     matches.append({
                         "questionImageRef": entry.stem,
                         "questionImageArchivePath": entry.archive_path,
@@ -168,40 +208,74 @@ class QuestionImageStore:
         return out
 
 
+def _build_entry(archive_path: str, stem: str, question_id: str, mime_type: str, raw_bytes: bytes) -> _ImageEntry:
+    return _ImageEntry(
+        archive_path=archive_path,
+        stem=stem,
+        question_id=question_id,
+        mime_type=mime_type,
+        phash_u64=_compute_perceptual_hash(raw_bytes),
+    )
+
+
+class _MultiIndexHashIndex:
+    """Near-duplicate lookup for ``hash_bits``-wide hashes within a fixed Hamming radius.
+
+    The hash is split into ``max_distance + 1`` bit slices, each indexed in its
+    own dict. Two hashes within the radius must agree on at least one slice
+    (pigeonhole), so only entries sharing a slice bucket are compared exactly.
+    """
+
+    def __init__(self, entries: List[_ImageEntry], max_distance: int, hash_bits: int = 64):
+        self._entries = entries
+        self._max_distance = max_distance
+        parts = max(1, min(hash_bits, max_distance + 1))
+        bounds = [(hash_bits * i) // parts for i in range(parts + 1)]
+        self._slices: List[Tuple[int, int]] = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(bounds, bounds[1:])]
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in self._slices]
+        for idx, entry in enumerate(entries):
+            for (shift, mask), bucket in zip(self._slices, self._buckets):
+                bucket.setdefault((entry.phash_u64 >> shift) & mask, []).append(idx)
+
+    def query(self, phash_u64: int) -> List[_ImageEntry]:
+        """Return entries within the radius, in insertion order."""
+        candidates: set[int] = set()
+        for (shift, mask), bucket in zip(self._slices, self._buckets):
+            candidates.update(bucket.get((phash_u64 >> shift) & mask, ()))
+        entries = self._entries
+        max_distance = self._max_distance
+        return [
+            entries[idx]
+            for idx in sorted(candidates)
+            if (phash_u64 ^ entries[idx].phash_u64).bit_count() <= max_distance
+        ]
+
+
 def _extract_question_id(stem: str) -> str:
     # expected pattern in sample: img_<question_id>_<index>
     if stem.startswith("img_"):
-        remainder = stem[4:]
-        if "_" in remainder:
-            return remainder.rsplit("_", 1)[0]
+        return stem[4:].rpartition("_")[0]
     return ""
 
 
-def _compute_perceptual_hash(raw: bytes) -> str:
+def _compute_perceptual_hash(raw: bytes) -> int:
+    """64-bit difference hash; falls back to the first 8 raw bytes without PIL."""
     try:
         from PIL import Image  # type: ignore
     except ModuleNotFoundError:
-        return binascii.hexlify(raw[:8]).decode("ascii").ljust(16, "0")
+        return int.from_bytes(raw[:8].ljust(8, b"\0"), "big")
 
     try:
         with Image.open(BytesIO(raw)) as img:
             img = img.convert("L").resize((9, 8))
-            px = list(img.getdata())
+            # 8 rows of 9 grayscale bytes; indexing bytes yields ints directly.
+            px = img.tobytes()
     except Exception:
-        return binascii.hexlify(raw[:8]).decode("ascii").ljust(16, "0")
-
-    bits = []
-    for y in range(8):
-        for x in range(8):
-            left = px[y * 9 + x]
-            right = px[y * 9 + x + 1]
-            bits.append("1" if left > right else "0")
+        return int.from_bytes(raw[:8].ljust(8, b"\0"), "big")
 
-    return f"{int(''.join(bits), 2):016x}"
+    value = 0
+    for row in range(0, 72, 9):
+        for x in range(row, row + 8):
+            value = (value << 1) | (px[x] > px[x + 1])
+    return value
 
-
-def _hamming_distance_hex(a: str, b: str) -> int:
-    try:
-        return (int(a, 16) ^ int(b, 16)).bit_count()
-    except Exception:
-        return 64
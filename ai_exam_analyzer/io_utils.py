@@ -1,7 +1,12 @@
 """I/O helpers for JSON files."""
 
 import json
-from typing import Any
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson  # type: ignore
+except ModuleNotFoundError:  # optional speed-up
+    orjson = None
 
 
 def load_json(path: str) -> Any:
@@ -12,3 +17,26 @@ def load_json(path: str) -> Any:
 def save_json(path: str, obj: Any) -> None:
     with open(path, "w", encoding="utf-8") as f:
         json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def dumps_compact(obj: Any) -> str:
+    """Compact JSON text for prompts; orjson (optional) gives the same output faster."""
+    if orjson is None:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def loads_json(text: str) -> Any:
+    """Parse JSON text; orjson's decode error subclasses ``json.JSONDecodeError``."""
+    if orjson is None:
+        return json.loads(text)
+    return orjson.loads(text)
+
+
+def extract_questions(data: Any) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Split a loaded dataset into its question list and optional container object."""
+    if isinstance(data, dict) and "questions" in data:
+        return data["questions"], data
+    if isinstance(data, list):
+        return data, None
+    raise ValueError("Input must be a list of questions or {questions:[...]} object.")
@@ -2,42 +2,72 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import math
+import os
+import pickle
 import re
+import sys
 import zipfile
-from collections import Counter
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
-_TOKEN_RE = re.compile(r"[A-Za-zÄÖÜäöüß0-9]{2,}")
+from ai_exam_analyzer.io_utils import dumps_compact, loads_json
 
+# Applied to lowercased text only, so the class has no uppercase ranges.
+_TOKEN_RE = re.compile(r"[a-zäöüß0-9]{2,}")
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
 
-@dataclass
+_RETRIEVAL_CACHE_SIZE = 1024
+
+# BM25 parameters
+_BM25_K1 = 1.4
+_BM25_B = 0.72
+
+
+@dataclass(slots=True)
 class Chunk:
     chunk_id: str
     source: str
     page: int
     text: str
-    tokens: set[str]
+    tokens: frozenset[str]
     term_freq: Dict[str, int]
     length: int
 
+    def __post_init__(self) -> None:
+        # The vocabulary is small compared to the total token count; interning
+        # shares one string object per term across all chunks (and pickles).
+        self.term_freq = {sys.intern(t): n for t, n in self.term_freq.items()}
+        self.tokens = frozenset(map(sys.intern, self.tokens))
+        # Chunks loaded from an index would otherwise each hold their own copy.
+        self.source = sys.intern(self.source)
+
 
 @dataclass
 class KnowledgeImage:
     image_id: str
     source: str
     page: int
-    perceptual_hash: str
+    phash_u64: int
+
+    def __post_init__(self) -> None:
+        self.source = sys.intern(self.source)
 
 
 class KnowledgeBase:
     def __init__(self, chunks: List[Chunk], images: Optional[List[KnowledgeImage]] = None):
         self.chunks = chunks
         self.images = images or []
+        self._image_hashes: List[int] = [img.phash_u64 for img in self.images]
         self._doc_count = max(1, len(chunks))
         self._avg_len = sum(c.length for c in chunks) / max(1, len(chunks))
         self._doc_freq: Dict[str, int] = {}
@@ -45,6 +75,28 @@ class KnowledgeBase:
             for t in chunk.tokens:
                 self._doc_freq[t] = self._doc_freq.get(t, 0) + 1
 
+        # BM25 term weights do not depend on the query, so the inverted index
+        # stores them directly: term -> (chunk indices, weights) as parallel
+        # lists. A query score is then just a sum over the query's postings.
+        idf = {
+            t: math.log(((self._doc_count - df + 0.5) / (df + 0.5)) + 1.0)
+            for t, df in self._doc_freq.items()
+        }
+        avg_len = max(1e-6, self._avg_len)
+        tf_scale = _BM25_K1 + 1.0
+        self._postings: Dict[str, Tuple[List[int], List[float]]] = {}
+        for idx, chunk in enumerate(chunks):
+            length_norm = _BM25_K1 * (1.0 - _BM25_B + (_BM25_B * chunk.length / avg_len))
+            for t in chunk.tokens:
+                tf = chunk.term_freq.get(t, 0)
+                # tf >= 1 on the weighted path, so the denominator needs no zero guard.
+                weight = idf[t] * ((tf * tf_scale) / (tf + length_norm)) if tf > 0 else 0.0
+                indices, weights = self._postings.setdefault(t, ([], []))
+                indices.append(idx)
+                weights.append(weight)
+
+        self._retrieval_cache: OrderedDict[Tuple[str, int, float, int], Tuple[List[Dict[str, Any]], float]] = OrderedDict()
+
     def retrieve(
         self,
         query_text: str,
@@ -53,55 +105,74 @@ class KnowledgeBase:
         min_score: float,
         max_chars: int,
     ) -> Tuple[List[Dict[str, Any]], float]:
-        q_terms = _tokenize_list(query_text)
-        if not q_terms:
+        # Review/reconstruction/explainer passes re-retrieve with the same query
+        # and settings; results are cached per KB (LRU, bounded).
+        key = (query_text, top_k, min_score, max_chars)
+        cached = self._retrieval_cache.get(key)
+        if cached is None:
+            cached = self._retrieve_uncached(query_text, top_k=top_k, min_score=min_score, max_chars=max_chars)
+            self._retrieval_cache[key] = cached
+            if len(self._retrieval_cache) > _RETRIEVAL_CACHE_SIZE:
+                self._retrieval_cache.popitem(last=False)
+        else:
+            self._retrieval_cache.move_to_end(key)
+        selected, retrieval_quality = cached
+        # Callers own the returned rows.
+        return [dict(row) for row in selected], retrieval_quality
+
+    def _retrieve_uncached(
+        self,
+        query_text: str,
+        *,
+        top_k: int,
+        min_score: float,
+        max_chars: int,
+    ) -> Tuple[List[Dict[str, Any]], float]:
+        q_unique = _query_terms(query_text)
+        if not q_unique:
             return [], 0.0
 
-        q_unique = set(q_terms)
-        scored: List[Tuple[float, Chunk]] = []
+        # Only terms present in the index can score; out-of-vocabulary queries
+        # return before any scoring state is set up.
+        q_in_vocab = self._postings.keys() & q_unique
+        if not q_in_vocab:
+            return [], 0.0
+        chunk_scores: Dict[int, float] = {}
 
         # BM25-style ranking (better than plain overlap for short exam questions)
-        k1 = 1.4
-        b = 0.72
-        for chunk in self.chunks:
-            overlap = q_unique & chunk.tokens
-            if not overlap:
-                continue
-            score = 0.0
-            for term in overlap:
-                tf = chunk.term_freq.get(term, 0)
-                if tf <= 0:
-                    continue
-                df = self._doc_freq.get(term, 0)
-                idf = math.log(((self._doc_count - df + 0.5) / (df + 0.5)) + 1.0)
-                denom = tf + (k1 * (1.0 - b + (b * chunk.length / max(1e-6, self._avg_len))))
-                score += idf * ((tf * (k1 + 1.0)) / max(1e-6, denom))
-            if score >= min_score:
-                scored.append((score, chunk))
+        postings_by_term = self._postings
+        for term in q_in_vocab:
+            for idx, weight in zip(*postings_by_term[term]):
+                chunk_scores[idx] = chunk_scores.get(idx, 0.0) + weight
+
+        # Chunk order keeps tie-breaking identical to a full scan.
+        all_chunks = self.chunks
+        scored: List[Tuple[float, Chunk]] = [
+            (score, all_chunks[idx])
+            for idx, score in sorted(chunk_scores.items())
+            if score >= min_score
+        ]
 
         if not scored:
             return [], 0.0
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-
         selected: List[Dict[str, Any]] = []
         used_chars = 0
         total_score = 0.0
         selected_sources: set[str] = set()
 
+        # Partial selection of the best candidates instead of sorting every hit
+        # (same stable order as sorted(..., reverse=True)[:n]).
+        candidates = heapq.nlargest(max(1, top_k * 6), scored, key=lambda x: x[0])
+
+        def diversity_value(i: int) -> float:
+            score, chunk = candidates[i]
+            return score + 0.12 if chunk.source not in selected_sources else score
+
         # diversity-aware greedy pick: avoid only one source dominating all evidence
-        candidates = scored[: max(1, top_k * 6)]
+        # (max() keeps the first of equal values, like the strict ">" scan did).
         while candidates and len(selected) < top_k:
-            best_idx = 0
-            best_value = -1e9
-            for i, (score, chunk) in enumerate(candidates):
-                diversity_bonus = 0.12 if chunk.source not in selected_sources else 0.0
-                value = score + diversity_bonus
-                if value > best_value:
-                    best_value = value
-                    best_idx = i
-
-            score, chunk = candidates.pop(best_idx)
+            score, chunk = candidates.pop(max(range(len(candidates)), key=diversity_value))
             snippet = chunk.text.strip()
             if not snippet:
                 continue
@@ -132,13 +203,13 @@ class KnowledgeBase:
         retrieval_quality = round(1.0 - math.exp(-0.35 * mean_score), 4)
         return selected, retrieval_quality
 
-    def find_similar_images(self, perceptual_hash: str, *, max_hamming_distance: int) -> List[Dict[str, Any]]:
-        hits: List[Tuple[int, KnowledgeImage]] = []
-        for img in self.images:
-            dist = _hamming_distance_hex(perceptual_hash, img.perceptual_hash)
-            if dist <= max_hamming_distance:
-                hits.append((dist, img))
-        hits.sort(key=lambda row: row[0])
+    def find_similar_images(self, phash_u64: int, *, max_hamming_distance: int) -> List[Dict[str, Any]]:
+        hits = [
+            (dist, img)
+            for img, h in zip(self.images, self._image_hashes)
+            if (dist := (phash_u64 ^ h).bit_count()) <= max_hamming_distance
+        ]
+        hits = heapq.nsmallest(8, hits, key=lambda row: row[0])
         return [
             {
                 "imageId": img.image_id,
@@ -146,116 +217,213 @@ class KnowledgeBase:
                 "page": img.page,
                 "hammingDistance": dist,
             }
-            for dist, img in hits[:8]
+            for dist, img in hits
         ]
 
 
 def _tokenize(text: str) -> set[str]:
-    return {m.group(0).lower() for m in _TOKEN_RE.finditer(text or "")}
+    return set(_TOKEN_RE.findall((text or "").lower()))
 
 
 def _tokenize_list(text: str) -> List[str]:
-    return [m.group(0).lower() for m in _TOKEN_RE.finditer(text or "")]
+    # Lowercase the whole text once instead of every match.
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+@lru_cache(maxsize=2048)
+def _query_terms(text: str) -> frozenset[str]:
+    return frozenset(_tokenize_list(text))
 
 
 def _term_freq(text: str) -> Dict[str, int]:
     return dict(Counter(_tokenize_list(text)))
 
 
+def _tokenize_and_tf(text: str) -> Tuple[frozenset[str], Dict[str, int]]:
+    """Token set and term frequencies from a single tokenizer pass."""
+    term_freq = _term_freq(text)
+    return frozenset(term_freq), term_freq
+
+
 def _chunk_text(text: str, *, max_chars: int) -> List[str]:
-    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text or "") if p.strip()]
+    paragraphs = [p.strip() for p in _PARAGRAPH_SPLIT_RE.split(text or "") if p.strip()]
     if not paragraphs:
         paragraphs = [line.strip() for line in (text or "").splitlines() if line.strip()]
 
+    # Paragraphs are collected as parts with a running length and joined only
+    # when a chunk is emitted, instead of re-concatenating the buffer per part.
     chunks: List[str] = []
-    buf = ""
+    buf_parts: List[str] = []
+    buf_len = 0
     for part in paragraphs:
         if len(part) > max_chars:
             for i in range(0, len(part), max_chars):
                 segment = part[i : i + max_chars].strip()
                 if segment:
-                    if buf:
-                        chunks.append(buf)
-                        buf = ""
+                    if buf_parts:
+                        chunks.append("\n\n".join(buf_parts))
+                        buf_parts = []
+                        buf_len = 0
                     chunks.append(segment)
             continue
 
-        candidate = f"{buf}\n\n{part}".strip() if buf else part
-        if len(candidate) <= max_chars:
-            buf = candidate
+        if not buf_parts:
+            buf_parts = [part]
+            buf_len = len(part)
+        elif buf_len + 2 + len(part) <= max_chars:
+            buf_parts.append(part)
+            buf_len += 2 + len(part)
         else:
-            if buf:
-                chunks.append(buf)
-            buf = part
+            chunks.append("\n\n".join(buf_parts))
+            buf_parts = [part]
+            buf_len = len(part)
 
-    if buf:
-        chunks.append(buf)
+    if buf_parts:
+        chunks.append("\n\n".join(buf_parts))
 
     return chunks
 
 
-def _extract_pdf_chunks_from_bytes(raw_pdf: bytes, source_name: str, max_chunk_chars: int) -> List[Chunk]:
+def _iter_pdf_pages(raw_pdf: bytes) -> Iterator[Tuple[int, str, List[bytes]]]:
+    """Yield ``(page number, text, raw image bytes)`` for each PDF page.
+
+    PyMuPDF (C-backed, much faster text extraction) is used when installed;
+    pypdf is the fallback.
+    """
+    try:
+        import fitz  # type: ignore
+    except ModuleNotFoundError:
+        fitz = None
+
+    if fitz is not None:
+        with fitz.open(stream=raw_pdf, filetype="pdf") as doc:
+            for p_idx, page in enumerate(doc, start=1):
+                images: List[bytes] = []
+                for image_info in page.get_images(full=True):
+                    try:
+                        images.append((doc.extract_image(image_info[0]) or {}).get("image") or b"")
+                    except Exception:
+                        # keep numbering aligned; empty images are skipped
+                        images.append(b"")
+                yield p_idx, page.get_text("text") or "", images
+        return
+
     try:
         from pypdf import PdfReader  # type: ignore
     except ModuleNotFoundError as exc:
         raise RuntimeError(
-            "Knowledge ZIP contains PDFs, but dependency `pypdf` is missing. Install with: pip install pypdf"
+            "Knowledge ZIP contains PDFs, but neither `pymupdf` nor `pypdf` is installed. "
+            "Install with: pip install pymupdf (or: pip install pypdf)"
         ) from exc
 
     reader = PdfReader(BytesIO(raw_pdf))
-    result: List[Chunk] = []
-
     for p_idx, page in enumerate(reader.pages, start=1):
-        text = (page.extract_text() or "").strip()
-        if not text:
-            continue
-
-        for c_idx, chunk_text in enumerate(_chunk_text(text, max_chars=max_chunk_chars), start=1):
-            chunk_id = f"{source_name}#p{p_idx}c{c_idx}"
-            tokens = _tokenize(chunk_text)
-            if not tokens:
-                continue
-            term_freq = _term_freq(chunk_text)
-            result.append(
-                Chunk(
-                    chunk_id=chunk_id,
-                    source=source_name,
-                    page=p_idx,
-                    text=chunk_text,
-                    tokens=tokens,
-                    term_freq=term_freq,
-                    length=max(1, sum(term_freq.values())),
-                )
-            )
+        images = [getattr(image, "data", b"") for image in (getattr(page, "images", None) or [])]
+        text = (page.extract_text() or "") if _pypdf_page_may_have_text(page) else ""
+        yield p_idx, text, images
 
-    return result
 
+def _pypdf_page_may_have_text(page: Any) -> bool:
+    """Cheap pre-check so image-only (scanned) pages skip pypdf's text parser.
 
-def _extract_pdf_images_from_bytes(raw_pdf: bytes, source_name: str) -> List[KnowledgeImage]:
+    Only answers ``False`` when the content stream has no text-showing operator
+    and draws no form XObjects (which could contain text); otherwise ``True``.
+    """
     try:
-        from pypdf import PdfReader  # type: ignore
-    except ModuleNotFoundError:
-        return []
+        contents = page.get_contents()
+        if contents is None:
+            return False
+        data = contents.get_data()
+        if b"Tj" in data or b"TJ" in data or b"'" in data or b'"' in data:
+            return True
+        resources = page.get("/Resources")
+        if resources is None:
+            # inherited from the page tree; do not guess
+            return True
+        xobjects = resources.get_object().get("/XObject")
+        if xobjects is None:
+            return False
+        xobjects = xobjects.get_object()
+        return any(xobjects[name].get("/Subtype") == "/Form" for name in xobjects)
+    except Exception:
+        return True
 
-    reader = PdfReader(BytesIO(raw_pdf))
-    result: List[KnowledgeImage] = []
-    for p_idx, page in enumerate(reader.pages, start=1):
-        images = getattr(page, "images", None)
-        if not images:
-            continue
-        for i, image in enumerate(images, start=1):
-            raw = getattr(image, "data", b"")
+
+def _extract_pdf_from_bytes(
+    raw_pdf: bytes,
+    source_name: str,
+    max_chunk_chars: int,
+) -> Tuple[List[Chunk], List[KnowledgeImage]]:
+    """Parse a PDF once and collect its text chunks and images page by page."""
+    chunks: List[Chunk] = []
+    images: List[KnowledgeImage] = []
+
+    for p_idx, page_text, page_images in _iter_pdf_pages(raw_pdf):
+        text = page_text.strip()
+        if text:
+            for c_idx, chunk_text in enumerate(_chunk_text(text, max_chars=max_chunk_chars), start=1):
+                chunk_id = f"{source_name}#p{p_idx}c{c_idx}"
+                tokens, term_freq = _tokenize_and_tf(chunk_text)
+                if not tokens:
+                    continue
+                chunks.append(
+                    Chunk(
+                        chunk_id=chunk_id,
+                        source=source_name,
+                        page=p_idx,
+                        text=chunk_text,
+                        tokens=tokens,
+                        term_freq=term_freq,
+                        length=max(1, sum(term_freq.values())),
+                    )
+                )
+
+        for i, raw in enumerate(page_images, start=1):
             if not raw:
                 continue
-            result.append(
+            images.append(
                 KnowledgeImage(
                     image_id=f"{source_name}#p{p_idx}i{i}",
                     source=source_name,
                     page=p_idx,
-                    perceptual_hash=_compute_perceptual_hash(raw),
+                    phash_u64=_compute_perceptual_hash(raw),
                 )
             )
-    return result
+
+    return chunks, images
+
+
+def _extract_text_chunks(raw: bytes, source_name: str, max_chunk_chars: int) -> List[Chunk]:
+    text = raw.decode("utf-8", errors="ignore")
+    chunks: List[Chunk] = []
+    for i, chunk_text in enumerate(_chunk_text(text, max_chars=max_chunk_chars), start=1):
+        tokens, term_freq = _tokenize_and_tf(chunk_text)
+        if not tokens:
+            continue
+        chunks.append(
+            Chunk(
+                chunk_id=f"{source_name}#t{i}",
+                source=source_name,
+                page=0,
+                text=chunk_text,
+                tokens=tokens,
+                term_freq=term_freq,
+                length=max(1, sum(term_freq.values())),
+            )
+        )
+    return chunks
+
+
+def _start_pdf_pool(pdf_count: int) -> Optional[ProcessPoolExecutor]:
+    """Worker pool for PDF parsing, or ``None`` to parse in-process."""
+    workers = min(pdf_count, os.cpu_count() or 1)
+    if workers < 2:
+        return None
+    try:
+        return ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError):
+        # e.g. sandboxes without working multiprocessing primitives
+        return None
 
 
 def build_knowledge_base_from_zip(
@@ -295,46 +463,62 @@ def build_knowledge_base_from_zip(
             entries.append((info, lower, matches_subject))
 
         apply_subject_filter = bool(subject_tokens and has_subject_overlap)
-
+        selected_entries: List[Tuple[zipfile.ZipInfo, str]] = []
         for info, lower, matches_subject in entries:
-            name = info.filename
-            basename = Path(name).name
-
             if apply_subject_filter and not matches_subject:
-                skipped_by_subject.append(name)
+                skipped_by_subject.append(info.filename)
                 continue
-
-            raw = zf.read(info)
-
-            if lower.endswith(".pdf"):
-                file_chunks = _extract_pdf_chunks_from_bytes(raw, basename, max_chunk_chars)
-                chunks.extend(file_chunks)
-                images.extend(_extract_pdf_images_from_bytes(raw, basename))
-                if not file_chunks:
-                    no_text_files.append(name)
-            else:
-                text = raw.decode("utf-8", errors="ignore")
-                had_text_chunk = False
-                for i, chunk_text in enumerate(_chunk_text(text, max_chars=max_chunk_chars), start=1):
-                    chunk_id = f"{basename}#t{i}"
-                    tokens = _tokenize(chunk_text)
-                    if not tokens:
-                        continue
-                    had_text_chunk = True
-                    term_freq = _term_freq(chunk_text)
-                    chunks.append(
-                        Chunk(
-                            chunk_id=chunk_id,
-                            source=basename,
-                            page=0,
-                            text=chunk_text,
-                            tokens=tokens,
-                            term_freq=term_freq,
-                            length=max(1, sum(term_freq.values())),
-                        )
-                    )
-                if not had_text_chunk:
-                    no_text_files.append(name)
+            selected_entries.append((info, lower))
+
+        # PDF parsing is CPU-bound pure Python (pypdf), so multiple PDFs are
+        # parsed in worker processes. Results are consumed in archive order to
+        # keep chunk order (and retrieval tie-breaking) deterministic.
+        pdf_count = sum(1 for _, lower in selected_entries if lower.endswith(".pdf"))
+        pool = _start_pdf_pool(pdf_count)
+        # Raw PDFs are held only while their job is in flight; capping the
+        # number of submitted jobs bounds peak memory to a few files instead of
+        # the whole archive.
+        max_in_flight = 2 * min(pdf_count, os.cpu_count() or 1)
+        # (archive name, raw PDF kept for a serial retry, future or finished result)
+        pending: Deque[Tuple[str, bytes, Any]] = deque()
+        in_flight = 0
+
+        def consume_next() -> None:
+            nonlocal in_flight
+            name, raw, job = pending.popleft()
+            if isinstance(job, Future):
+                in_flight -= 1
+                try:
+                    job = job.result()
+                except BrokenProcessPool:
+                    job = _extract_pdf_from_bytes(raw, Path(name).name, max_chunk_chars)
+            file_chunks, file_images = job
+            chunks.extend(file_chunks)
+            images.extend(file_images)
+            if not file_chunks:
+                no_text_files.append(name)
+
+        try:
+            for info, lower in selected_entries:
+                name = info.filename
+                basename = Path(name).name
+
+                if not lower.endswith(".pdf"):
+                    pending.append((name, b"", (_extract_text_chunks(zf.read(info), basename, max_chunk_chars), [])))
+                elif pool is not None:
+                    while in_flight >= max_in_flight:
+                        consume_next()
+                    raw = zf.read(info)
+                    pending.append((name, raw, pool.submit(_extract_pdf_from_bytes, raw, basename, max_chunk_chars)))
+                    in_flight += 1
+                else:
+                    pending.append((name, b"", _extract_pdf_from_bytes(zf.read(info), basename, max_chunk_chars)))
+
+            while pending:
+                consume_next()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
 
     if not chunks:
         details: List[str] = []
@@ -376,7 +560,7 @@ def save_index_json(path: str, kb: KnowledgeBase) -> None:
             "source": c.source,
             "page": c.page,
             "text": c.text,
-            "tokens": sorted(c.tokens),
+            # Token sets are not stored: they are the keys of termFreq.
             "termFreq": c.term_freq,
             "length": c.length,
         }
@@ -389,42 +573,127 @@ def save_index_json(path: str, kb: KnowledgeBase) -> None:
                 "imageId": img.image_id,
                 "source": img.source,
                 "page": img.page,
-                "perceptualHash": img.perceptual_hash,
+                "perceptualHash": f"{img.phash_u64:016x}",
             }
             for img in kb.images
         ],
     }
-    Path(path).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Compact output: the index is machine-read and indentation roughly
+    # doubled its size. orjson (optional) serializes several times faster.
+    Path(path).write_text(dumps_compact(payload), encoding="utf-8")
+    save_index_pickle(path, kb)
+
+
+def _index_pickle_path(json_path: str) -> str:
+    return f"{json_path}.pkl"
+
+
+_INDEX_PICKLE_FORMAT = 2
+
+
+@lru_cache(maxsize=1)
+def _module_source_digest() -> str:
+    """Hash of this module's source; pickled ``Chunk`` layouts change with it."""
+    try:
+        with open(__file__, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except OSError:
+        return ""
+
+
+def _index_stamp(json_path: str) -> bytes:
+    stat = os.stat(json_path)
+    stamp = {
+        "format": _INDEX_PICKLE_FORMAT,
+        "module": _module_source_digest(),
+        "size": stat.st_size,
+        "mtimeNs": stat.st_mtime_ns,
+    }
+    return json.dumps(stamp, sort_keys=True).encode("ascii") + b"\n"
+
+
+def save_index_pickle(json_path: str, kb: KnowledgeBase) -> None:
+    """Write a binary sidecar of the JSON index for fast reloads (best effort).
+
+    The sidecar starts with a plain JSON header line holding a format version,
+    a hash of this module's source and the JSON file's size and mtime, so
+    neither a hand-edited JSON index nor a changed ``Chunk`` layout is shadowed
+    by a stale cache. The header is compared before anything is unpickled; it
+    does not make foreign sidecars safe to load.
+    """
+    try:
+        with open(_index_pickle_path(json_path), "wb") as f:
+            f.write(_index_stamp(json_path))
+            pickle.dump((kb.chunks, kb.images), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+
+def load_index_pickle(json_path: str) -> Optional[KnowledgeBase]:
+    """Load the binary sidecar of ``json_path`` if it is present and current."""
+    try:
+        stamp = _index_stamp(json_path)
+        with open(_index_pickle_path(json_path), "rb") as f:
+            if f.readline(len(stamp) + 1) != stamp:
+                return None
+            chunks, images = pickle.load(f)
+    except Exception:
+        return None
+    return KnowledgeBase(chunks, images=images)
 
 
 def load_index_json(path: str) -> KnowledgeBase:
-    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    cached = load_index_pickle(path)
+    if cached is not None:
+        return cached
+
+    kb = _parse_index_json(path)
+    save_index_pickle(path, kb)
+    return kb
+
+
+def _parse_index_json(path: str) -> KnowledgeBase:
+    data = loads_json(Path(path).read_text(encoding="utf-8"))
     if isinstance(data, list):
         data = {"chunks": data, "images": []}
     chunks: List[Chunk] = []
     for row in data.get("chunks", []):
         text = row.get("text", "")
-        term_freq = row.get("termFreq") or _term_freq(text)
+        raw_term_freq = row.get("termFreq")
+        if raw_term_freq:
+            term_freq = {str(k): int(v) for k, v in raw_term_freq.items()}
+            tokens = frozenset(row.get("tokens") or term_freq)
+        else:
+            tokens, term_freq = _tokenize_and_tf(text)
+            if row.get("tokens"):
+                tokens = frozenset(row["tokens"])
         chunks.append(
             Chunk(
                 chunk_id=row["chunkId"],
                 source=row.get("source", "unknown"),
                 page=int(row.get("page", 0)),
                 text=text,
-                tokens=set(row.get("tokens") or _tokenize(text)),
-                term_freq={str(k): int(v) for k, v in term_freq.items()},
-                length=int(row.get("length") or max(1, sum(int(v) for v in term_freq.values()))),
+                tokens=tokens,
+                term_freq=term_freq,
+                length=int(row.get("length") or max(1, sum(term_freq.values()))),
             )
         )
-    images = [
-        KnowledgeImage(
-            image_id=row.get("imageId", ""),
-            source=row.get("source", "unknown"),
-            page=int(row.get("page", 0)),
-            perceptual_hash=row.get("perceptualHash", "0" * 16),
+    images: List[KnowledgeImage] = []
+    for row in data.get("images", []):
+        # Index files keep the hash as 16-char hex; parse it once here. Rows with an
+        # unparsable hash could never match, so they are dropped.
+        try:
+            phash_u64 = int(str(row.get("perceptualHash", "0" * 16)), 16)
+        except ValueError:
+            continue
+        images.append(
+            KnowledgeImage(
+                image_id=row.get("imageId", ""),
+                source=row.get("source", "unknown"),
+                page=int(row.get("page", 0)),
+                phash_u64=phash_u64,
+            )
         )
-        for row in data.get("images", [])
-    ]
     return KnowledgeBase(chunks, images=images)
 
 
@@ -435,27 +704,22 @@ def build_query_text(payload: Dict[str, Any]) -> str:
     return "\n".join(x for x in parts if x)
 
 
-def _compute_perceptual_hash(raw: bytes) -> str:
+def _compute_perceptual_hash(raw: bytes) -> int:
     try:
         from PIL import Image  # type: ignore
     except ModuleNotFoundError:
-        return raw[:8].hex().ljust(16, "0")
+        return int.from_bytes(raw[:8].ljust(8, b"\0"), "big")
     try:
         with Image.open(BytesIO(raw)) as img:
             img = img.convert("L").resize((9, 8))
-            px = list(img.getdata())
+            # 8 rows of 9 grayscale bytes; indexing bytes yields ints directly.
+            px = img.tobytes()
     except Exception:
-        return raw[:8].hex().ljust(16, "0")
+        return int.from_bytes(raw[:8].ljust(8, b"\0"), "big")
 
-    bits = []
-    for y in range(8):
-        for x in range(8):
-            bits.append("1" if px[y * 9 + x] > px[y * 9 + x + 1] else "0")
-    return f"{int(''.join(bits), 2):016x}"
+    value = 0
+    for row in range(0, 72, 9):
+        for x in range(row, row + 8):
+            value = (value << 1) | (px[x] > px[x + 1])
+    return value
 
-
-def _hamming_distance_hex(a: str, b: str) -> int:
-    try:
-        return (int(a, 16) ^ int(b, 16)).bit_count()
-    except Exception:
-        return 64
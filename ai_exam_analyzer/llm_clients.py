@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import base64
-import json
+import importlib.util
 import os
 import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Union
 
+from ai_exam_analyzer.io_utils import loads_json
 from ai_exam_analyzer.openai_client import call_json_schema as _openai_call_json_schema
 
 
@@ -18,16 +19,34 @@ class LLMClient:
     client: Any
 
 
+_FENCE_OPEN_RE = re.compile(r"^```(?:json)?")
+_FENCE_CLOSE_RE = re.compile(r"```$")
+# String literals are consumed whole so braces inside them do not count.
+_JSON_BRACE_SCAN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]', re.DOTALL)
+
+
 def _extract_json_object(raw_text: str) -> str:
     text = (raw_text or "").strip()
     if not text:
         return text
     if text.startswith("```"):
-        text = re.sub(r"^```(?:json)?", "", text).strip()
-        text = re.sub(r"```$", "", text).strip()
+        text = _FENCE_OPEN_RE.sub("", text).strip()
+        text = _FENCE_CLOSE_RE.sub("", text).strip()
     start = text.find("{")
+    if start < 0:
+        return text
+    depth = 0
+    for match in _JSON_BRACE_SCAN_RE.finditer(text, start):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : match.end()]
+    # Unbalanced (e.g. truncated) output: keep the widest brace span.
     end = text.rfind("}")
-    if start >= 0 and end > start:
+    if end > start:
         return text[start : end + 1]
     return text
 
@@ -100,7 +119,7 @@ class GeminiResponsesAdapter:
                 text = str(getattr(resp, "text", "") or "").strip()
                 if not text:
                     raise RuntimeError("Gemini returned empty response text.")
-                parsed = json.loads(_extract_json_object(text))
+                parsed = loads_json(_extract_json_object(text))
                 if not isinstance(parsed, dict):
                     raise RuntimeError(f"Gemini structured output must decode to object, got {type(parsed).__name__}.")
                 usage = getattr(resp, "usage_metadata", None)
@@ -119,6 +138,26 @@ class GeminiResponsesAdapter:
         raise last_error
 
 
+def _build_openai_http_client() -> Optional[Any]:
+    """One pooled HTTP client shared by all calls (and look-ahead threads) of a run.
+
+    Keeps the SDK's default timeouts/redirect handling; HTTP/2 multiplexing is
+    used when the optional `h2` package is installed.
+    """
+    http2 = importlib.util.find_spec("h2") is not None
+
+    import httpx
+
+    try:
+        from openai import DefaultHttpxClient
+    except ImportError:  # openai < 1.17: keep the SDK's own client
+        return None
+    return DefaultHttpxClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+
+
 def build_llm_client(*, provider: str, api_key: Optional[str] = None) -> LLMClient:
     normalized = (provider or "openai").strip().lower()
     if normalized not in {"openai", "gemini"}:
@@ -129,7 +168,7 @@ def build_llm_client(*, provider: str, api_key: Optional[str] = None) -> LLMClie
             from openai import OpenAI
         except ModuleNotFoundError as exc:
             raise RuntimeError("Missing dependency: install `openai` package (e.g. `pip install openai`).") from exc
-        return LLMClient(provider="openai", client=OpenAI(api_key=api_key))
+        return LLMClient(provider="openai", client=OpenAI(api_key=api_key, http_client=_build_openai_http_client()))
 
     gemini_key = api_key or os.getenv("GEMINI_API_KEY")
     if not gemini_key:
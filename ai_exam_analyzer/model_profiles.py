@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import Any, Dict
 
@@ -20,6 +21,8 @@ QUALITY_PROFILE_LABELS: Dict[str, str] = {
     "fully_cost_optimized": "Voll kostenoptimiert",
 }
 
+_MODEL_TAG_RE = re.compile(r"[a-z0-9]+")
+
 
 @dataclass(frozen=True)
 class WorkflowBudget:
@@ -82,9 +85,10 @@ def get_quality_cost_profile(*, provider: str, profile: str) -> QualityCostProfi
 
 
 def apply_quality_cost_profile(args: Any, *, include_optional_toggles: bool = True) -> Any:
+    values = vars(args)
     profile = get_quality_cost_profile(
-        provider=str(getattr(args, "llm_provider", "openai")),
-        profile=str(getattr(args, "quality_cost_profile", "quality")),
+        provider=str(values.get("llm_provider", "openai")),
+        profile=str(values.get("quality_cost_profile", "quality")),
     )
     args.passA_model = profile.pass_a_model
     args.passB_model = profile.pass_b_model
@@ -110,7 +114,8 @@ def apply_quality_cost_profile(args: Any, *, include_optional_toggles: bool = Tr
 
 def derive_workflow_budget(*, provider: str, pass_a_model: str, pass_b_model: str, default_top_k: int, default_max_chars: int, default_min_score: float) -> WorkflowBudget:
     provider_norm = (provider or "openai").strip().lower()
-    model_hint = f"{pass_a_model} {pass_b_model}".lower()
+    # Whole-tag lookup: "pro" must not match inside e.g. "...-prompt".
+    model_tags = set(_MODEL_TAG_RE.findall(f"{pass_a_model} {pass_b_model}".lower()))
     top_k = int(default_top_k)
     max_chars = int(default_max_chars)
     min_score = float(default_min_score)
@@ -118,7 +123,7 @@ def derive_workflow_budget(*, provider: str, pass_a_model: str, pass_b_model: st
         top_k = max(top_k, 8)
         max_chars = max(max_chars, 6500)
         min_score = max(0.03, min(min_score, 0.05))
-        if "pro" in model_hint:
+        if "pro" in model_tags:
             top_k = max(top_k, 10)
             max_chars = max(max_chars, 8000)
     else:
@@ -128,15 +133,16 @@ def derive_workflow_budget(*, provider: str, pass_a_model: str, pass_b_model: st
 
 
 def apply_model_optimized_defaults(args: Any) -> Any:
-    if hasattr(args, "quality_cost_profile"):
+    values = vars(args)
+    if "quality_cost_profile" in values:
         return apply_quality_cost_profile(args)
     budget = derive_workflow_budget(
-        provider=str(getattr(args, "llm_provider", "openai")),
-        pass_a_model=str(getattr(args, "passA_model", "")),
-        pass_b_model=str(getattr(args, "passB_model", "")),
-        default_top_k=int(getattr(args, "knowledge_top_k", 6)),
-        default_max_chars=int(getattr(args, "knowledge_max_chars", 4000)),
-        default_min_score=float(getattr(args, "knowledge_min_score", 0.06)),
+        provider=str(values.get("llm_provider", "openai")),
+        pass_a_model=str(values.get("passA_model", "")),
+        pass_b_model=str(values.get("passB_model", "")),
+        default_top_k=int(values.get("knowledge_top_k", 6)),
+        default_max_chars=int(values.get("knowledge_max_chars", 4000)),
+        default_min_score=float(values.get("knowledge_min_score", 0.06)),
     )
     args.knowledge_top_k = budget.knowledge_top_k
     args.knowledge_max_chars = budget.knowledge_max_chars
@@ -0,0 +1,59 @@
+"""Normalized view of a raw question, shared by payload building and preprocessing."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedQuestion:
+    """Stripped fields of a raw question; each field is read and stripped once.
+
+    ``answers`` holds ``(id, stripped text, external answerIndex)`` per answer in
+    array order. ``has_image_fields`` follows the raw image lists (also when their
+    entries are blank), ``image_refs``/``image_urls`` only keep non-blank entries.
+    """
+
+    question_id: Any
+    question_text: str
+    question_html: str
+    explanation_text: str
+    answers: Tuple[Tuple[Any, str, int], ...]
+    correct_indices: List[Any]
+    image_refs: List[str]
+    image_urls: List[str]
+    has_image_fields: bool
+
+
+def _derive_answer_index(answer: Dict[str, Any], fallback_position: int) -> int:
+    """Return stable external answer index (1-based by default)."""
+    for key in ("answerIndex", "position", "index"):
+        value = answer.get(key)
+        if isinstance(value, int) and value > 0:
+            return value
+    return fallback_position
+
+
+def _stripped_nonblank(raw: Any) -> List[str]:
+    """Stripped, non-blank string forms of ``raw``'s entries (each stripped once)."""
+    if not raw:
+        return []
+    return [s for s in (str(ref).strip() for ref in raw) if s]
+
+
+def normalize_question(q: Dict[str, Any]) -> NormalizedQuestion:
+    raw_files = q.get("imageFiles")
+    raw_urls = q.get("imageUrls")
+    return NormalizedQuestion(
+        question_id=q.get("id"),
+        question_text=(q.get("questionText") or "").strip(),
+        question_html=str(q.get("questionHtml") or ""),
+        explanation_text=(q.get("explanationText") or "").strip(),
+        answers=tuple(
+            (a.get("id"), (a.get("text") or "").strip(), _derive_answer_index(a, i + 1))
+            for i, a in enumerate(q.get("answers") or [])
+        ),
+        correct_indices=q.get("correctIndices") or [],
+        image_refs=_stripped_nonblank(raw_files),
+        image_urls=_stripped_nonblank(raw_urls),
+        has_image_fields=bool(raw_urls or raw_files),
+    )
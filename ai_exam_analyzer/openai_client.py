@@ -1,14 +1,429 @@
 """OpenAI API helpers."""
 
+import copy
+import hashlib
 import json
+import os
+import random
+import re
+import sqlite3
+import threading
 import time
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache, singledispatch
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
+from ai_exam_analyzer.io_utils import dumps_compact, loads_json
 
+# Directory of the persistent response cache; caching is off when unset.
+RESPONSE_CACHE_DIR_ENV = "AI_EXAM_CACHE_DIR"
+_RESPONSE_CACHE_VERSION = b"v2"
+_RESPONSE_CACHE_FILE = "responses.sqlite3"
+
+
+class ResponseCache:
+    """Content-addressed store of structured responses in one SQLite (WAL) file.
+
+    Best effort: unreadable entries count as misses and write failures are
+    ignored, so a broken cache never fails an analysis run. One connection per
+    file is shared by all threads and serialized with a lock.
+    """
+
+    _instances: Dict[str, "ResponseCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        root = os.environ.get(RESPONSE_CACHE_DIR_ENV, "").strip()
+        if not root:
+            return None
+        path = os.path.join(os.path.expanduser(root), _RESPONSE_CACHE_FILE)
+        with cls._instances_lock:
+            cache = cls._instances.get(path)
+            if cache is None:
+                cache = cls._instances[path] = cls(path)
+            return cache
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS resp (key TEXT PRIMARY KEY, payload TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._lock:
+                row = self._connection().execute("SELECT payload FROM resp WHERE key = ?", (key,)).fetchone()
+            data = loads_json(row[0]) if row is not None else None
+        except (OSError, sqlite3.Error, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            payload = dumps_compact(value)
+            with self._lock:
+                self._connection().execute(
+                    "INSERT OR REPLACE INTO resp (key, payload, created_at) VALUES (?, ?, ?)",
+                    (key, payload, int(time.time())),
+                )
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            pass
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution.
+
+    ``do`` returns ``(value, is_follower)``; followers block until the leader
+    finishes and receive its value (or its exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._calls[key] = Future()
+        if not is_leader:
+            return future.result(), True
+        try:
+            value = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            return value, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+_in_flight = SingleFlight()
+
+
+# Optional client-side rate shaping (per model), e.g. the account's TPM/RPM limits.
+TOKENS_PER_MINUTE_ENV = "AI_EXAM_OPENAI_TPM"
+REQUESTS_PER_MINUTE_ENV = "AI_EXAM_OPENAI_RPM"
+_MAX_RETRY_SLEEP_S = 30.0
+
+_TERMINAL_STATUSES = frozenset({"completed", "failed", "incomplete", "cancelled"})
+# Exponential poll schedule for responses that are still queued/in progress:
+# quick first checks, about 3 s in total.
+_POLL_DELAYS_S = (0.1, 0.2, 0.4, 0.8, 1.6)
+
+# Receive responses as server-sent events instead of create + polling. Used by
+# default for non-reasoning models when the SDK has the ``responses.stream``
+# helper (reasoning models may require a verified organization to stream); the
+# env var forces it on ("1") or off ("0").
+STREAM_ENV = "AI_EXAM_OPENAI_STREAM"
+_TERMINAL_STREAM_EVENTS = frozenset({"response.completed", "response.incomplete", "response.failed"})
+# Models whose stream request was rejected (4xx); they use create + polling.
+_stream_rejected_models: set = set()
+_stream_rejected_lock = threading.Lock()
+
+
+def _streaming_enabled(client: Any, model: str) -> bool:
+    with _stream_rejected_lock:
+        if model in _stream_rejected_models:
+            return False
+    value = os.environ.get(STREAM_ENV, "").strip().lower()
+    if value in {"1", "true", "yes", "on"}:
+        return True
+    if value in {"0", "false", "no", "off"}:
+        return False
+    if is_reasoning_model(model):
+        return False
+    return callable(getattr(getattr(client, "responses", None), "stream", None))
+
+
+_STREAM_REFUSED_RE = re.compile(r"stream|organi[sz]ation (?:must be )?verif", re.IGNORECASE)
+
+
+def _is_stream_refused(exc: Exception) -> bool:
+    """4xx that refuses streaming itself (403, or a message about streaming/verification).
+
+    Other client errors (context length, bad image URL, invalid schema, ...) would
+    fail the same way without streaming and are re-raised unchanged.
+    """
+    status = getattr(exc, "status_code", None)
+    if not isinstance(status, int) or not 400 <= status < 500 or status in (408, 409, 429):
+        return False
+    return status == 403 or _STREAM_REFUSED_RE.search(str(exc)) is not None
+
+
+def _reject_streaming(model: str) -> None:
+    with _stream_rejected_lock:
+        _stream_rejected_models.add(model)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until enough budget is available."""
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> None:
+        # Requests larger than the bucket would never fit; let them drain it instead.
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._available = min(self.capacity, self._available + (now - self._updated) * self.refill_per_sec)
+                self._updated = now
+                if self._available >= amount:
+                    self._available -= amount
+                    return
+                wait_s = (amount - self._available) / self.refill_per_sec
+            time.sleep(wait_s)
+
+
+_rate_limiters: Dict[str, Optional[TokenBucket]] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _per_minute_bucket(env_name: str, model: str) -> Optional[TokenBucket]:
+    key = f"{env_name}:{model}"
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            try:
+                per_minute = float(os.environ.get(env_name, "") or 0)
+            except ValueError:
+                per_minute = 0.0
+            _rate_limiters[key] = TokenBucket(per_minute, per_minute / 60.0) if per_minute > 0 else None
+        return _rate_limiters[key]
+
+
+def _estimate_input_tokens(system: str, user: Union[str, List[Dict[str, Any]]]) -> int:
+    """Rough token estimate (~4 chars/token); images count as a flat budget."""
+    chars = len(system)
+    if isinstance(user, str):
+        chars += len(user)
+    else:
+        for item in user:
+            if item.get("type") == "input_text":
+                chars += len(str(item.get("text") or ""))
+            else:
+                chars += 4 * 800
+    return chars // 4
+
+
+# Adaptive output budget: once enough calls of a (model, format) pair were seen,
+# start with ~p99 of their output tokens when that exceeds the caller's budget,
+# so outputs that regularly hit the limit are not truncated and re-sent.
+# Truncated calls are recorded with their full budget; the history only raises
+# the starting budget, never lowers it.
+_OUTPUT_HISTORY_SIZE = 256
+_OUTPUT_HISTORY_MIN_SAMPLES = 32
+_MAX_INCOMPLETE_OUTPUT_TOKENS = 4000
+_output_tokens_seen: Dict[Tuple[str, str], Deque[int]] = {}
+_output_tokens_lock = threading.Lock()
+
+
+def _record_output_tokens(model: str, format_name: str, output_tokens: int) -> None:
+    if output_tokens <= 0:
+        return
+    with _output_tokens_lock:
+        history = _output_tokens_seen.setdefault((model, format_name), deque(maxlen=_OUTPUT_HISTORY_SIZE))
+        history.append(int(output_tokens))
+
+
+def _initial_output_budget(model: str, format_name: str, default: int) -> int:
+    """``default`` until enough samples exist, then p99 * 1.15 (never below ``default``)."""
+    with _output_tokens_lock:
+        history = sorted(_output_tokens_seen.get((model, format_name)) or ())
+    if len(history) < _OUTPUT_HISTORY_MIN_SAMPLES:
+        return default
+    p99 = history[min(len(history) - 1, int(0.99 * len(history)))]
+    ceiling = max(default, _MAX_INCOMPLETE_OUTPUT_TOKENS)
+    return min(ceiling, max(default, int(p99 * 1.15)))
+
+
+_INCOMPLETE_RE = re.compile(r"response not completed: (?:incomplete|in_progress|queued)", re.IGNORECASE)
+# Fallback for errors that do not come from the openai SDK (or wrap its errors).
+_RETRYABLE_MESSAGE_RE = re.compile(r"timed out|rate limit|temporarily unavailable|connection", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def _retryable_exception_types() -> Tuple[type, ...]:
+    """Transient openai SDK errors: 429, timeouts, connection failures and 5xx."""
+    try:
+        import openai
+    except ModuleNotFoundError:
+        return ()
+    return (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def _retry_delay(attempt: int, exc: Exception) -> float:
+    """Server-provided retry hint if present, else exponential backoff with jitter."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        try:
+            if headers.get("retry-after-ms"):
+                return min(_MAX_RETRY_SLEEP_S, float(headers["retry-after-ms"]) / 1000.0)
+            if headers.get("retry-after"):
+                return min(_MAX_RETRY_SLEEP_S, float(headers["retry-after"]))
+        except (TypeError, ValueError):
+            pass
+    return min(_MAX_RETRY_SLEEP_S, 0.5 * 2 ** attempt * (1 + random.random() * 0.3))
+
+
+@dataclass(frozen=True, slots=True)
+class _SchemaFormat:
+    schema: Dict[str, Any]
+    text: Dict[str, Any]
+    schema_digest: bytes
+
+
+_SCHEMA_FORMAT_CACHE_SIZE = 32
+_schema_formats: "OrderedDict[Tuple[int, str], _SchemaFormat]" = OrderedDict()
+_schema_formats_lock = threading.Lock()
+
+
+def _schema_format(schema: Dict[str, Any], format_name: str) -> _SchemaFormat:
+    """Structured-output request fragment and schema digest, built once per schema.
+
+    Every call for a schema then sends the very same ``text`` object, so the
+    serialized request prefix stays byte-stable. Keyed by object identity (the
+    entry keeps the schema alive, so the id cannot be reused); schemas are
+    built once per run and never mutated. Key order is left as is: it defines
+    the order in which the model writes the fields.
+    """
+    key = (id(schema), format_name)
+    with _schema_formats_lock:
+        cached = _schema_formats.get(key)
+        if cached is not None and cached.schema is schema:
+            _schema_formats.move_to_end(key)
+            return cached
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    entry = _SchemaFormat(
+        schema=schema,
+        text={"format": {"type": "json_schema", "name": format_name, "schema": schema, "strict": True}},
+        schema_digest=hashlib.sha256(canonical.encode("utf-8")).digest(),
+    )
+    with _schema_formats_lock:
+        _schema_formats[key] = entry
+        while len(_schema_formats) > _SCHEMA_FORMAT_CACHE_SIZE:
+            _schema_formats.popitem(last=False)
+    return entry
+
+
+def response_cache_key(
+    *,
+    model: str,
+    system: str,
+    user: Union[str, List[Dict[str, Any]]],
+    schema: Dict[str, Any],
+    format_name: str,
+    temperature: Optional[float],
+    reasoning_effort: Optional[str],
+) -> str:
+    """SHA-256 over length-prefixed request fields (image data URLs included)."""
+    user_field = user if isinstance(user, str) else json.dumps(user, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    fields = [
+        _RESPONSE_CACHE_VERSION,
+        model.encode("utf-8"),
+        system.encode("utf-8"),
+        (b"s" if isinstance(user, str) else b"j") + user_field.encode("utf-8"),
+        _schema_format(schema, format_name).schema_digest,
+        format_name.encode("utf-8"),
+        repr(temperature).encode("ascii"),
+        (reasoning_effort or "").encode("utf-8"),
+    ]
+    digest = hashlib.sha256()
+    for field in fields:
+        digest.update(len(field).to_bytes(8, "big"))
+        digest.update(field)
+    return digest.hexdigest()
+
+
+# Strict structured outputs should always match the schema; these checks catch
+# providers/models that drift anyway, before malformed fields reach the passes.
+_MAX_SCHEMA_FEEDBACK_ROUNDS = 2
+_JSON_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+class SchemaViolation(RuntimeError):
+    """Parsed output does not match the requested schema; carries the call's usage."""
+
+    def __init__(self, message: str, usage: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.usage = usage
+
+
+def schema_violation(value: Any, schema: Dict[str, Any], path: str = "$") -> Optional[str]:
+    """First mismatch of ``value`` against the JSON-schema subset used here, or ``None``."""
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_JSON_TYPE_CHECKS.get(t, lambda v: True)(value) for t in types):
+            return f"{path}: expected {'/'.join(types)}, got {type(value).__name__}"
+    if "enum" in schema and value not in schema["enum"]:
+        return f"{path}: {value!r} is not one of the allowed values"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            return f"{path}: {value} is below minimum {schema['minimum']}"
+        if "maximum" in schema and value > schema["maximum"]:
+            return f"{path}: {value} is above maximum {schema['maximum']}"
+    if isinstance(value, dict):
+        props = schema.get("properties") or {}
+        for key in schema.get("required") or []:
+            if key not in value:
+                return f"{path}: missing required field '{key}'"
+        for key, item in value.items():
+            if key in props:
+                problem = schema_violation(item, props[key], f"{path}.{key}")
+                if problem:
+                    return problem
+            elif schema.get("additionalProperties") is False:
+                return f"{path}: unexpected field '{key}'"
+    if isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            return f"{path}: expected at least {schema['minItems']} items, got {len(value)}"
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            return f"{path}: expected at most {schema['maxItems']} items, got {len(value)}"
+        items = schema.get("items")
+        if isinstance(items, dict):
+            for i, item in enumerate(value):
+                problem = schema_violation(item, items, f"{path}[{i}]")
+                if problem:
+                    return problem
+    return None
+
+
+@lru_cache(maxsize=32)
 def is_reasoning_model(model: str) -> bool:
     """Heuristic: o-series + gpt-5* are treated as reasoning models (may reject temperature/top_p)."""
-    m = (model or "").lower().strip()
-    return m.startswith("o") or m.startswith("gpt-5")
+    return (model or "").lower().lstrip().startswith(("o", "gpt-5"))
 
 
 def _normalize_reasoning_effort(model: str, reasoning_effort: Optional[str]) -> Optional[str]:
@@ -20,6 +435,42 @@ def _normalize_reasoning_effort(model: str, reasoning_effort: Optional[str]) ->
     return effort
 
 
+_OUTPUT_TEXT_TYPES = frozenset({"output_text", "text"})
+
+
+@singledispatch
+def _field(obj: Any, name: str, default: Any = None) -> Any:
+    """Read a response field from an SDK object without a ``model_dump()`` round trip."""
+    return getattr(obj, name, default)
+
+
+@_field.register
+def _(obj: dict, name: str, default: Any = None) -> Any:
+    return obj.get(name, default)
+
+
+def _extract_output_text(resp: Any) -> str:
+    text = getattr(resp, "output_text", None)
+    if isinstance(text, str) and text.strip():
+        return text
+
+    output = getattr(resp, "output", None)
+    if not isinstance(output, list):
+        raise RuntimeError("Responses API returned no parseable text output.")
+
+    parts: List[str] = []
+    for item in output:
+        for content in _field(item, "content") or ():
+            text = _field(content, "text")
+            if isinstance(text, str) and _field(content, "type") in _OUTPUT_TEXT_TYPES:
+                parts.append(text)
+
+    merged = "".join(parts).strip()
+    if not merged:
+        raise RuntimeError("Responses API returned no parseable text output.")
+    return merged
+
+
 def call_json_schema(
     client: Any,
     *,
@@ -35,42 +486,10 @@ def call_json_schema(
 ) -> Dict[str, Any]:
     """Responses API + Structured Outputs (json_schema) with retry/fallback handling."""
 
-    def _extract_output_text(resp: Any) -> str:
-        text = getattr(resp, "output_text", None)
-        if isinstance(text, str) and text.strip():
-            return text
-
-        output = getattr(resp, "output", None)
-        if not isinstance(output, list):
-            raise RuntimeError("Responses API returned no parseable text output.")
-
-        parts: List[str] = []
-        for item in output:
-            if not isinstance(item, dict):
-                item = item.model_dump() if hasattr(item, "model_dump") else {}
-            for content in item.get("content", []) or []:
-                if not isinstance(content, dict):
-                    content = content.model_dump() if hasattr(content, "model_dump") else {}
-                if content.get("type") in {"output_text", "text"} and isinstance(content.get("text"), str):
-                    parts.append(content["text"])
-
-        merged = "".join(parts).strip()
-        if not merged:
-            raise RuntimeError("Responses API returned no parseable text output.")
-        return merged
-
-    def _is_incomplete_error(message: str) -> bool:
-        msg = message.lower()
-        return (
-            "response not completed: incomplete" in msg
-            or "response not completed: in_progress" in msg
-            or "response not completed: queued" in msg
-        )
-
     def _parse_json_from_response(resp: Any) -> Dict[str, Any]:
         raw_text = _extract_output_text(resp)
         try:
-            parsed = json.loads(raw_text)
+            parsed = loads_json(raw_text)
         except json.JSONDecodeError as exc:
             status = str(getattr(resp, "status", ""))
             raise RuntimeError(f"Invalid JSON payload from response status={status}: {exc}") from exc
@@ -78,41 +497,84 @@ def call_json_schema(
             raise RuntimeError(f"Structured output must decode to object, got {type(parsed).__name__}.")
         return parsed
 
-    def _poll_response_until_terminal(resp: Any, *, poll_attempts: int = 4, sleep_s: float = 0.35) -> Any:
+    def _usage_of(resp: Any) -> Optional[Dict[str, Any]]:
+        usage = getattr(resp, "usage", None)
+        if usage is None:
+            return None
+        return {
+            "input_tokens": _field(usage, "input_tokens") or _field(usage, "prompt_tokens") or 0,
+            "output_tokens": _field(usage, "output_tokens") or _field(usage, "completion_tokens") or 0,
+            "total_tokens": _field(usage, "total_tokens") or 0,
+        }
+
+    def _checked(parsed: Dict[str, Any], resp: Any) -> Dict[str, Any]:
+        usage = _usage_of(resp)
+        problem = schema_violation(parsed, schema)
+        if problem:
+            raise SchemaViolation(f"Structured output does not match schema: {problem}", usage)
+        if usage is not None:
+            parsed["_llm_usage"] = usage
+            _record_output_tokens(model, format_name, int(usage.get("output_tokens") or 0))
+        return parsed
+
+    def _poll_response_until_terminal(resp: Any) -> Any:
         status = str(getattr(resp, "status", ""))
-        if status in {"completed", "failed", "incomplete", "cancelled"}:
+        if status in _TERMINAL_STATUSES:
             return resp
 
         response_id = getattr(resp, "id", None)
         if not response_id:
             return resp
 
-        for _ in range(max(0, int(poll_attempts))):
-            time.sleep(max(0.05, float(sleep_s)))
+        for delay_s in _POLL_DELAYS_S:
+            time.sleep(delay_s)
             try:
                 resp = client.responses.retrieve(response_id)
             except Exception:
                 return resp
             status = str(getattr(resp, "status", ""))
-            if status in {"completed", "failed", "incomplete", "cancelled"}:
+            if status in _TERMINAL_STATUSES:
                 return resp
         return resp
 
-    def _single_call(send_temperature: bool, tokens: int) -> Dict[str, Any]:
+    def _create_streamed(params: Dict[str, Any]) -> Any:
+        """Consume a streamed response and return its terminal response object.
+
+        The terminal event carries the full response (status, output, usage), so
+        the non-streaming parsing below applies unchanged and no polling is needed.
+        Events are read directly rather than via ``get_final_response()``, which
+        only accepts ``response.completed`` and would hide incomplete outputs.
+        """
+        stream_helper = getattr(client.responses, "stream", None)
+        if callable(stream_helper):
+            with stream_helper(**params) as stream:
+                return _terminal_response(stream)
+        stream = client.responses.create(**params, stream=True)
+        try:
+            return _terminal_response(stream)
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+
+    def _terminal_response(events: Any) -> Any:
+        for event in events:
+            event_type = str(getattr(event, "type", ""))
+            if event_type in _TERMINAL_STREAM_EVENTS:
+                return event.response
+            if event_type == "error":
+                raise RuntimeError(f"Responses stream error: {getattr(event, 'message', '') or event}")
+        raise RuntimeError("Responses stream ended without a terminal event (connection closed).")
+
+    def _single_call(send_temperature: bool, tokens: int, feedback: List[str]) -> Dict[str, Any]:
         params: Dict[str, Any] = {
             "model": model,
             "input": [
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
+                *({"role": "user", "content": note} for note in feedback),
             ],
-            "text": {
-                "format": {
-                    "type": "json_schema",
-                    "name": format_name,
-                    "schema": schema,
-                    "strict": True,
-                }
-            },
+            "text": _schema_format(schema, format_name).text,
             "max_output_tokens": tokens,
         }
 
@@ -123,85 +585,137 @@ def call_json_schema(
         if is_reasoning_model(model) and normalized_effort:
             params["reasoning"] = {"effort": normalized_effort}
 
-        resp = client.responses.create(**params)
-        resp = _poll_response_until_terminal(resp)
+        request_bucket = _per_minute_bucket(REQUESTS_PER_MINUTE_ENV, model)
+        if request_bucket is not None:
+            request_bucket.acquire(1)
+        token_bucket = _per_minute_bucket(TOKENS_PER_MINUTE_ENV, model)
+        if token_bucket is not None:
+            token_bucket.acquire(_estimate_input_tokens(system, user) + tokens)
+
+        resp = None
+        if _streaming_enabled(client, model):
+            try:
+                resp = _create_streamed(params)
+            except Exception as exc:
+                if not _is_stream_refused(exc):
+                    raise
+                # Stream refused for this model: use create + polling from now on.
+                _reject_streaming(model)
+        if resp is None:
+            resp = client.responses.create(**params)
+            resp = _poll_response_until_terminal(resp)
         status = str(getattr(resp, "status", ""))
         if status == "completed":
             parsed = _parse_json_from_response(resp)
-            usage = getattr(resp, "usage", None)
-            if usage is not None:
-                usage_dict = usage.model_dump() if hasattr(usage, "model_dump") else (usage if isinstance(usage, dict) else {})
-                parsed["_llm_usage"] = {
-                    "input_tokens": usage_dict.get("input_tokens") or usage_dict.get("prompt_tokens") or 0,
-                    "output_tokens": usage_dict.get("output_tokens") or usage_dict.get("completion_tokens") or 0,
-                    "total_tokens": usage_dict.get("total_tokens") or 0,
-                }
-            return parsed
+            return _checked(parsed, resp)
 
         # Some providers occasionally mark responses as incomplete even though
         # the structured JSON is already parseable. Use it when possible.
         try:
             parsed = _parse_json_from_response(resp)
-            usage = getattr(resp, "usage", None)
-            if usage is not None:
-                usage_dict = usage.model_dump() if hasattr(usage, "model_dump") else (usage if isinstance(usage, dict) else {})
-                parsed["_llm_usage"] = {
-                    "input_tokens": usage_dict.get("input_tokens") or usage_dict.get("prompt_tokens") or 0,
-                    "output_tokens": usage_dict.get("output_tokens") or usage_dict.get("completion_tokens") or 0,
-                    "total_tokens": usage_dict.get("total_tokens") or 0,
-                }
-            return parsed
         except Exception:
             pass
+        else:
+            return _checked(parsed, resp)
 
         if status != "completed":
             details = getattr(resp, "incomplete_details", None)
-            reason = None
-            if isinstance(details, dict):
-                reason = details.get("reason")
-            elif hasattr(details, "model_dump"):
-                reason = details.model_dump().get("reason")
+            reason = _field(details, "reason") if details is not None else None
             suffix = f" (reason={reason})" if reason else ""
             raise RuntimeError(f"Response not completed: {status}{suffix}")
         return _parse_json_from_response(resp)
 
     def _call_with_retries(send_temperature: bool) -> Dict[str, Any]:
-        current_tokens = max(256, int(max_output_tokens))
+        default_tokens = max(256, int(max_output_tokens))
+        current_tokens = _initial_output_budget(model, format_name, default_tokens)
         last_error: Optional[Exception] = None
+        feedback: List[str] = []
+        wasted_usage: Dict[str, int] = {}
 
-        for attempt in range(max(0, int(max_retries)) + 1):
+        attempt = 0
+        while True:
             try:
-                return _single_call(send_temperature=send_temperature, tokens=current_tokens)
+                result = _single_call(send_temperature=send_temperature, tokens=current_tokens, feedback=feedback)
+                if wasted_usage and "_llm_usage" in result:
+                    # Rejected outputs were billed too; report them with the accepted one.
+                    result["_llm_usage"] = {k: int(result["_llm_usage"].get(k) or 0) + v for k, v in wasted_usage.items()}
+                return result
+            except SchemaViolation as exc:
+                last_error = exc
+                if len(feedback) >= _MAX_SCHEMA_FEEDBACK_ROUNDS:
+                    break
+                for key, value in (exc.usage or {}).items():
+                    wasted_usage[key] = wasted_usage.get(key, 0) + int(value or 0)
+                # Retry with feedback: the model sees what was wrong and corrects it.
+                feedback.append(f"Deine Ausgabe war ungültig: {exc}. Korrigiere den Fehler und antworte erneut vollständig im JSON-Schema.")
+                continue
             except Exception as exc:  # keep broad: API/network/serialization variants
                 msg = str(exc)
                 last_error = exc
 
+                is_incomplete = _INCOMPLETE_RE.search(msg) is not None
+                if "not completed: incomplete" in msg:
+                    # The output hit the budget; remember that so later calls start higher.
+                    _record_output_tokens(model, format_name, current_tokens)
                 is_retryable = (
-                    _is_incomplete_error(msg)
-                    or "timed out" in msg.lower()
-                    or "rate limit" in msg.lower()
-                    or "temporarily unavailable" in msg.lower()
-                    or "connection" in msg.lower()
+                    is_incomplete
+                    or isinstance(exc, _retryable_exception_types())
+                    or _RETRYABLE_MESSAGE_RE.search(msg) is not None
                 )
                 if attempt >= max_retries or not is_retryable:
                     break
 
                 # for incomplete outputs, raise available output budget on retry
-                if _is_incomplete_error(msg):
-                    current_tokens = min(4000, int(current_tokens * 1.6) + 128)
-                time.sleep(0.45 * (attempt + 1))
+                if is_incomplete:
+                    current_tokens = min(max(default_tokens, _MAX_INCOMPLETE_OUTPUT_TOKENS), int(current_tokens * 1.6) + 128)
+                time.sleep(_retry_delay(attempt, exc))
+                attempt += 1
 
         if last_error is None:
             raise RuntimeError("Unknown Responses API failure.")
         raise last_error
 
-    if is_reasoning_model(model):
-        return _call_with_retries(send_temperature=False)
-
-    try:
-        return _call_with_retries(send_temperature=True)
-    except Exception as e:
-        msg = str(e)
-        if "temperature" in msg and ("Unsupported parameter" in msg or "not supported" in msg):
+    def _call_uncached() -> Dict[str, Any]:
+        if is_reasoning_model(model):
             return _call_with_retries(send_temperature=False)
-        raise
+
+        try:
+            return _call_with_retries(send_temperature=True)
+        except Exception as e:
+            msg = str(e)
+            if "temperature" in msg and ("Unsupported parameter" in msg or "not supported" in msg):
+                return _call_with_retries(send_temperature=False)
+            raise
+
+    cache = ResponseCache.from_env()
+    if cache is None:
+        return _call_uncached()
+
+    cache_key = response_cache_key(
+        model=model,
+        system=system,
+        user=user,
+        schema=schema,
+        format_name=format_name,
+        temperature=temperature,
+        reasoning_effort=_normalize_reasoning_effort(model, reasoning_effort),
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+        # Served without an API call, so no usage/cost is reported.
+        return cached
+
+    def _call_and_store() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        # Re-check: an identical call may have finished since the lookup above.
+        hit = cache.get(cache_key)
+        if hit is not None:
+            return hit, copy.deepcopy(hit)
+        result = _call_uncached()
+        stored = {k: v for k, v in result.items() if k != "_llm_usage"}
+        cache.set(cache_key, stored)
+        return result, copy.deepcopy(stored)
+
+    (result, shared), is_follower = _in_flight.do(cache_key, _call_and_store)
+    # Followers get a private copy of the leader's result and, like cache hits,
+    # report no usage of their own.
+    return copy.deepcopy(shared) if is_follower else result
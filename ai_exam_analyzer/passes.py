@@ -1,23 +1,16 @@
 """Pass runner functions."""
 
-import json
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
+from ai_exam_analyzer.io_utils import dumps_compact
 from ai_exam_analyzer.llm_clients import call_json_schema
+from ai_exam_analyzer.schemas import schema_grouped
 
 
-def run_pass_a(
-    client: Any,
-    *,
-    provider: str = "openai",
-    topic_catalog_text: str,
-    payload: Dict[str, Any],
-    schema: Dict[str, Any],
-    model: str,
-    temperature: float,
-    question_images: List[Dict[str, Any]],
-) -> Dict[str, Any]:
-    provider_norm = (provider or "openai").strip().lower()
+@lru_cache(maxsize=8)
+def _pass_a_system(provider_norm: str, topic_catalog_text: str) -> str:
+    """Pass A system prompt; cached so every call sends a byte-identical prefix."""
     provider_hint = (
         "\nGemini-spezifische Leitlinien:\n"
         "- Verarbeite lange Evidenzblöcke global-konsistent (nicht nur lokale Schlüsselwörter).\n"
@@ -25,7 +18,7 @@ def run_pass_a(
         "- Bei widersprüchlicher Evidenz: konservative Entscheidung + needsMaintenance=true.\n"
     ) if provider_norm == "gemini" else ""
 
-    system = (
+    return (
         "Du bist ein strenger Prüfungsfragen-Analyst und Klassifikator.\n"
         "Arbeitsablauf:\n"
         "1) Nutze topicCandidates als priorisierte, deterministische Vorauswahl und bilde topic_initial primär innerhalb dieser Kandidaten.\n"
@@ -49,7 +42,58 @@ def run_pass_a(
         f"{provider_hint}"
         f"{topic_catalog_text}"
     )
-    user = [{"type": "input_text", "text": json.dumps(payload, ensure_ascii=False)}] + question_images
+
+
+@lru_cache(maxsize=8)
+def _pass_b_system(provider_norm: str, topic_catalog_text: str) -> str:
+    """Pass B system prompt; cached like the Pass A prompt."""
+    provider_hint = (
+        "\nGemini-Verifikation:\n"
+        "- Behandle retrievedEvidence als mehrstufige Evidenzkette (Chunk-übergreifend).\n"
+        "- Bei geringer RetrievalQuality priorisiere cannotJudge statt spekulativer Entscheidung.\n"
+    ) if provider_norm == "gemini" else ""
+
+    return (
+        "Du bist ein unabhängiger Verifier.\n"
+        "Du bekommst eine Prüfungsfrage + Pass A Ergebnis.\n"
+        "Prüfe mit retrievedEvidence + Bildkontext + Clusterkontext, ob die vorgeschlagene Korrektur und topic_final fachlich stimmen.\n"
+        "Bewerte topicCandidates erneut: nahe Kandidaten müssen anhand des konkreten Prüfungsfakts gegeneinander abgegrenzt werden.\n"
+        "Bei schwacher/fehlender Evidenz: konservativ bleiben und cannotJudge erwägen.\n"
+        "Berücksichtige Bildähnlichkeits-Hinweise aus knowledgeImageContext zwingend.\n"
+        "Wenn Bild fehlt oder Fall unentscheidbar: cannotJudge=true und Wartungsbedarf markieren.\n"
+        "Antworte ausschließlich im JSON-Schema.\n\n"
+        f"{provider_hint}"
+        f"{topic_catalog_text}"
+    )
+
+
+@lru_cache(maxsize=8)
+def _pass_ab_system(provider_norm: str, topic_catalog_text: str) -> str:
+    """Fused prompt: the Pass A workflow, then a critical self-check in Pass B form."""
+    return (
+        _pass_a_system(provider_norm, "")
+        + "\nZweiter Schritt (passB):\n"
+        "Nach passA, prüfe deine eigene Antwort kritisch in passB wie ein unabhängiger Verifier.\n"
+        "- Prüfe mit retrievedEvidence + Bildkontext + Clusterkontext, ob Antwort, vorgeschlagene Korrektur und topic_final fachlich stimmen.\n"
+        "- Übernimm passA nicht ungeprüft; setze passB.verify_answer.confidence nur hoch, wenn die Evidenz die Antwort klar trägt.\n"
+        "- Bei schwacher/fehlender Evidenz oder fehlendem Bild: cannotJudge=true und Wartungsbedarf markieren.\n\n"
+        f"{topic_catalog_text}"
+    )
+
+
+def run_pass_a(
+    client: Any,
+    *,
+    provider: str = "openai",
+    topic_catalog_text: str,
+    payload: Dict[str, Any],
+    schema: Dict[str, Any],
+    model: str,
+    temperature: float,
+    question_images: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    system = _pass_a_system((provider or "openai").strip().lower(), topic_catalog_text)
+    user = [{"type": "input_text", "text": dumps_compact(payload)}] + question_images
     return call_json_schema(
         client,
         model=model,
@@ -62,6 +106,122 @@ def run_pass_a(
     )
 
 
+def run_pass_ab_fused(
+    client: Any,
+    *,
+    provider: str = "openai",
+    topic_catalog_text: str,
+    payload: Dict[str, Any],
+    schema: Dict[str, Any],
+    model: str,
+    temperature: float,
+    question_images: List[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Pass A plus self-verification in one call (``schema`` from ``schema_pass_ab``).
+
+    Returns ``(pass_a, pass_b)``; the call's usage is attached to ``pass_a``.
+    """
+    system = _pass_ab_system((provider or "openai").strip().lower(), topic_catalog_text)
+    user = [{"type": "input_text", "text": dumps_compact(payload)}] + question_images
+    fused = call_json_schema(
+        client,
+        model=model,
+        system=system,
+        user=user,
+        schema=schema,
+        format_name="pass_ab_fused",
+        temperature=temperature,
+        max_output_tokens=5500,
+    )
+    pass_a, pass_b = fused["passA"], fused["passB"]
+    if "_llm_usage" in fused:
+        pass_a["_llm_usage"] = fused["_llm_usage"]
+    return pass_a, pass_b
+
+
+def _matches_required(value: Any, schema: Dict[str, Any]) -> bool:
+    """Shallow structural check: objects carry their required keys, recursively."""
+    if schema.get("type") != "object":
+        return True
+    if not isinstance(value, dict):
+        return False
+    props = schema.get("properties") or {}
+    return all(key in value and _matches_required(value[key], props.get(key) or {}) for key in schema.get("required") or [])
+
+
+def _split_usage(usage: Dict[str, Any], parts: int) -> List[Dict[str, int]]:
+    """Distribute token usage of one grouped call over its questions."""
+    out = [{} for _ in range(parts)]
+    for key in ("input_tokens", "output_tokens", "total_tokens"):
+        total = int(usage.get(key) or 0)
+        share, rest = divmod(total, parts)
+        for i, item in enumerate(out):
+            item[key] = share + (1 if i < rest else 0)
+    return out
+
+
+def run_pass_a_grouped(
+    client: Any,
+    *,
+    provider: str = "openai",
+    topic_catalog_text: str,
+    payloads: List[Dict[str, Any]],
+    schema: Dict[str, Any],
+    model: str,
+    temperature: float,
+) -> List[Dict[str, Any]]:
+    """Pass A for several image-less questions in one call sharing the prompt prefix.
+
+    Results come back in payload order with the call's usage split evenly.
+    Items that do not match ``schema`` are re-run individually via ``run_pass_a``.
+    """
+    size = len(payloads)
+    system = _pass_a_system((provider or "openai").strip().lower(), topic_catalog_text) + (
+        "\n\nDu bekommst mehrere voneinander unabhängige Fragen unter 'questions'. "
+        "Analysiere jede Frage getrennt nach obigem Ablauf und gib in 'results' genau ein Ergebnis "
+        "je Frage in derselben Reihenfolge zurück."
+    )
+    user = [{"type": "input_text", "text": dumps_compact({"questions": payloads})}]
+    grouped = call_json_schema(
+        client,
+        model=model,
+        system=system,
+        user=user,
+        schema=schema_grouped(schema, size),
+        format_name=f"pass_a_audit_x{size}",
+        temperature=temperature,
+        max_output_tokens=3000 * size,
+    )
+    items = grouped.get("results")
+    if not isinstance(items, list) or len(items) != size:
+        items = [None] * size
+    usages = _split_usage(grouped.get("_llm_usage") or {}, size)
+
+    results: List[Dict[str, Any]] = []
+    for payload, item, usage in zip(payloads, items, usages):
+        if _matches_required(item, schema):
+            if grouped.get("_llm_usage") is not None:
+                item["_llm_usage"] = usage
+            results.append(item)
+            continue
+        single = run_pass_a(
+            client,
+            provider=provider,
+            topic_catalog_text=topic_catalog_text,
+            payload=payload,
+            schema=schema,
+            model=model,
+            temperature=temperature,
+            question_images=[],
+        )
+        if grouped.get("_llm_usage") is not None:
+            # The failed grouped share was paid for as well.
+            own = single.get("_llm_usage") or {}
+            single["_llm_usage"] = {k: int(own.get(k) or 0) + usage[k] for k in usage}
+        results.append(single)
+    return results
+
+
 def run_pass_b(
     client: Any,
     *,
@@ -74,27 +234,9 @@ def run_pass_b(
     reasoning_effort: str,
     question_images: List[Dict[str, Any]],
 ) -> Dict[str, Any]:
-    provider_norm = (provider or "openai").strip().lower()
-    provider_hint = (
-        "\nGemini-Verifikation:\n"
-        "- Behandle retrievedEvidence als mehrstufige Evidenzkette (Chunk-übergreifend).\n"
-        "- Bei geringer RetrievalQuality priorisiere cannotJudge statt spekulativer Entscheidung.\n"
-    ) if provider_norm == "gemini" else ""
-
-    system = (
-        "Du bist ein unabhängiger Verifier.\n"
-        "Du bekommst eine Prüfungsfrage + Pass A Ergebnis.\n"
-        "Prüfe mit retrievedEvidence + Bildkontext + Clusterkontext, ob die vorgeschlagene Korrektur und topic_final fachlich stimmen.\n"
-        "Bewerte topicCandidates erneut: nahe Kandidaten müssen anhand des konkreten Prüfungsfakts gegeneinander abgegrenzt werden.\n"
-        "Bei schwacher/fehlender Evidenz: konservativ bleiben und cannotJudge erwägen.\n"
-        "Berücksichtige Bildähnlichkeits-Hinweise aus knowledgeImageContext zwingend.\n"
-        "Wenn Bild fehlt oder Fall unentscheidbar: cannotJudge=true und Wartungsbedarf markieren.\n"
-        "Antworte ausschließlich im JSON-Schema.\n\n"
-        f"{provider_hint}"
-        f"{topic_catalog_text}"
-    )
+    system = _pass_b_system((provider or "openai").strip().lower(), topic_catalog_text)
     packed = {"question": payload, "passA": pass_a}
-    user = [{"type": "input_text", "text": json.dumps(packed, ensure_ascii=False)}] + question_images
+    user = [{"type": "input_text", "text": dumps_compact(packed)}] + question_images
     return call_json_schema(
         client,
         model=model,
@@ -125,7 +267,7 @@ def run_review_pass(
         "Antworte nur im JSON-Schema."
     )
     packed = {"question": payload, "currentAudit": current_audit}
-    user = [{"type": "input_text", "text": json.dumps(packed, ensure_ascii=False)}] + question_images
+    user = [{"type": "input_text", "text": dumps_compact(packed)}] + question_images
     return call_json_schema(
         client,
         model=model,
@@ -183,7 +325,7 @@ def run_reconstruction_pass(
         "Hinweis: Das Stichwort 'Altfrage' ist ein starkes Legacy-Signal.\n"
         "Antworte strikt im JSON-Schema."
     )
-    user = [{"type": "input_text", "text": json.dumps(payload, ensure_ascii=False)}]
+    user = [{"type": "input_text", "text": dumps_compact(payload)}]
     return call_json_schema(
         client,
         model=model,
@@ -210,7 +352,7 @@ def run_explainer_pass(
         "Erkläre außerdem, warum die falschen Optionen falsch sind und ordne die Frage fachlich ein.\n"
         "Antworte strikt im JSON-Schema."
     )
-    user = [{"type": "input_text", "text": json.dumps(payload, ensure_ascii=False)}]
+    user = [{"type": "input_text", "text": dumps_compact(payload)}]
     return call_json_schema(
         client,
         model=model,
@@ -244,7 +386,7 @@ def run_abstraction_cluster_refinement(
         "5) Sei konservativ: bei Unsicherheit keine Entfernung/kein Merge; begründe kurz fachlich.\n"
         "Antworte strikt im JSON-Schema."
     )
-    user = [{"type": "input_text", "text": json.dumps(payload, ensure_ascii=False)}]
+    user = [{"type": "input_text", "text": dumps_compact(payload)}]
     return call_json_schema(
         client,
         model=model,
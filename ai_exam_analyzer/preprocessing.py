@@ -2,103 +2,204 @@
 
 from __future__ import annotations
 
-import re
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
+from ai_exam_analyzer.normalized_question import NormalizedQuestion, normalize_question
 
-_IMAGE_HINT_RE = re.compile(r"\b(bild|abbildung|grafik|schema|figure)\b", re.IGNORECASE)
-_UNCERTAIN_NOTE_RE = re.compile(
-    r"\b(irgendwas|vielleicht|kann\s+sich\s+jemand\s+erinnern|unsicher|notiz)\b",
-    re.IGNORECASE,
-)
+
+# Literal keyword sets, matched as whole words on lowercased text (like
+# ``\b...\b`` with re.IGNORECASE, but via C-level substring search).
+_IMAGE_HINT_WORDS = ("bild", "abbildung", "grafik", "schema", "figure")
+_UNCERTAIN_NOTE_WORDS = ("irgendwas", "vielleicht", "unsicher", "notiz")
+# Matched on whitespace-normalized text; "erinnern" gates the normalization.
+_UNCERTAIN_NOTE_PHRASE = "kann sich jemand erinnern"
+_UNCERTAIN_NOTE_PHRASE_TAIL = "erinnern"
 
 # Rule classes for downstream gating.
 _HARD_BLOCKERS = {"missing_correct_indices", "invalid_answer_option"}
 _CONTEXT_BLOCKERS = {"missing_required_image_asset"}
 _SOFT_BLOCKERS = {"insufficient_question_context", "non_exam_question_or_uncertain_source"}
+_BLOCKER_CLASS = {
+    **{r: 0 for r in _HARD_BLOCKERS},
+    **{r: 1 for r in _CONTEXT_BLOCKERS},
+    **{r: 2 for r in _SOFT_BLOCKERS},
+}
+
+# Simple transparent quality score per (hard, context, soft) blocker count;
+# each reason occurs at most once, so these are all reachable combinations.
+_QUALITY_SCORE_BY_COUNTS = {
+    (h, c, s): max(0.0, round(1.0 - min(1.0, 0.38 * h + 0.24 * c + 0.10 * s), 4))
+    for h in range(len(_HARD_BLOCKERS) + 1)
+    for c in range(len(_CONTEXT_BLOCKERS) + 1)
+    for s in range(len(_SOFT_BLOCKERS) + 1)
+}
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _contains_word(text: str, word: str) -> bool:
+    """``word`` occurs in ``text`` with non-word characters (or the ends) around it."""
+    start = text.find(word)
+    while start != -1:
+        end = start + len(word)
+        if (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end])):
+            return True
+        start = text.find(word, start + 1)
+    return False
+
+
+def _has_any_word(text: str, words: Iterable[str]) -> bool:
+    return any(_contains_word(text, w) for w in words if w in text)
 
 
-def _question_word_count(question: Dict[str, Any]) -> int:
-    text = (question.get("questionText") or "").strip()
-    return len([p for p in text.split() if p])
+def _has_image_hint(lower: str) -> bool:
+    return _has_any_word(lower, _IMAGE_HINT_WORDS)
 
 
-def compute_quality_maintenance_reasons(question: Dict[str, Any]) -> List[str]:
+def _has_uncertain_note(lower: str) -> bool:
+    if _has_any_word(lower, _UNCERTAIN_NOTE_WORDS):
+        return True
+    return _UNCERTAIN_NOTE_PHRASE_TAIL in lower and _contains_word(" ".join(lower.split()), _UNCERTAIN_NOTE_PHRASE)
+
+
+def _question_has_min_words(text: str, min_words: int = 4) -> bool:
+    """True when ``text`` has at least ``min_words`` words; splits no further than needed."""
+    return len(text.split(maxsplit=min_words - 1)) >= min_words
+
+
+def compute_quality_maintenance_reasons(question: Union[Dict[str, Any], NormalizedQuestion]) -> List[str]:
     """Return deterministic maintenance reasons derived from raw data quality issues."""
+    nq = question if isinstance(question, NormalizedQuestion) else normalize_question(question)
+    return list(
+        _quality_reasons(
+            nq.question_text,
+            nq.question_html,
+            tuple(text for _, text, _ in nq.answers),
+            bool(nq.correct_indices),
+            nq.has_image_fields,
+        )
+    )
+
+
+# Keyed by exactly the fields the checks read, so unchanged questions in repeated
+# assessments (auto-tuning, then the run; resumed runs) skip the scans.
+@lru_cache(maxsize=16384)
+def _quality_reasons(
+    question_text: str,
+    question_html: str,
+    answer_texts: Tuple[str, ...],
+    has_correct_indices: bool,
+    has_images: bool,
+) -> Tuple[str, ...]:
     reasons: List[str] = []
 
-    answers = question.get("answers") or []
-    correct_indices = question.get("correctIndices") or []
-    has_images = bool((question.get("imageUrls") or []) or (question.get("imageFiles") or []))
-
-    if not correct_indices:
+    if not has_correct_indices:
         reasons.append("missing_correct_indices")
 
-    if any((a.get("text") or "").strip() in {"", "?"} for a in answers):
+    # Answer texts are stripped once during normalization.
+    if any(not text or text == "?" for text in answer_texts):
         reasons.append("invalid_answer_option")
 
-    question_blob = "\n".join([
-        str(question.get("questionText") or ""),
-        str(question.get("questionHtml") or ""),
-    ])
-    if _IMAGE_HINT_RE.search(question_blob) and not has_images:
+    # Image hints only count in the question itself and only without images;
+    # uncertainty notes count in answers too. Each text is lowercased once.
+    want_img = not has_images
+    has_img_hint = has_uncertain_note = False
+    for text in (question_text, question_html):
+        if not text:
+            continue
+        lower = text.lower()
+        has_img_hint = has_img_hint or (want_img and _has_image_hint(lower))
+        has_uncertain_note = has_uncertain_note or _has_uncertain_note(lower)
+    if not has_uncertain_note:
+        for text in answer_texts:
+            if text and _has_uncertain_note(text.lower()):
+                has_uncertain_note = True
+                break
+
+    if has_img_hint and want_img:
         reasons.append("missing_required_image_asset")
 
-    if _question_word_count(question) <= 3:
+    if not _question_has_min_words(question_text):
         reasons.append("insufficient_question_context")
 
-    source_blob_parts = [question_blob]
-    for answer in answers:
-        source_blob_parts.append(str(answer.get("text") or ""))
-    source_blob = "\n".join(source_blob_parts)
-    if _UNCERTAIN_NOTE_RE.search(source_blob):
+    if has_uncertain_note:
         reasons.append("non_exam_question_or_uncertain_source")
 
-    # deterministic ordering
-    return list(dict.fromkeys(reasons))
-
-
-def compute_preprocessing_assessment(question: Dict[str, Any]) -> Dict[str, Any]:
-    """Compute structured preprocessing assessment and execution gates.
-
-    Returns a dictionary with reasons, classes, quality score and gate decisions.
-    """
-    reasons = compute_quality_maintenance_reasons(question)
-
-    hard_blockers = [r for r in reasons if r in _HARD_BLOCKERS]
-    context_blockers = [r for r in reasons if r in _CONTEXT_BLOCKERS]
-    soft_blockers = [r for r in reasons if r in _SOFT_BLOCKERS]
+    # Each reason is appended at most once, in a fixed order.
+    return tuple(reasons)
 
-    answers = question.get("answers") or []
-    question_text = (question.get("questionText") or "").strip()
 
-    # Extremely malformed entries: skip LLM and mark for manual work.
-    run_llm = bool(question_text) and bool(answers)
+def _classify_reasons(reasons: List[str]) -> Tuple[List[str], List[str], List[str], bool, float]:
+    """Blocker classes, auto-change permission and quality score for a reason list."""
+    # One pass over the reasons; a reason's position in its class keeps their order.
+    hard_blockers: List[str] = []
+    context_blockers: List[str] = []
+    soft_blockers: List[str] = []
+    buckets = (hard_blockers, context_blockers, soft_blockers)
+    for r in reasons:
+        cls = _BLOCKER_CLASS.get(r)
+        if cls is not None:
+            buckets[cls].append(r)
 
     # No automatic dataset mutation for hard blockers or missing required image assets.
     allow_auto_change = not bool(hard_blockers or context_blockers)
 
-    # Force manual review when hard/context blockers exist.
-    force_manual_review = bool(hard_blockers or context_blockers)
+    quality_score = _QUALITY_SCORE_BY_COUNTS[(len(hard_blockers), len(context_blockers), len(soft_blockers))]
+    return hard_blockers, context_blockers, soft_blockers, allow_auto_change, quality_score
 
-    # Simple transparent quality score.
-    penalty = 0.0
-    penalty += 0.38 * len(hard_blockers)
-    penalty += 0.24 * len(context_blockers)
-    penalty += 0.10 * len(soft_blockers)
-    quality_score = max(0.0, round(1.0 - min(1.0, penalty), 4))
 
+def _build_assessment(
+    reasons: List[str],
+    classified: Tuple[List[str], List[str], List[str], bool, float],
+    nq: NormalizedQuestion,
+) -> Dict[str, Any]:
+    hard_blockers, context_blockers, soft_blockers, allow_auto_change, quality_score = classified
+    # Extremely malformed entries: skip LLM and mark for manual work.
+    run_llm = bool(nq.question_text) and bool(nq.answers)
     return {
         "reasons": reasons,
         "classes": {
-            "hardBlockers": hard_blockers,
-            "contextBlockers": context_blockers,
-            "softBlockers": soft_blockers,
+            "hardBlockers": list(hard_blockers),
+            "contextBlockers": list(context_blockers),
+            "softBlockers": list(soft_blockers),
         },
         "gates": {
             "runLlm": run_llm,
             "allowAutoChange": allow_auto_change,
-            "forceManualReview": force_manual_review,
+            # Force manual review when hard/context blockers exist.
+            "forceManualReview": not allow_auto_change,
         },
         "qualityScore": quality_score,
     }
+
+
+def compute_preprocessing_assessment(question: Union[Dict[str, Any], NormalizedQuestion]) -> Dict[str, Any]:
+    """Compute structured preprocessing assessment and execution gates.
+
+    Returns a dictionary with reasons, classes, quality score and gate decisions.
+    """
+    nq = question if isinstance(question, NormalizedQuestion) else normalize_question(question)
+    reasons = compute_quality_maintenance_reasons(nq)
+    return _build_assessment(reasons, _classify_reasons(reasons), nq)
+
+
+def compute_preprocessing_assessments(questions: Iterable[Union[Dict[str, Any], NormalizedQuestion]]) -> List[Dict[str, Any]]:
+    """``compute_preprocessing_assessment`` for many questions.
+
+    Classes and score depend only on the reason combination, of which there are
+    few; they are computed once per distinct combination and shared (as copies).
+    """
+    classified_by_reasons: Dict[Tuple[str, ...], Tuple[List[str], List[str], List[str], bool, float]] = {}
+    out: List[Dict[str, Any]] = []
+    for question in questions:
+        nq = question if isinstance(question, NormalizedQuestion) else normalize_question(question)
+        reasons = compute_quality_maintenance_reasons(nq)
+        key = tuple(reasons)
+        classified = classified_by_reasons.get(key)
+        if classified is None:
+            classified = classified_by_reasons[key] = _classify_reasons(reasons)
+        out.append(_build_assessment(reasons, classified, nq))
+    return out
@@ -1,10 +1,14 @@
 """Core processing loop for question annotation."""
 
+import copy
 import os
 import time
-from typing import Any, Callable, Dict, List, Optional, Set
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from ai_exam_analyzer.cleanup import cleanup_dataset
+from ai_exam_analyzer.cleanup import RuleFn, cleanup_dataset
 from ai_exam_analyzer.config import PIPELINE_VERSION
 from ai_exam_analyzer.io_utils import save_json
 from ai_exam_analyzer.image_store import QuestionImageStore
@@ -13,22 +17,48 @@ from ai_exam_analyzer.passes import (
     run_abstraction_cluster_refinement,
     run_explainer_pass,
     run_pass_a,
+    run_pass_a_grouped,
+    run_pass_ab_fused,
     run_pass_b,
     run_reconstruction_pass,
     run_review_pass,
     should_run_pass_b,
 )
+from ai_exam_analyzer.normalized_question import NormalizedQuestion, normalize_question
 from ai_exam_analyzer.payload import build_question_payload
 from ai_exam_analyzer.workflow_context import build_dataset_context, cluster_abstractions
-from ai_exam_analyzer.decision_policy import compose_confidence, should_apply_pass_b_change, should_run_review_pass
+from ai_exam_analyzer.decision_policy import (
+    ReviewPolicy,
+    compose_confidence,
+    should_apply_pass_b_change,
+    should_run_review_pass,
+)
 from ai_exam_analyzer.preprocessing import compute_preprocessing_assessment
 from ai_exam_analyzer.topic_candidates import TopicCandidateIndex
 from ai_exam_analyzer.repeat_reconstruction import compute_repeat_reconstruction
+from ai_exam_analyzer.schemas import schema_pass_ab
+from ai_exam_analyzer.semantic_cache import SemanticCache
 from ai_exam_analyzer.llm_clients import build_llm_client
 from ai_exam_analyzer.workflow_profiles import build_workflow_profile
 from ai_exam_analyzer.cost_tracking import add_records, format_eur, make_cost_record
 
 
+@dataclass(frozen=True, slots=True)
+class _PassBTriggers:
+    candidate_conflict: bool
+    candidate_force_b: bool
+    candidate_ambiguous_force_b: bool
+    ran_b: bool
+
+
+def _flag_pre_maintenance(pass_a: Dict[str, Any], pre_maintenance_reasons: List[str]) -> None:
+    """Preprocessing findings force maintenance on the Pass A result (idempotent)."""
+    if pre_maintenance_reasons:
+        maintenance = pass_a["maintenance"]
+        maintenance["needsMaintenance"] = True
+        maintenance["severity"] = max(int(maintenance.get("severity", 1)), 2)
+
+
 def _answer_external_indices(q: Dict[str, Any]) -> List[int]:
     answers = q.get("answers") or []
     out: List[int] = []
@@ -95,11 +125,12 @@ def _build_output_obj(
     *,
     container: Optional[Dict[str, Any]],
     questions: List[Dict[str, Any]],
-    cleanup_spec: Optional[Dict[str, Any]],
+    cleanup_spec: Optional[RuleFn],
+    inplace: bool = False,
 ) -> Any:
     out_obj: Any = container if container is not None else questions
     if cleanup_spec is not None:
-        out_obj = cleanup_dataset(out_obj, cleanup_spec)
+        out_obj = cleanup_dataset(out_obj, cleanup_spec, inplace=inplace)
     return out_obj
 
 
@@ -540,7 +571,7 @@ def process_questions(
     schema_reconstruction: Dict[str, Any],
     schema_explainer: Dict[str, Any],
     schema_cluster_refinement: Dict[str, Any],
-    cleanup_spec: Optional[Dict[str, Any]] = None,
+    cleanup_spec: Optional[RuleFn] = None,
     knowledge_base: Optional[KnowledgeBase] = None,
     image_store: Optional[QuestionImageStore] = None,
     progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
@@ -573,9 +604,16 @@ def process_questions(
     processed = 0
     total_questions = len(questions)
 
+    review_policy = ReviewPolicy.from_args(args)
+
     catalog_rows = topic_catalog or sorted(key_map.values(), key=lambda x: (x.get("superTopicId", 0), x.get("subtopicId", 0)))
     topic_candidate_index = TopicCandidateIndex(catalog_rows) if catalog_rows else None
 
+    # Fused mode: Pass A returns a self-check in Pass B form from the same call.
+    fused_pass_ab = bool(getattr(args, "passAB_fused", False))
+    fused_pass_b_min_conf = float(getattr(args, "passAB_fused_min_conf", 0.85))
+    schema_ab = schema_pass_ab(schema_a, schema_b) if fused_pass_ab else None
+
     cost_records: List[Dict[str, Any]] = []
 
     cost_sequence = 0
@@ -618,7 +656,7 @@ def process_questions(
             "passBTriggeredByCandidateConflict": 0,
             "passBTriggeredByAmbiguousCandidates": 0,
         },
-        "passes": {"passBRan": 0, "reviewRan": 0},
+        "passes": {"passBRan": 0, "reviewRan": 0, "passAReused": 0},
         "topicDrift": {"passAInitialVsFinal": 0},
         "autoChange": {"blockedByGate": 0},
         "maintenanceReasons": {},
@@ -630,6 +668,9 @@ def process_questions(
             return
         progress_callback(payload)
 
+    pass_a_reuse_similarity = float(getattr(args, "passA_reuse_similarity", 0.0) or 0.0)
+    pass_a_cache = SemanticCache(pass_a_reuse_similarity) if pass_a_reuse_similarity > 0 else None
+
     emit_progress(
         event="started",
         stage="pipeline",
@@ -687,56 +728,15 @@ def process_questions(
         message="Workflow-Kontext aufgebaut.",
     )
 
-    for i, q in enumerate(questions, start=1):
+    def prepare_question_context(q: Dict[str, Any]) -> Dict[str, Any]:
+        """Payload, images and evidence for one question (no LLM calls)."""
         qid = str(q.get("id") or "")
-        if selected_question_ids and qid not in selected_question_ids:
-            skipped += 1
-            emit_progress(
-                event="question_skipped_filter",
-                index=i,
-                total=total_questions,
-                processed=processed,
-                done=done,
-                skipped=skipped,
-                message=f"Frage {i}/{total_questions} übersprungen (ID-Filter aktiv).",
-            )
-            continue
-
-        if args.limit and processed >= args.limit:
-            break
-
-        if args.resume and isinstance(q.get("aiAudit"), dict):
-            if q["aiAudit"].get("pipelineVersion") == PIPELINE_VERSION and q["aiAudit"].get("status") == "completed":
-                skipped += 1
-                emit_progress(
-                    event="question_skipped",
-                    index=i,
-                    total=total_questions,
-                    processed=processed,
-                    done=done,
-                    skipped=skipped,
-                    message=f"Frage {i}/{total_questions} übersprungen (bereits abgeschlossen).",
-                )
-                continue
-
-        emit_progress(
-            event="question_pipeline_started",
-            stage="question",
-            index=i,
-            total=total_questions,
-            processed=processed,
-            done=done,
-            skipped=skipped,
-            message=f"Frage {i}/{total_questions}: Vorbereitung gestartet.",
-        )
-
         external_indices = _answer_external_indices(q)
         current = _coerce_dataset_correct_indices(q.get("correctIndices") or [], external_indices)
-        payload = build_question_payload(q, current_correct_indices=current)
+        normalized = normalize_question(q)
+        payload = build_question_payload(normalized, current_correct_indices=current)
         if topic_candidate_index is not None:
             payload["topicCandidates"] = topic_candidate_index.rank(q, top_k=max(1, int(getattr(args, "topic_candidate_top_k", 3))))
-            if payload.get("topicCandidates"):
-                report["topicCandidates"]["questionsWithCandidates"] += 1
 
         question_images: List[Dict[str, Any]] = []
         image_context: Dict[str, Any] = {"imageZipConfigured": bool(image_store is not None)}
@@ -767,34 +767,20 @@ def process_questions(
         if knowledge_base is not None:
             payload["retrievedEvidence"] = evidence_chunks
             payload["retrievalStrategy"] = retrieval_strategy
+        return {
+            "external_indices": external_indices,
+            "current": current,
+            "payload": payload,
+            "question_images": question_images,
+            "image_context": image_context,
+            "evidence_chunks": evidence_chunks,
+            "retrieval_quality": retrieval_quality,
+            "retrieval_strategy": retrieval_strategy,
+            "preprocessing": prepare_preprocessing(normalized, retrieval_quality),
+        }
 
-        emit_progress(
-            event="question_context_ready",
-            stage="question",
-            index=i,
-            total=total_questions,
-            processed=processed,
-            done=done,
-            skipped=skipped,
-            retrieval_quality=retrieval_quality,
-            retrieval_strategy=retrieval_strategy,
-            evidence_count=len(evidence_chunks),
-            message=f"Frage {i}/{total_questions}: Kontext bereit (evidence={len(evidence_chunks)}).",
-        )
-
-        answers = q.get("answers") or []
-        n_answers = len(answers)
-        emit_progress(
-            event="preprocessing_started",
-            stage="preprocessing",
-            index=i,
-            total=total_questions,
-            processed=processed,
-            done=done,
-            skipped=skipped,
-            message=f"Frage {i}/{total_questions}: Preprocessing/Gates.",
-        )
-        preprocessing = compute_preprocessing_assessment(q)
+    def prepare_preprocessing(normalized: NormalizedQuestion, retrieval_quality: float) -> Dict[str, Any]:
+        preprocessing = compute_preprocessing_assessment(normalized)
         pre_maintenance_reasons = preprocessing.get("reasons", [])
         gates = dict(preprocessing.get("gates") or {})
 
@@ -806,574 +792,849 @@ def process_questions(
 
         preprocessing["gates"] = gates
         preprocessing["reasons"] = pre_maintenance_reasons
-        if not bool(gates.get("runLlm", True)):
-            report["preprocessing"]["runLlmFalse"] += 1
-        if not bool(gates.get("allowAutoChange", True)):
-            report["preprocessing"]["allowAutoChangeFalse"] += 1
-        if bool(gates.get("forceManualReview", False)):
-            report["preprocessing"]["forceManualReview"] += 1
-
-        audit: Dict[str, Any] = {
-            "pipelineVersion": PIPELINE_VERSION,
-            "status": "error",
-            "models": {"provider": provider, "passA": args.passA_model, "passB": None, "review": None, "explainer": None},
-            "knowledge": {
-                "enabled": bool(knowledge_base is not None),
-                "retrievalQuality": retrieval_quality,
-                "evidenceCount": len(evidence_chunks),
-            },
-            "images": image_context,
-            "clusters": {
-                "questionContentClusterId": payload["questionClusterContext"].get("clusterId"),
-                "questionImageClusterIds": payload["imageClusterContext"].get("clusterIds", []),
-            },
-            "preprocessing": preprocessing,
-        }
-
-        try:
-            if not bool((preprocessing.get("gates") or {}).get("runLlm", True)):
-                maintenance = {
-                    "needsMaintenance": True,
-                    "severity": 3,
-                    "reasons": list(dict.fromkeys(pre_maintenance_reasons + ["preprocessing_llm_skipped"])),
-                }
-                audit.update({
-                    "status": "completed",
-                    "topicInitial": {"superTopic": "", "subtopic": "", "confidence": 0.0, "reasonShort": "Skipped by preprocessing gate", "reasonDetailed": "runLlm=false"},
-                    "topicFinal": {"superTopic": "", "subtopic": "", "confidence": 0.0, "reasonShort": "Skipped by preprocessing gate", "reasonDetailed": "runLlm=false", "source": "preprocessing"},
-                    "answerPlausibility": {
-                        "originalCorrectIndices": current,
-                        "passA": {"isPlausible": False, "confidence": 0.0, "recommendChange": False, "proposedCorrectIndices": [], "reasonShort": "Skipped by preprocessing gate", "reasonDetailed": "runLlm=false", "evidenceChunkIds": []},
-                        "finalCorrectIndices": current,
-                        "finalAiCorrectIndices": current,
-                        "finalAnswerConfidence": 0.0,
-                        "finalAnswerConfidenceSource": "preprocessing",
-                        "finalCombinedConfidence": 0.0,
-                        "retrievalQuality": retrieval_quality,
-                        "evidenceCount": len(evidence_chunks),
-                        "evidence": _compact_evidence(evidence_chunks),
-                        "aiDisagreesWithDataset": False,
-                        "changedInDataset": False,
-                        "changeSource": "none",
-                        "verification": {"ran": False, "skippedByPreprocessing": True},
-                    },
-                    "maintenance": maintenance,
-                    "questionAbstraction": {"summary": ""},
-                })
-                done += 1
-                q["aiAudit"] = audit
-                processed += 1
-                emit_progress(event="question_finished", index=i, total=total_questions, processed=processed, done=done, skipped=skipped, status=audit.get("status"), message=f"Frage {i}/{total_questions} abgeschlossen (preprocessing skip).")
-                if args.checkpoint_every and processed % args.checkpoint_every == 0:
-                    _remove_costs_from_question_audits(questions)
-                    out_obj = _build_output_obj(container=container, questions=questions, cleanup_spec=cleanup_spec)
-                    save_json(args.output, out_obj)
-                time.sleep(args.sleep)
-                continue
+        return preprocessing
 
-            emit_progress(
-                event="question_started",
-                stage="pass_a",
-                index=i,
-                total=total_questions,
-                processed=processed,
-                done=done,
-                skipped=skipped,
-                message=f"Frage {i}/{total_questions}: Starte Pass A.",
-            )
-            pass_a = run_pass_a(
+    def call_pass_a(payload: Dict[str, Any], question_images: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Pass A result plus, in fused mode, the self-verification in Pass B form."""
+        if fused_pass_ab:
+            return run_pass_ab_fused(
                 client,
                 provider=provider,
                 topic_catalog_text=topic_catalog_text,
                 payload=payload,
-                schema=schema_a,
+                schema=schema_ab,
                 model=args.passA_model,
                 temperature=args.passA_temperature,
                 question_images=question_images,
             )
-            emit_cost_progress("pass_a", args.passA_model, pass_a, q, i)
-            emit_progress(
-                event="pass_a_finished",
-                stage="pass_a",
-                index=i,
-                total=total_questions,
-                processed=processed,
-                done=done,
-                skipped=skipped,
-                message=f"Frage {i}/{total_questions}: Pass A abgeschlossen.",
-            )
+        return run_pass_a(
+            client,
+            provider=provider,
+            topic_catalog_text=topic_catalog_text,
+            payload=payload,
+            schema=schema_a,
+            model=args.passA_model,
+            temperature=args.passA_temperature,
+            question_images=question_images,
+        ), None
+
+    def usable_fused_pass_b(fused_pass_b: Optional[Dict[str, Any]]) -> bool:
+        """Fused self-check replaces Pass B only when it is confident enough."""
+        if fused_pass_b is None:
+            return False
+        try:
+            return float(fused_pass_b["verify_answer"].get("confidence", 0.0)) >= fused_pass_b_min_conf
+        except Exception:
+            return False
+
+    def pass_b_triggers(pass_a: Dict[str, Any], payload: Dict[str, Any], retrieval_quality: float) -> _PassBTriggers:
+        topic_candidates = payload.get("topicCandidates") or []
+        candidate_keys = {str(x.get("topicKey")) for x in topic_candidates if x.get("topicKey")}
+        pass_a_topic_key = str(pass_a["topic_final"].get("topicKey") or "")
+        pass_a_topic_conf = float(pass_a["topic_final"].get("confidence", 0.0))
+        candidate_conflict = bool(candidate_keys) and pass_a_topic_key not in candidate_keys
+
+        ambiguous_relative_threshold = float(getattr(args, "topic_candidate_ambiguous_relative_score", 0.82))
+        second_relative_score = float(topic_candidates[1].get("relativeScore", 0.0)) if len(topic_candidates) > 1 else 0.0
+        candidate_ambiguous = bool(topic_candidates) and second_relative_score >= ambiguous_relative_threshold
+
+        ran_b_base = should_run_pass_b(pass_a, args.trigger_answer_conf, args.trigger_topic_conf)
+        candidate_force_b = candidate_conflict and pass_a_topic_conf < float(getattr(args, "topic_candidate_outside_force_passb_conf", 0.92))
+        candidate_ambiguous_force_b = candidate_ambiguous and pass_a_topic_conf < 0.97
+        low_retrieval_force_b = bool(workflow_profile.force_pass_b_when_low_retrieval and retrieval_quality < float(workflow_profile.force_pass_b_retrieval_threshold))
+        return _PassBTriggers(
+            candidate_conflict=candidate_conflict,
+            candidate_force_b=candidate_force_b,
+            candidate_ambiguous_force_b=candidate_ambiguous_force_b,
+            ran_b=bool(ran_b_base or candidate_force_b or candidate_ambiguous_force_b or low_retrieval_force_b),
+        )
 
-            proposed = normalize_indices(
-                pass_a["answer_review"].get("proposedCorrectIndices", []),
-                n_answers,
-                valid_indices=external_indices,
-            )
+    def call_pass_b(payload: Dict[str, Any], pass_a: Dict[str, Any], question_images: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return run_pass_b(
+            client,
+            provider=provider,
+            topic_catalog_text=topic_catalog_text,
+            payload=payload,
+            pass_a=pass_a,
+            schema=schema_b,
+            model=args.passB_model,
+            reasoning_effort=args.passB_reasoning_effort,
+            question_images=question_images,
+        )
+
+    def run_llm_passes(ctx: Dict[str, Any]) -> Tuple[Dict[str, Any], Any, bool]:
+        """Pass A, then Pass B only if the loop would trigger it.
 
-            final_topic_key = pass_a["topic_final"]["topicKey"]
-            final_topic_conf = float(pass_a["topic_final"]["confidence"])
-            final_topic_reason = pass_a["topic_final"]["reasonShort"]
-            final_topic_reason_detailed = pass_a["topic_final"]["reasonDetailed"]
-            final_topic_source = "passA"
-
-            maintenance = pass_a["maintenance"]
-            extra_flags = pass_a["answer_review"].get("maintenanceSuspicion", []) or []
-            merged_reasons = list(dict.fromkeys(pre_maintenance_reasons + (maintenance.get("reasons") or []) + extra_flags))
-            if pre_maintenance_reasons:
-                maintenance["needsMaintenance"] = True
-                maintenance["severity"] = max(int(maintenance.get("severity", 1)), 2)
-
-            recommend_a = bool(pass_a["answer_review"]["recommendChange"])
-            conf_a = float(pass_a["answer_review"]["confidence"])
-
-            ai_disagrees_with_dataset = len(proposed) > 0 and proposed != current
-            final_answer_confidence = conf_a
-            final_answer_confidence_source = "passA"
-
-            will_change = False
-            change_source = "none"
-            final_correct_indices = current
-            final_ai_correct_indices = current
-            verification: Dict[str, Any] = {"ran": False}
-            verifier_agreed: Optional[bool] = None
-
-            topic_candidates = payload.get("topicCandidates") or []
-            candidate_keys = {str(x.get("topicKey")) for x in topic_candidates if x.get("topicKey")}
-            pass_a_topic_key = str(pass_a["topic_final"].get("topicKey") or "")
-            pass_a_topic_conf = float(pass_a["topic_final"].get("confidence", 0.0))
-            candidate_conflict = bool(candidate_keys) and pass_a_topic_key not in candidate_keys
-            if candidate_conflict:
-                report["topicCandidates"]["passAOutsideCandidates"] += 1
-
-            ambiguous_relative_threshold = float(getattr(args, "topic_candidate_ambiguous_relative_score", 0.82))
-            second_relative_score = float(topic_candidates[1].get("relativeScore", 0.0)) if len(topic_candidates) > 1 else 0.0
-            candidate_ambiguous = bool(topic_candidates) and second_relative_score >= ambiguous_relative_threshold
-
-            ran_b_base = should_run_pass_b(pass_a, args.trigger_answer_conf, args.trigger_topic_conf)
-            candidate_force_b = candidate_conflict and pass_a_topic_conf < float(getattr(args, "topic_candidate_outside_force_passb_conf", 0.92))
-            candidate_ambiguous_force_b = candidate_ambiguous and pass_a_topic_conf < 0.97
-            low_retrieval_force_b = bool(workflow_profile.force_pass_b_when_low_retrieval and retrieval_quality < float(workflow_profile.force_pass_b_retrieval_threshold))
-            ran_b = bool(ran_b_base or candidate_force_b or candidate_ambiguous_force_b or low_retrieval_force_b)
-            if candidate_force_b:
-                report["topicCandidates"]["passBTriggeredByCandidateConflict"] += 1
-            if candidate_ambiguous_force_b:
-                report["topicCandidates"]["passBTriggeredByAmbiguousCandidates"] += 1
-
-            pass_b: Optional[Dict[str, Any]] = None
-
-            if ran_b:
+        Returns ``(pass_a, pass_b, pass_b_fused)``; ``pass_b`` is ``None`` when not
+        needed or an exception instance when it failed, so the loop reports it in
+        order. ``pass_b_fused`` marks a fused self-check used as Pass B.
+        """
+        return finish_llm_passes(ctx, *call_pass_a(ctx["payload"], ctx["question_images"]))
+
+    def finish_llm_passes(ctx: Dict[str, Any], pass_a: Dict[str, Any], fused_pass_b: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Any, bool]:
+        try:
+            pass_a_for_b = {k: v for k, v in pass_a.items() if k != "_llm_usage"}
+            _flag_pre_maintenance(pass_a_for_b, ctx["preprocessing"]["reasons"])
+            if not pass_b_triggers(pass_a_for_b, ctx["payload"], ctx["retrieval_quality"]).ran_b:
+                return pass_a, None, False
+        except Exception:
+            # Malformed Pass A output: the loop raises it where it always did.
+            return pass_a, None, False
+        if usable_fused_pass_b(fused_pass_b):
+            return pass_a, fused_pass_b, True
+        try:
+            return pass_a, call_pass_b(ctx["payload"], pass_a_for_b, ctx["question_images"]), False
+        except Exception as exc:
+            return pass_a, exc, False
+
+    def run_grouped_llm_passes(ctxs: List[Dict[str, Any]], futures: List[Future]) -> None:
+        """One grouped Pass A call for ``ctxs``, then Pass B per question as needed."""
+        try:
+            pass_as = run_pass_a_grouped(
+                client,
+                provider=provider,
+                topic_catalog_text=topic_catalog_text,
+                payloads=[c["payload"] for c in ctxs],
+                schema=schema_a,
+                model=args.passA_model,
+                temperature=args.passA_temperature,
+            )
+        except Exception:
+            # Grouped call failed as a whole: fall back to one call per question.
+            pass_as = [None] * len(ctxs)
+        for pos_ctx, pass_a, future in zip(ctxs, pass_as, futures):
+            try:
+                future.set_result(run_llm_passes(pos_ctx) if pass_a is None else finish_llm_passes(pos_ctx, pass_a))
+            except Exception as exc:
+                future.set_exception(exc)
+
+    # Optional look-ahead: while question i is processed, Pass A (and Pass B
+    # where it will be triggered) already run for the next questions. Disabled
+    # with result reuse, which needs the earlier results first. With grouping,
+    # image-less questions of the look-ahead window share one Pass A call.
+    pass_a_workers = max(1, int(getattr(args, "passA_concurrency", 1) or 1))
+    requested_group_size = max(1, int(getattr(args, "passA_group_size", 1) or 1))
+    pass_a_group_size = 1 if fused_pass_ab else requested_group_size
+    pass_a_window = pass_a_workers * pass_a_group_size
+    if fused_pass_ab and requested_group_size > 1:
+        emit_progress(
+            event="config_warning",
+            stage="setup",
+            message="Hinweis: --passA-group-size wird mit --passAB-fused ignoriert.",
+        )
+    if pass_a_cache is not None and pass_a_window > 1:
+        ignored = [flag for flag, active in (("--passA-concurrency", pass_a_workers > 1), ("--passA-group-size", pass_a_group_size > 1)) if active]
+        emit_progress(
+            event="config_warning",
+            stage="setup",
+            message=f"Hinweis: {' und '.join(ignored)} wird mit --passA-reuse-similarity ignoriert (sequentieller Pass A).",
+        )
+    prepared_contexts: Dict[int, Dict[str, Any]] = {}
+    pass_a_futures: Dict[int, Future] = {}
+    pass_a_submitted: Set[int] = set()
+    pending_positions: List[int] = []
+    pass_a_executor: Optional[ThreadPoolExecutor] = None
+    if pass_a_window > 1 and pass_a_cache is None:
+        # Mirrors the skip checks at the top of the question loop.
+        for pos, candidate in enumerate(questions, start=1):
+            if selected_question_ids and str(candidate.get("id") or "") not in selected_question_ids:
+                continue
+            previous = candidate.get("aiAudit")
+            if args.resume and isinstance(previous, dict) and previous.get("pipelineVersion") == PIPELINE_VERSION and previous.get("status") == "completed":
+                continue
+            pending_positions.append(pos)
+        if args.limit:
+            pending_positions = pending_positions[: args.limit]
+        pass_a_executor = ThreadPoolExecutor(max_workers=pass_a_workers, thread_name_prefix="pass-a")
+
+    def prefetch_pass_a(position: int, ctx: Dict[str, Any]) -> None:
+        start = bisect_left(pending_positions, position)
+        groupable: List[Tuple[int, Dict[str, Any]]] = []
+        for pos in pending_positions[start : start + pass_a_window]:
+            if pos in pass_a_submitted:
+                continue
+            pos_ctx = ctx if pos == position else prepared_contexts.get(pos)
+            if pos_ctx is None:
                 try:
+                    pos_ctx = prepare_question_context(questions[pos - 1])
+                except Exception:
+                    # Leave it to the loop, which reports errors in order.
+                    continue
+                prepared_contexts[pos] = pos_ctx
+            pass_a_submitted.add(pos)
+            if not bool((pos_ctx["preprocessing"].get("gates") or {}).get("runLlm", True)):
+                continue
+            if pass_a_group_size > 1 and not pos_ctx["question_images"]:
+                groupable.append((pos, pos_ctx))
+            else:
+                pass_a_futures[pos] = pass_a_executor.submit(run_llm_passes, pos_ctx)
+        for offset in range(0, len(groupable), pass_a_group_size):
+            group = groupable[offset : offset + pass_a_group_size]
+            if len(group) == 1:
+                pass_a_futures[group[0][0]] = pass_a_executor.submit(run_llm_passes, group[0][1])
+                continue
+            futures = [Future() for _ in group]
+            for (pos, _), future in zip(group, futures):
+                pass_a_futures[pos] = future
+            pass_a_executor.submit(run_grouped_llm_passes, [c for _, c in group], futures)
+
+    try:
+        for i, q in enumerate(questions, start=1):
+            qid = str(q.get("id") or "")
+            if selected_question_ids and qid not in selected_question_ids:
+                skipped += 1
+                emit_progress(
+                    event="question_skipped_filter",
+                    index=i,
+                    total=total_questions,
+                    processed=processed,
+                    done=done,
+                    skipped=skipped,
+                    message=f"Frage {i}/{total_questions} übersprungen (ID-Filter aktiv).",
+                )
+                continue
+
+            if args.limit and processed >= args.limit:
+                break
+
+            if args.resume and isinstance(q.get("aiAudit"), dict):
+                if q["aiAudit"].get("pipelineVersion") == PIPELINE_VERSION and q["aiAudit"].get("status") == "completed":
+                    skipped += 1
                     emit_progress(
-                        event="pass_b_started",
-                        stage="pass_b",
+                        event="question_skipped",
                         index=i,
                         total=total_questions,
                         processed=processed,
                         done=done,
                         skipped=skipped,
-                        message=f"Frage {i}/{total_questions}: Starte Verifikation (Pass B).",
+                        message=f"Frage {i}/{total_questions} übersprungen (bereits abgeschlossen).",
                     )
-                    pass_b = run_pass_b(
-                        client,
-                        provider=provider,
-                        topic_catalog_text=topic_catalog_text,
-                        payload=payload,
-                        pass_a=pass_a,
-                        schema=schema_b,
-                        model=args.passB_model,
-                        reasoning_effort=args.passB_reasoning_effort,
-                        question_images=question_images,
-                    )
-                    emit_cost_progress("pass_b", args.passB_model, pass_b, q, i)
-                    audit["models"]["passB"] = args.passB_model
-                    report["passes"]["passBRan"] += 1
+                    continue
 
-                    m_b = pass_b["maintenance"]
-                    merged_reasons = list(dict.fromkeys(merged_reasons + (m_b.get("reasons") or [])))
-                    maintenance = {
-                        "needsMaintenance": bool(maintenance.get("needsMaintenance")) or bool(m_b.get("needsMaintenance")),
-                        "severity": int(max(int(maintenance.get("severity", 1)), int(m_b.get("severity", 1)))),
-                        "reasons": merged_reasons,
-                    }
+            emit_progress(
+                event="question_pipeline_started",
+                stage="question",
+                index=i,
+                total=total_questions,
+                processed=processed,
+                done=done,
+                skipped=skipped,
+                message=f"Frage {i}/{total_questions}: Vorbereitung gestartet.",
+            )
 
-                    final_topic_key = pass_b["topic_final"]["topicKey"]
-                    final_topic_conf = float(pass_b["topic_final"]["confidence"])
-                    final_topic_reason = pass_b["topic_final"]["reasonShort"]
-                    final_topic_reason_detailed = pass_b["topic_final"]["reasonDetailed"]
-                    final_topic_source = "passB"
-
-                    v = pass_b["verify_answer"]
-                    cannot = bool(v.get("cannotJudge"))
-                    agree = bool(v.get("agreeWithChange"))
-                    conf_b = float(v.get("confidence"))
-                    verified = normalize_indices(
-                        v.get("verifiedCorrectIndices", []),
-                        n_answers,
-                        valid_indices=external_indices,
-                    )
+            ctx = prepared_contexts.pop(i, None) or prepare_question_context(q)
+            external_indices = ctx["external_indices"]
+            current = ctx["current"]
+            payload = ctx["payload"]
+            question_images = ctx["question_images"]
+            image_context = ctx["image_context"]
+            evidence_chunks = ctx["evidence_chunks"]
+            retrieval_quality = ctx["retrieval_quality"]
+            retrieval_strategy = ctx["retrieval_strategy"]
+            if payload.get("topicCandidates"):
+                report["topicCandidates"]["questionsWithCandidates"] += 1
+            if pass_a_executor is not None:
+                prefetch_pass_a(i, ctx)
 
-                    if len(verified) > 0 and verified != current:
-                        ai_disagrees_with_dataset = True
-
-                    final_answer_confidence = conf_b
-                    final_answer_confidence_source = "passB"
-
-                    verifier_agreed = agree and (not cannot)
-
-                    allow_auto_change_gate = bool((preprocessing.get("gates") or {}).get("allowAutoChange", True))
-                    if (not allow_auto_change_gate) and agree and (not cannot) and verified and verified != current:
-                        report["autoChange"]["blockedByGate"] += 1
-
-                    if should_apply_pass_b_change(
-                        current_indices=current,
-                        verified_indices=verified,
-                        cannot_judge=cannot,
-                        agree_with_change=agree,
-                        confidence_b=conf_b,
-                        apply_min_conf_b=args.apply_change_min_conf_b,
-                        retrieval_quality=retrieval_quality,
-                        evidence_count=len(evidence_chunks),
-                        allow_auto_change=allow_auto_change_gate,
-                    ):
-                        will_change = True
-                        change_source = "passB"
-                        final_correct_indices = current
-                        final_ai_correct_indices = verified
-                    else:
-                        final_correct_indices = current
-                        final_ai_correct_indices = verified if (verified and agree and (not cannot)) else current
+            emit_progress(
+                event="question_context_ready",
+                stage="question",
+                index=i,
+                total=total_questions,
+                processed=processed,
+                done=done,
+                skipped=skipped,
+                retrieval_quality=retrieval_quality,
+                retrieval_strategy=retrieval_strategy,
+                evidence_count=len(evidence_chunks),
+                message=f"Frage {i}/{total_questions}: Kontext bereit (evidence={len(evidence_chunks)}).",
+            )
 
-                    emit_progress(
-                        event="pass_b_finished",
-                        stage="pass_b",
-                        index=i,
-                        total=total_questions,
-                        processed=processed,
-                        done=done,
-                        skipped=skipped,
-                        message=f"Frage {i}/{total_questions}: Pass B abgeschlossen.",
-                    )
-                    verification = {
-                        "ran": True,
-                        "model": args.passB_model,
-                        "cannotJudge": cannot,
-                        "agreeWithChange": agree,
-                        "confidence": conf_b,
-                        "reasonShort": v.get("reasonShort", ""),
-                        "reasonDetailed": v.get("reasonDetailed", ""),
-                        "verifiedCorrectIndices": verified,
-                        "evidenceChunkIds": v.get("evidenceChunkIds", []),
-                        "appliedChange": will_change,
-                    }
+            answers = q.get("answers") or []
+            n_answers = len(answers)
+            emit_progress(
+                event="preprocessing_started",
+                stage="preprocessing",
+                index=i,
+                total=total_questions,
+                processed=processed,
+                done=done,
+                skipped=skipped,
+                message=f"Frage {i}/{total_questions}: Preprocessing/Gates.",
+            )
+            preprocessing = ctx["preprocessing"]
+            pre_maintenance_reasons = preprocessing["reasons"]
+            gates = preprocessing["gates"]
+            if not bool(gates.get("runLlm", True)):
+                report["preprocessing"]["runLlmFalse"] += 1
+            if not bool(gates.get("allowAutoChange", True)):
+                report["preprocessing"]["allowAutoChangeFalse"] += 1
+            if bool(gates.get("forceManualReview", False)):
+                report["preprocessing"]["forceManualReview"] += 1
+
+            audit: Dict[str, Any] = {
+                "pipelineVersion": PIPELINE_VERSION,
+                "status": "error",
+                "models": {"provider": provider, "passA": args.passA_model, "passB": None, "review": None, "explainer": None},
+                "knowledge": {
+                    "enabled": bool(knowledge_base is not None),
+                    "retrievalQuality": retrieval_quality,
+                    "evidenceCount": len(evidence_chunks),
+                },
+                "images": image_context,
+                "clusters": {
+                    "questionContentClusterId": payload["questionClusterContext"].get("clusterId"),
+                    "questionImageClusterIds": payload["imageClusterContext"].get("clusterIds", []),
+                },
+                "preprocessing": preprocessing,
+            }
 
-                except Exception as e:
-                    emit_progress(
-                        event="pass_b_error",
-                        stage="pass_b",
-                        index=i,
-                        total=total_questions,
-                        processed=processed,
-                        done=done,
-                        skipped=skipped,
-                        message=f"Frage {i}/{total_questions}: Pass B Fehler – {e}",
-                    )
-                    emit_cost_progress("pass_b", args.passB_model, pass_b, q, i)
-                    audit["models"]["passB"] = args.passB_model
-                    report["passes"]["passBRan"] += 1
-                    verification = {"ran": True, "model": args.passB_model, "error": str(e)}
+            try:
+                if not bool((preprocessing.get("gates") or {}).get("runLlm", True)):
                     maintenance = {
-                        "needsMaintenance": bool(maintenance.get("needsMaintenance")),
-                        "severity": int(maintenance.get("severity", 1)),
-                        "reasons": merged_reasons,
+                        "needsMaintenance": True,
+                        "severity": 3,
+                        "reasons": list(dict.fromkeys(pre_maintenance_reasons + ["preprocessing_llm_skipped"])),
                     }
+                    audit.update({
+                        "status": "completed",
+                        "topicInitial": {"superTopic": "", "subtopic": "", "confidence": 0.0, "reasonShort": "Skipped by preprocessing gate", "reasonDetailed": "runLlm=false"},
+                        "topicFinal": {"superTopic": "", "subtopic": "", "confidence": 0.0, "reasonShort": "Skipped by preprocessing gate", "reasonDetailed": "runLlm=false", "source": "preprocessing"},
+                        "answerPlausibility": {
+                            "originalCorrectIndices": current,
+                            "passA": {"isPlausible": False, "confidence": 0.0, "recommendChange": False, "proposedCorrectIndices": [], "reasonShort": "Skipped by preprocessing gate", "reasonDetailed": "runLlm=false", "evidenceChunkIds": []},
+                            "finalCorrectIndices": current,
+                            "finalAiCorrectIndices": current,
+                            "finalAnswerConfidence": 0.0,
+                            "finalAnswerConfidenceSource": "preprocessing",
+                            "finalCombinedConfidence": 0.0,
+                            "retrievalQuality": retrieval_quality,
+                            "evidenceCount": len(evidence_chunks),
+                            "evidence": _compact_evidence(evidence_chunks),
+                            "aiDisagreesWithDataset": False,
+                            "changedInDataset": False,
+                            "changeSource": "none",
+                            "verification": {"ran": False, "skippedByPreprocessing": True},
+                        },
+                        "maintenance": maintenance,
+                        "questionAbstraction": {"summary": ""},
+                    })
+                    done += 1
+                    q["aiAudit"] = audit
+                    processed += 1
+                    emit_progress(event="question_finished", index=i, total=total_questions, processed=processed, done=done, skipped=skipped, status=audit.get("status"), message=f"Frage {i}/{total_questions} abgeschlossen (preprocessing skip).")
+                    if args.checkpoint_every and processed % args.checkpoint_every == 0:
+                        _remove_costs_from_question_audits(questions)
+                        out_obj = _build_output_obj(container=container, questions=questions, cleanup_spec=cleanup_spec)
+                        save_json(args.output, out_obj)
+                    time.sleep(args.sleep)
+                    continue
 
-            else:
+                prefetched_pass_b: Any = None
+                fused_pass_b: Optional[Dict[str, Any]] = None
+                pass_b_fused = False
                 emit_progress(
-                    event="pass_b_skipped",
-                    stage="pass_b",
+                    event="question_started",
+                    stage="pass_a",
                     index=i,
                     total=total_questions,
                     processed=processed,
                     done=done,
                     skipped=skipped,
-                    message=f"Frage {i}/{total_questions}: Pass B nicht erforderlich.",
+                    message=f"Frage {i}/{total_questions}: Starte Pass A.",
+                )
+                reused = pass_a_cache.lookup(payload) if pass_a_cache is not None else None
+                if reused is not None:
+                    pass_a_source_id, pass_a = reused
+                    audit["passAReusedFrom"] = pass_a_source_id
+                    report["passes"]["passAReused"] += 1
+                else:
+                    pass_a_future = pass_a_futures.pop(i, None)
+                    if pass_a_future is not None:
+                        pass_a, prefetched_pass_b, pass_b_fused = pass_a_future.result()
+                    else:
+                        pass_a, fused_pass_b = call_pass_a(payload, question_images)
+                emit_cost_progress("pass_a", args.passA_model, pass_a, q, i)
+                # Snapshot before the audit logic below mutates the result.
+                pass_a_snapshot = copy.deepcopy(pass_a) if pass_a_cache is not None and reused is None else None
+                emit_progress(
+                    event="pass_a_finished",
+                    stage="pass_a",
+                    index=i,
+                    total=total_questions,
+                    processed=processed,
+                    done=done,
+                    skipped=skipped,
+                    message=f"Frage {i}/{total_questions}: Pass A abgeschlossen.",
                 )
-                maintenance = {
-                    "needsMaintenance": bool(maintenance.get("needsMaintenance")),
-                    "severity": int(maintenance.get("severity", 1)),
-                    "reasons": merged_reasons,
-                }
 
-            final_combined_confidence = compose_confidence(
-                answer_conf=final_answer_confidence,
-                topic_conf=final_topic_conf,
-                retrieval_quality=retrieval_quality,
-                verifier_agreed=verifier_agreed,
-                evidence_count=len(evidence_chunks),
-                knowledge_enabled=bool(knowledge_base is not None),
-            )
+                proposed = normalize_indices(
+                    pass_a["answer_review"].get("proposedCorrectIndices", []),
+                    n_answers,
+                    valid_indices=external_indices,
+                )
 
-            if (
-                (final_answer_confidence < args.low_conf_maintenance_threshold)
-                or (final_topic_conf < args.low_conf_maintenance_threshold)
-                or (final_combined_confidence < args.low_conf_maintenance_threshold)
-            ):
-                maintenance["needsMaintenance"] = True
-                maintenance["severity"] = max(int(maintenance.get("severity", 1)), 2)
-                maintenance["reasons"] = list(dict.fromkeys((maintenance.get("reasons") or []) + [
-                    "low_confidence_answer_or_topic_or_combined"
-                ]))
-
-            if bool((preprocessing.get("gates") or {}).get("forceManualReview", False)):
-                maintenance["needsMaintenance"] = True
-                maintenance["severity"] = max(int(maintenance.get("severity", 1)), 3)
-                maintenance["reasons"] = list(dict.fromkeys((maintenance.get("reasons") or []) + ["preprocessing_force_manual_review"]))
-
-            init_row = _topic_row_for_key(key_map, pass_a["topic_initial"].get("topicKey"))
-            final_row = _topic_row_for_key(key_map, final_topic_key)
-            compact_evidence = _compact_evidence(evidence_chunks)
-
-            audit.update({
-                "status": "completed",
-                "topicInitial": {
-                    "superTopic": init_row["superTopicName"],
-                    "subtopic": init_row["subtopicName"],
-                    "confidence": float(pass_a["topic_initial"]["confidence"]),
-                    "reasonShort": pass_a["topic_initial"]["reasonShort"],
-                    "reasonDetailed": pass_a["topic_initial"]["reasonDetailed"],
-                },
-                "topicFinal": {
-                    "superTopic": final_row["superTopicName"],
-                    "subtopic": final_row["subtopicName"],
-                    "confidence": final_topic_conf,
-                    "reasonShort": final_topic_reason,
-                    "reasonDetailed": final_topic_reason_detailed,
-                    "source": final_topic_source,
-                },
-                "answerPlausibility": {
-                    "originalCorrectIndices": current,
-                    "passA": {
-                        "isPlausible": bool(pass_a["answer_review"]["isPlausible"]),
-                        "confidence": conf_a,
-                        "recommendChange": recommend_a,
-                        "proposedCorrectIndices": proposed,
-                        "reasonShort": pass_a["answer_review"]["reasonShort"],
-                        "reasonDetailed": pass_a["answer_review"]["reasonDetailed"],
-                        "evidenceChunkIds": pass_a["answer_review"].get("evidenceChunkIds", []),
-                    },
-                    "finalCorrectIndices": final_correct_indices,
-                    "finalAiCorrectIndices": final_ai_correct_indices,
-                    "finalAnswerConfidence": final_answer_confidence,
-                    "finalAnswerConfidenceSource": final_answer_confidence_source,
-                    "finalCombinedConfidence": final_combined_confidence,
-                    "retrievalQuality": retrieval_quality,
-                    "evidenceCount": len(evidence_chunks),
-                    "evidence": compact_evidence,
-                    "aiDisagreesWithDataset": ai_disagrees_with_dataset,
-                    "changedInDataset": False,
-                    "aiSuggestedChange": bool(will_change),
-                    "changeSource": change_source,
-                    "verification": verification,
-                },
-                "maintenance": maintenance,
-                "questionAbstraction": {
-                    "summary": (pass_a.get("question_abstraction") or {}).get("summary", ""),
-                },
-            })
+                final_topic_key = pass_a["topic_final"]["topicKey"]
+                final_topic_conf = float(pass_a["topic_final"]["confidence"])
+                final_topic_reason = pass_a["topic_final"]["reasonShort"]
+                final_topic_reason_detailed = pass_a["topic_final"]["reasonDetailed"]
+                final_topic_source = "passA"
+
+                maintenance = pass_a["maintenance"]
+                extra_flags = pass_a["answer_review"].get("maintenanceSuspicion", []) or []
+                merged_reasons = list(dict.fromkeys(pre_maintenance_reasons + (maintenance.get("reasons") or []) + extra_flags))
+                _flag_pre_maintenance(pass_a, pre_maintenance_reasons)
+
+                recommend_a = bool(pass_a["answer_review"]["recommendChange"])
+                conf_a = float(pass_a["answer_review"]["confidence"])
+
+                ai_disagrees_with_dataset = len(proposed) > 0 and proposed != current
+                final_answer_confidence = conf_a
+                final_answer_confidence_source = "passA"
+
+                will_change = False
+                change_source = "none"
+                final_correct_indices = current
+                final_ai_correct_indices = current
+                verification: Dict[str, Any] = {"ran": False}
+                verifier_agreed: Optional[bool] = None
+
+                candidate_keys = {str(x.get("topicKey")) for x in (payload.get("topicCandidates") or []) if x.get("topicKey")}
+                triggers = pass_b_triggers(pass_a, payload, retrieval_quality)
+                if triggers.candidate_conflict:
+                    report["topicCandidates"]["passAOutsideCandidates"] += 1
+
+                ran_b = triggers.ran_b
+                if pass_a_snapshot is not None and not ran_b:
+                    # Only results confident enough to skip verification are reused.
+                    pass_a_cache.store(payload, pass_a_snapshot)
+                if triggers.candidate_force_b:
+                    report["topicCandidates"]["passBTriggeredByCandidateConflict"] += 1
+                if triggers.candidate_ambiguous_force_b:
+                    report["topicCandidates"]["passBTriggeredByAmbiguousCandidates"] += 1
+
+                pass_b: Optional[Dict[str, Any]] = None
+
+                if ran_b:
+                    try:
+                        emit_progress(
+                            event="pass_b_started",
+                            stage="pass_b",
+                            index=i,
+                            total=total_questions,
+                            processed=processed,
+                            done=done,
+                            skipped=skipped,
+                            message=f"Frage {i}/{total_questions}: Starte Verifikation (Pass B).",
+                        )
+                        if isinstance(prefetched_pass_b, Exception):
+                            raise prefetched_pass_b
+                        if prefetched_pass_b is not None:
+                            pass_b = prefetched_pass_b
+                        elif usable_fused_pass_b(fused_pass_b):
+                            pass_b, pass_b_fused = fused_pass_b, True
+                        else:
+                            pass_b = call_pass_b(payload, pass_a, question_images)
+                        # A fused self-check was paid for with Pass A (zero-cost record here).
+                        pass_b_model = args.passA_model if pass_b_fused else args.passB_model
+                        emit_cost_progress("pass_b", pass_b_model, pass_b, q, i)
+                        audit["models"]["passB"] = pass_b_model
+                        if pass_b_fused:
+                            audit["passBFused"] = True
+                        report["passes"]["passBRan"] += 1
+
+                        m_b = pass_b["maintenance"]
+                        merged_reasons = list(dict.fromkeys(merged_reasons + (m_b.get("reasons") or [])))
+                        maintenance = {
+                            "needsMaintenance": bool(maintenance.get("needsMaintenance")) or bool(m_b.get("needsMaintenance")),
+                            "severity": int(max(int(maintenance.get("severity", 1)), int(m_b.get("severity", 1)))),
+                            "reasons": merged_reasons,
+                        }
 
-            if pass_a["topic_initial"]["topicKey"] != final_topic_key:
-                report["topicDrift"]["passAInitialVsFinal"] += 1
-            if candidate_keys and final_topic_key not in candidate_keys:
-                report["topicCandidates"]["finalOutsideCandidates"] += 1
+                        final_topic_key = pass_b["topic_final"]["topicKey"]
+                        final_topic_conf = float(pass_b["topic_final"]["confidence"])
+                        final_topic_reason = pass_b["topic_final"]["reasonShort"]
+                        final_topic_reason_detailed = pass_b["topic_final"]["reasonDetailed"]
+                        final_topic_source = "passB"
+
+                        v = pass_b["verify_answer"]
+                        cannot = bool(v.get("cannotJudge"))
+                        agree = bool(v.get("agreeWithChange"))
+                        conf_b = float(v.get("confidence"))
+                        verified = normalize_indices(
+                            v.get("verifiedCorrectIndices", []),
+                            n_answers,
+                            valid_indices=external_indices,
+                        )
 
-            force_manual_review = bool((preprocessing.get("gates") or {}).get("forceManualReview", False))
-            if force_manual_review or should_run_review_pass(
-                args=args,
-                maintenance=audit.get("maintenance", {}),
-                ai_disagrees_with_dataset=ai_disagrees_with_dataset,
-                final_combined_confidence=final_combined_confidence,
-                pass_a_topic_key=pass_a["topic_initial"]["topicKey"],
-                final_topic_key=final_topic_key,
-            ):
-                review: Optional[Dict[str, Any]] = None
-                try:
-                    emit_progress(
-                        event="review_started",
-                        stage="review",
-                        index=i,
-                        total=total_questions,
-                        processed=processed,
-                        done=done,
-                        skipped=skipped,
-                        message=f"Frage {i}/{total_questions}: Starte Review-Pass.",
-                    )
-                    review = run_review_pass(
-                        client,
-                        payload=payload,
-                        current_audit=audit,
-                        schema=schema_review,
-                        model=args.review_model,
-                        question_images=question_images,
-                    )
-                    if review is not None:
-                        emit_cost_progress("review", args.review_model, review, q, i)
-                    audit["models"]["review"] = args.review_model
-                    report["passes"]["reviewRan"] += 1
-                    review_indices = normalize_indices(
-                        review.get("finalCorrectIndices", []),
-                        n_answers,
-                        valid_indices=external_indices,
-                    )
-                    if review_indices:
-                        audit["answerPlausibility"]["finalAiCorrectIndices"] = review_indices
-                    topic_key_review = review.get("finalTopicKey")
-                    if topic_key_review in key_map:
-                        topic_row_review = _topic_row_for_key(key_map, topic_key_review)
-                        audit["topicFinal"]["superTopic"] = topic_row_review["superTopicName"]
-                        audit["topicFinal"]["subtopic"] = topic_row_review["subtopicName"]
-                        audit["topicFinal"]["source"] = "review"
-                        audit["topicFinal"]["confidence"] = float(review.get("confidence", audit["topicFinal"].get("confidence", 0.0)))
-                        audit["topicFinal"]["reasonShort"] = "Pass-C review override"
-                        audit["topicFinal"]["reasonDetailed"] = review.get("reviewComment", "")
-                    audit["reviewPass"] = review
-                    if review.get("recommendManualReview"):
-                        audit["maintenance"]["needsMaintenance"] = True
-                        audit["maintenance"]["reasons"] = list(dict.fromkeys((audit["maintenance"].get("reasons") or []) + ["review_pass_manual_review"]))
-                    emit_progress(
-                        event="review_finished",
-                        stage="review",
-                        index=i,
-                        total=total_questions,
-                        processed=processed,
-                        done=done,
-                        skipped=skipped,
-                        message=f"Frage {i}/{total_questions}: Review-Pass abgeschlossen.",
-                    )
-                except Exception as review_exc:
+                        if len(verified) > 0 and verified != current:
+                            ai_disagrees_with_dataset = True
+
+                        final_answer_confidence = conf_b
+                        final_answer_confidence_source = "passB"
+
+                        verifier_agreed = agree and (not cannot)
+
+                        allow_auto_change_gate = bool((preprocessing.get("gates") or {}).get("allowAutoChange", True))
+                        if (not allow_auto_change_gate) and agree and (not cannot) and verified and verified != current:
+                            report["autoChange"]["blockedByGate"] += 1
+
+                        if should_apply_pass_b_change(
+                            current_indices=current,
+                            verified_indices=verified,
+                            cannot_judge=cannot,
+                            agree_with_change=agree,
+                            confidence_b=conf_b,
+                            apply_min_conf_b=args.apply_change_min_conf_b,
+                            retrieval_quality=retrieval_quality,
+                            evidence_count=len(evidence_chunks),
+                            allow_auto_change=allow_auto_change_gate,
+                        ):
+                            will_change = True
+                            change_source = "passB"
+                            final_correct_indices = current
+                            final_ai_correct_indices = verified
+                        else:
+                            final_correct_indices = current
+                            final_ai_correct_indices = verified if (verified and agree and (not cannot)) else current
+
+                        emit_progress(
+                            event="pass_b_finished",
+                            stage="pass_b",
+                            index=i,
+                            total=total_questions,
+                            processed=processed,
+                            done=done,
+                            skipped=skipped,
+                            message=f"Frage {i}/{total_questions}: Pass B abgeschlossen.",
+                        )
+                        verification = {
+                            "ran": True,
+                            "model": pass_b_model,
+                            "cannotJudge": cannot,
+                            "agreeWithChange": agree,
+                            "confidence": conf_b,
+                            "reasonShort": v.get("reasonShort", ""),
+                            "reasonDetailed": v.get("reasonDetailed", ""),
+                            "verifiedCorrectIndices": verified,
+                            "evidenceChunkIds": v.get("evidenceChunkIds", []),
+                            "appliedChange": will_change,
+                        }
+
+                    except Exception as e:
+                        emit_progress(
+                            event="pass_b_error",
+                            stage="pass_b",
+                            index=i,
+                            total=total_questions,
+                            processed=processed,
+                            done=done,
+                            skipped=skipped,
+                            message=f"Frage {i}/{total_questions}: Pass B Fehler – {e}",
+                        )
+                        emit_cost_progress("pass_b", args.passB_model, pass_b, q, i)
+                        audit["models"]["passB"] = args.passB_model
+                        report["passes"]["passBRan"] += 1
+                        verification = {"ran": True, "model": args.passB_model, "error": str(e)}
+                        maintenance = {
+                            "needsMaintenance": bool(maintenance.get("needsMaintenance")),
+                            "severity": int(maintenance.get("severity", 1)),
+                            "reasons": merged_reasons,
+                        }
+
+                else:
                     emit_progress(
-                        event="review_error",
-                        stage="review",
+                        event="pass_b_skipped",
+                        stage="pass_b",
                         index=i,
                         total=total_questions,
                         processed=processed,
                         done=done,
                         skipped=skipped,
-                        message=f"Frage {i}/{total_questions}: Review-Pass Fehler – {review_exc}",
+                        message=f"Frage {i}/{total_questions}: Pass B nicht erforderlich.",
                     )
-                    if review is not None:
-                        emit_cost_progress("review", args.review_model, review, q, i)
-                    audit["models"]["review"] = args.review_model
-                    report["passes"]["reviewRan"] += 1
-                    # one robust fallback attempt with reduced audit context
-                    reduced_audit = {
-                        "topicFinal": audit.get("topicFinal") or {},
-                        "answerPlausibility": audit.get("answerPlausibility") or {},
-                        "maintenance": audit.get("maintenance") or {},
-                        "clusters": audit.get("clusters") or {},
-                        "preprocessing": audit.get("preprocessing") or {},
+                    maintenance = {
+                        "needsMaintenance": bool(maintenance.get("needsMaintenance")),
+                        "severity": int(maintenance.get("severity", 1)),
+                        "reasons": merged_reasons,
                     }
+
+                final_combined_confidence = compose_confidence(
+                    answer_conf=final_answer_confidence,
+                    topic_conf=final_topic_conf,
+                    retrieval_quality=retrieval_quality,
+                    verifier_agreed=verifier_agreed,
+                    evidence_count=len(evidence_chunks),
+                    knowledge_enabled=bool(knowledge_base is not None),
+                )
+
+                if (
+                    (final_answer_confidence < args.low_conf_maintenance_threshold)
+                    or (final_topic_conf < args.low_conf_maintenance_threshold)
+                    or (final_combined_confidence < args.low_conf_maintenance_threshold)
+                ):
+                    maintenance["needsMaintenance"] = True
+                    maintenance["severity"] = max(int(maintenance.get("severity", 1)), 2)
+                    maintenance["reasons"] = list(dict.fromkeys((maintenance.get("reasons") or []) + [
+                        "low_confidence_answer_or_topic_or_combined"
+                    ]))
+
+                if bool((preprocessing.get("gates") or {}).get("forceManualReview", False)):
+                    maintenance["needsMaintenance"] = True
+                    maintenance["severity"] = max(int(maintenance.get("severity", 1)), 3)
+                    maintenance["reasons"] = list(dict.fromkeys((maintenance.get("reasons") or []) + ["preprocessing_force_manual_review"]))
+
+                init_row = _topic_row_for_key(key_map, pass_a["topic_initial"].get("topicKey"))
+                final_row = _topic_row_for_key(key_map, final_topic_key)
+                compact_evidence = _compact_evidence(evidence_chunks)
+
+                audit.update({
+                    "status": "completed",
+                    "topicInitial": {
+                        "superTopic": init_row["superTopicName"],
+                        "subtopic": init_row["subtopicName"],
+                        "confidence": float(pass_a["topic_initial"]["confidence"]),
+                        "reasonShort": pass_a["topic_initial"]["reasonShort"],
+                        "reasonDetailed": pass_a["topic_initial"]["reasonDetailed"],
+                    },
+                    "topicFinal": {
+                        "superTopic": final_row["superTopicName"],
+                        "subtopic": final_row["subtopicName"],
+                        "confidence": final_topic_conf,
+                        "reasonShort": final_topic_reason,
+                        "reasonDetailed": final_topic_reason_detailed,
+                        "source": final_topic_source,
+                    },
+                    "answerPlausibility": {
+                        "originalCorrectIndices": current,
+                        "passA": {
+                            "isPlausible": bool(pass_a["answer_review"]["isPlausible"]),
+                            "confidence": conf_a,
+                            "recommendChange": recommend_a,
+                            "proposedCorrectIndices": proposed,
+                            "reasonShort": pass_a["answer_review"]["reasonShort"],
+                            "reasonDetailed": pass_a["answer_review"]["reasonDetailed"],
+                            "evidenceChunkIds": pass_a["answer_review"].get("evidenceChunkIds", []),
+                        },
+                        "finalCorrectIndices": final_correct_indices,
+                        "finalAiCorrectIndices": final_ai_correct_indices,
+                        "finalAnswerConfidence": final_answer_confidence,
+                        "finalAnswerConfidenceSource": final_answer_confidence_source,
+                        "finalCombinedConfidence": final_combined_confidence,
+                        "retrievalQuality": retrieval_quality,
+                        "evidenceCount": len(evidence_chunks),
+                        "evidence": compact_evidence,
+                        "aiDisagreesWithDataset": ai_disagrees_with_dataset,
+                        "changedInDataset": False,
+                        "aiSuggestedChange": bool(will_change),
+                        "changeSource": change_source,
+                        "verification": verification,
+                    },
+                    "maintenance": maintenance,
+                    "questionAbstraction": {
+                        "summary": (pass_a.get("question_abstraction") or {}).get("summary", ""),
+                    },
+                })
+
+                if pass_a["topic_initial"]["topicKey"] != final_topic_key:
+                    report["topicDrift"]["passAInitialVsFinal"] += 1
+                if candidate_keys and final_topic_key not in candidate_keys:
+                    report["topicCandidates"]["finalOutsideCandidates"] += 1
+
+                force_manual_review = bool((preprocessing.get("gates") or {}).get("forceManualReview", False))
+                if force_manual_review or should_run_review_pass(
+                    policy=review_policy,
+                    maintenance=audit.get("maintenance", {}),
+                    ai_disagrees_with_dataset=ai_disagrees_with_dataset,
+                    final_combined_confidence=final_combined_confidence,
+                    pass_a_topic_key=pass_a["topic_initial"]["topicKey"],
+                    final_topic_key=final_topic_key,
+                ):
+                    review: Optional[Dict[str, Any]] = None
                     try:
                         emit_progress(
-                            event="review_retry_started",
+                            event="review_started",
                             stage="review",
                             index=i,
                             total=total_questions,
                             processed=processed,
                             done=done,
                             skipped=skipped,
-                            message=f"Frage {i}/{total_questions}: Review-Pass Retry mit reduziertem Kontext.",
+                            message=f"Frage {i}/{total_questions}: Starte Review-Pass.",
                         )
-                        review_retry = run_review_pass(
+                        review = run_review_pass(
                             client,
                             payload=payload,
-                            current_audit=reduced_audit,
+                            current_audit=audit,
                             schema=schema_review,
                             model=args.review_model,
                             question_images=question_images,
                         )
-                        emit_cost_progress("review_retry", args.review_model, review_retry, q, i)
-                        audit["reviewPass"] = review_retry
-                        if review_retry.get("recommendManualReview"):
+                        if review is not None:
+                            emit_cost_progress("review", args.review_model, review, q, i)
+                        audit["models"]["review"] = args.review_model
+                        report["passes"]["reviewRan"] += 1
+                        review_indices = normalize_indices(
+                            review.get("finalCorrectIndices", []),
+                            n_answers,
+                            valid_indices=external_indices,
+                        )
+                        if review_indices:
+                            audit["answerPlausibility"]["finalAiCorrectIndices"] = review_indices
+                        topic_key_review = review.get("finalTopicKey")
+                        topic_row_review = key_map.get(topic_key_review)
+                        if topic_row_review is not None:
+                            audit["topicFinal"]["superTopic"] = topic_row_review["superTopicName"]
+                            audit["topicFinal"]["subtopic"] = topic_row_review["subtopicName"]
+                            audit["topicFinal"]["source"] = "review"
+                            audit["topicFinal"]["confidence"] = float(review.get("confidence", audit["topicFinal"].get("confidence", 0.0)))
+                            audit["topicFinal"]["reasonShort"] = "Pass-C review override"
+                            audit["topicFinal"]["reasonDetailed"] = review.get("reviewComment", "")
+                        audit["reviewPass"] = review
+                        if review.get("recommendManualReview"):
                             audit["maintenance"]["needsMaintenance"] = True
-                            audit["maintenance"]["reasons"] = list(
-                                dict.fromkeys((audit["maintenance"].get("reasons") or []) + ["review_pass_manual_review"])
-                            )
+                            audit["maintenance"]["reasons"] = list(dict.fromkeys((audit["maintenance"].get("reasons") or []) + ["review_pass_manual_review"]))
                         emit_progress(
-                            event="review_retry_finished",
+                            event="review_finished",
                             stage="review",
                             index=i,
                             total=total_questions,
                             processed=processed,
                             done=done,
                             skipped=skipped,
-                            message=f"Frage {i}/{total_questions}: Review-Pass Retry erfolgreich.",
+                            message=f"Frage {i}/{total_questions}: Review-Pass abgeschlossen.",
                         )
-                    except Exception as review_retry_exc:
-                        audit["reviewPass"] = {
-                            "error": str(review_exc),
-                            "retryError": str(review_retry_exc),
+                    except Exception as review_exc:
+                        emit_progress(
+                            event="review_error",
+                            stage="review",
+                            index=i,
+                            total=total_questions,
+                            processed=processed,
+                            done=done,
+                            skipped=skipped,
+                            message=f"Frage {i}/{total_questions}: Review-Pass Fehler – {review_exc}",
+                        )
+                        if review is not None:
+                            emit_cost_progress("review", args.review_model, review, q, i)
+                        audit["models"]["review"] = args.review_model
+                        report["passes"]["reviewRan"] += 1
+                        # one robust fallback attempt with reduced audit context
+                        reduced_audit = {
+                            "topicFinal": audit.get("topicFinal") or {},
+                            "answerPlausibility": audit.get("answerPlausibility") or {},
+                            "maintenance": audit.get("maintenance") or {},
+                            "clusters": audit.get("clusters") or {},
+                            "preprocessing": audit.get("preprocessing") or {},
                         }
-            else:
-                emit_progress(
-                    event="review_skipped",
-                    stage="review",
-                    index=i,
-                    total=total_questions,
-                    processed=processed,
-                    done=done,
-                    skipped=skipped,
-                    message=f"Frage {i}/{total_questions}: Review-Pass übersprungen.",
-                )
+                        try:
+                            emit_progress(
+                                event="review_retry_started",
+                                stage="review",
+                                index=i,
+                                total=total_questions,
+                                processed=processed,
+                                done=done,
+                                skipped=skipped,
+                                message=f"Frage {i}/{total_questions}: Review-Pass Retry mit reduziertem Kontext.",
+                            )
+                            review_retry = run_review_pass(
+                                client,
+                                payload=payload,
+                                current_audit=reduced_audit,
+                                schema=schema_review,
+                                model=args.review_model,
+                                question_images=question_images,
+                            )
+                            emit_cost_progress("review_retry", args.review_model, review_retry, q, i)
+                            audit["reviewPass"] = review_retry
+                            if review_retry.get("recommendManualReview"):
+                                audit["maintenance"]["needsMaintenance"] = True
+                                audit["maintenance"]["reasons"] = list(
+                                    dict.fromkeys((audit["maintenance"].get("reasons") or []) + ["review_pass_manual_review"])
+                                )
+                            emit_progress(
+                                event="review_retry_finished",
+                                stage="review",
+                                index=i,
+                                total=total_questions,
+                                processed=processed,
+                                done=done,
+                                skipped=skipped,
+                                message=f"Frage {i}/{total_questions}: Review-Pass Retry erfolgreich.",
+                            )
+                        except Exception as review_retry_exc:
+                            audit["reviewPass"] = {
+                                "error": str(review_exc),
+                                "retryError": str(review_retry_exc),
+                            }
+                else:
+                    emit_progress(
+                        event="review_skipped",
+                        stage="review",
+                        index=i,
+                        total=total_questions,
+                        processed=processed,
+                        done=done,
+                        skipped=skipped,
+                        message=f"Frage {i}/{total_questions}: Review-Pass übersprungen.",
+                    )
 
-            if args.debug:
-                audit["_debug"] = {"passA_raw": pass_a, "passB_raw": pass_b}
+                if args.debug:
+                    audit["_debug"] = {"passA_raw": pass_a, "passB_raw": pass_b}
 
-            if args.write_top_level:
-                q["aiSuperTopic"] = audit["topicFinal"]["superTopic"]
-                q["aiSubtopic"] = audit["topicFinal"]["subtopic"]
-                q["aiTopicConfidence"] = audit["topicFinal"]["confidence"]
-                q["aiNeedsMaintenance"] = audit["maintenance"]["needsMaintenance"]
-                q["aiMaintenanceSeverity"] = audit["maintenance"]["severity"]
-                q["aiMaintenanceReasons"] = audit["maintenance"]["reasons"]
+                if args.write_top_level:
+                    q["aiSuperTopic"] = audit["topicFinal"]["superTopic"]
+                    q["aiSubtopic"] = audit["topicFinal"]["subtopic"]
+                    q["aiTopicConfidence"] = audit["topicFinal"]["confidence"]
+                    q["aiNeedsMaintenance"] = audit["maintenance"]["needsMaintenance"]
+                    q["aiMaintenanceSeverity"] = audit["maintenance"]["severity"]
+                    q["aiMaintenanceReasons"] = audit["maintenance"]["reasons"]
 
-            done += 1
+                done += 1
 
-        except Exception as e:
-            audit["status"] = "error"
-            audit["error"] = str(e)
+            except Exception as e:
+                audit["status"] = "error"
+                audit["error"] = str(e)
 
-        audit.pop("costs", None)
-        q["aiAudit"] = audit
-        for reason in (((audit.get("maintenance") or {}).get("reasons") or [])):
-            report["maintenanceReasons"][reason] = int(report["maintenanceReasons"].get(reason, 0)) + 1
+            audit.pop("costs", None)
+            q["aiAudit"] = audit
+            for reason in (((audit.get("maintenance") or {}).get("reasons") or [])):
+                report["maintenanceReasons"][reason] = int(report["maintenanceReasons"].get(reason, 0)) + 1
 
-        processed += 1
-        emit_progress(
-            event="question_finished",
-            index=i,
-            total=total_questions,
-            processed=processed,
-            done=done,
-            skipped=skipped,
-            status=audit.get("status"),
-            message=f"Frage {i}/{total_questions} abgeschlossen (Status: {audit.get('status')}).",
-        )
-        if args.checkpoint_every and processed % args.checkpoint_every == 0:
-            _remove_costs_from_question_audits(questions)
-            out_obj = _build_output_obj(container=container, questions=questions, cleanup_spec=cleanup_spec)
-            save_json(args.output, out_obj)
-            print(f"[{i}/{len(questions)}] checkpoint | processed={processed} done={done} skipped={skipped} lastStatus={audit.get('status')}")
+            processed += 1
             emit_progress(
-                event="checkpoint_saved",
+                event="question_finished",
                 index=i,
                 total=total_questions,
                 processed=processed,
                 done=done,
                 skipped=skipped,
                 status=audit.get("status"),
-                message=f"Checkpoint gespeichert ({processed} verarbeitet).",
+                message=f"Frage {i}/{total_questions} abgeschlossen (Status: {audit.get('status')}).",
             )
+            if args.checkpoint_every and processed % args.checkpoint_every == 0:
+                _remove_costs_from_question_audits(questions)
+                out_obj = _build_output_obj(container=container, questions=questions, cleanup_spec=cleanup_spec)
+                save_json(args.output, out_obj)
+                print(f"[{i}/{len(questions)}] checkpoint | processed={processed} done={done} skipped={skipped} lastStatus={audit.get('status')}")
+                emit_progress(
+                    event="checkpoint_saved",
+                    index=i,
+                    total=total_questions,
+                    processed=processed,
+                    done=done,
+                    skipped=skipped,
+                    status=audit.get("status"),
+                    message=f"Checkpoint gespeichert ({processed} verarbeitet).",
+                )
 
-        time.sleep(args.sleep)
+            time.sleep(args.sleep)
+    finally:
+        # Also on early exit (checkpoint error, interrupt, UI stop): queued
+        # look-ahead calls must not keep running and spending tokens.
+        if pass_a_executor is not None:
+            pass_a_executor.shutdown(wait=False, cancel_futures=True)
 
     emit_progress(
         event="abstraction_clustering_started",
@@ -1770,7 +2031,8 @@ def process_questions(
     # removed/merged cluster members. Re-running cluster_abstractions() at finalize
     # would overwrite those refined IDs immediately before saving.
     _remove_costs_from_question_audits(questions)
-    out_obj = _build_output_obj(container=container, questions=questions, cleanup_spec=cleanup_spec)
+    # Final write: the in-memory dataset is not used afterwards, so prune it in place.
+    out_obj = _build_output_obj(container=container, questions=questions, cleanup_spec=cleanup_spec, inplace=True)
     save_json(args.output, out_obj)
     emit_progress(
         event="output_write_finished",
@@ -1829,7 +2091,7 @@ def rerun_postprocessing_from_output(
     schema_reconstruction: Dict[str, Any],
     schema_cluster_refinement: Dict[str, Any],
     schema_explainer: Dict[str, Any],
-    cleanup_spec: Optional[Dict[str, Any]] = None,
+    cleanup_spec: Optional[RuleFn] = None,
     knowledge_base: Optional[KnowledgeBase] = None,
     image_store: Optional[QuestionImageStore] = None,
     progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
@@ -2010,8 +2272,8 @@ def rerun_postprocessing_from_output(
                     if review_indices and isinstance(audit.get("answerPlausibility"), dict):
                         audit["answerPlausibility"]["finalAiCorrectIndices"] = review_indices
                     topic_key_review = review.get("finalTopicKey")
-                    if topic_key_review in key_map and isinstance(audit.get("topicFinal"), dict):
-                        topic_row_review = _topic_row_for_key(key_map, topic_key_review)
+                    topic_row_review = key_map.get(topic_key_review)
+                    if topic_row_review is not None and isinstance(audit.get("topicFinal"), dict):
                         audit["topicFinal"]["superTopic"] = topic_row_review["superTopicName"]
                         audit["topicFinal"]["subtopic"] = topic_row_review["subtopicName"]
                         audit["topicFinal"]["source"] = "review"
@@ -2265,7 +2527,8 @@ def rerun_postprocessing_from_output(
     )
 
     _remove_costs_from_question_audits(questions)
-    out_obj = _build_output_obj(container=container, questions=questions, cleanup_spec=cleanup_spec)
+    # Final write: the in-memory dataset is not used afterwards, so prune it in place.
+    out_obj = _build_output_obj(container=container, questions=questions, cleanup_spec=cleanup_spec, inplace=True)
     save_json(args.output, out_obj)
     cost_report_path = _save_cost_report_if_configured(args=args, records=cost_records, total_questions=total_questions, processed=(review_done + reconstruction_done + explainer_done), done=(review_done + reconstruction_done + explainer_done), skipped=skipped)
     if cost_report_path:
@@ -4,11 +4,10 @@ from __future__ import annotations
 
 import argparse
 import os
-from typing import Any, Dict, List, Tuple
 
 from ai_exam_analyzer.config import CONFIG
 from ai_exam_analyzer.image_store import QuestionImageStore
-from ai_exam_analyzer.io_utils import load_json, save_json
+from ai_exam_analyzer.io_utils import extract_questions, load_json, save_json
 from ai_exam_analyzer.workflow_context import build_dataset_context, cluster_abstractions
 
 
@@ -25,14 +24,6 @@ def _derive_output_path(input_path: str, requested_output: str) -> str:
     return os.path.join(input_dir, output_name) if input_dir else output_name
 
 
-def _extract_questions(data: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any] | None]:
-    if isinstance(data, dict) and "questions" in data:
-        return data["questions"], data
-    if isinstance(data, list):
-        return data, None
-    raise ValueError("Input must be a list of questions or {questions:[...]} object.")
-
-
 def build_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(
         description="Rerun only clustering on an existing dataset (without Pass A/B/Review).",
@@ -46,7 +37,7 @@ def build_parser() -> argparse.ArgumentParser:
         default=0.12,
         help=(
             "Weighted-Jaccard threshold for question-content clustering. "
-            f"Default 0.12 (relaxed vs pipeline default {CONFIG['TEXT_CLUSTER_SIMILARITY']})."
+            f"Default 0.12 (relaxed vs pipeline default {CONFIG.TEXT_CLUSTER_SIMILARITY})."
         ),
     )
     ap.add_argument(
@@ -55,7 +46,7 @@ def build_parser() -> argparse.ArgumentParser:
         default=0.18,
         help=(
             "Weighted-Jaccard threshold for abstraction clustering. "
-            f"Default 0.18 (relaxed vs pipeline default {CONFIG['ABSTRACTION_CLUSTER_SIMILARITY']})."
+            f"Default 0.18 (relaxed vs pipeline default {CONFIG.ABSTRACTION_CLUSTER_SIMILARITY})."
         ),
     )
     ap.add_argument(
@@ -71,7 +62,7 @@ def main() -> None:
     args.output = _derive_output_path(args.input, args.output)
 
     data = load_json(args.input)
-    questions, container = _extract_questions(data)
+    questions, container = extract_questions(data)
 
     image_store = None
     if args.images_zip:
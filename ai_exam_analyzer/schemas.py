@@ -81,6 +81,23 @@ def schema_pass_a(topic_keys: List[str]) -> Dict[str, Any]:
     }
 
 
+def schema_grouped(item_schema: Dict[str, Any], size: int) -> Dict[str, Any]:
+    """Wrap a per-question schema for one call answering ``size`` questions in order."""
+    return {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "minItems": size,
+                "maxItems": size,
+                "items": item_schema,
+            },
+        },
+        "required": ["results"],
+        "additionalProperties": False,
+    }
+
+
 def schema_pass_b(topic_keys: List[str]) -> Dict[str, Any]:
     return {
         "type": "object",
@@ -130,6 +147,19 @@ def schema_pass_b(topic_keys: List[str]) -> Dict[str, Any]:
     }
 
 
+def schema_pass_ab(pass_a_schema: Dict[str, Any], pass_b_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Pass A and its self-verification (Pass B fields) in one structured output."""
+    return {
+        "type": "object",
+        "properties": {
+            "passA": pass_a_schema,
+            "passB": pass_b_schema,
+        },
+        "required": ["passA", "passB"],
+        "additionalProperties": False,
+    }
+
+
 def schema_review_pass(topic_keys: List[str]) -> Dict[str, Any]:
     return {
         "type": "object",
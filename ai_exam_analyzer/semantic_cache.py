@@ -0,0 +1,81 @@
+"""Near-duplicate reuse of Pass A results within one run."""
+
+from __future__ import annotations
+
+import copy
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"[a-zäöüß0-9]{3,}")
+
+
+def _norm_text(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def _signature(payload: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Fields that must match exactly for a Pass A result to be reusable.
+
+    Pass A answers in terms of answerIndex and currentCorrectIndices, so only
+    variants with the same answer options and dataset solution can share it.
+    """
+    answers = tuple(
+        (int(a.get("answerIndex") or 0), _norm_text(str(a.get("text") or "")))
+        for a in payload.get("answers") or []
+    )
+    current = tuple(sorted(int(x) for x in payload.get("currentCorrectIndices") or []))
+    return answers, current
+
+
+def _similarity(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class SemanticCache:
+    """Reuse Pass A output for reworded variants of an already analysed question.
+
+    A lookup hits when the answer options and current solution are identical and
+    the question-text token sets reach ``threshold`` Jaccard similarity.
+    Questions with images are never cached: their visual content is not
+    compared.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = float(threshold)
+        self._entries: Dict[Tuple[Any, ...], List[Tuple[frozenset, str, Dict[str, Any]]]] = {}
+
+    @staticmethod
+    def _key(payload: Dict[str, Any]) -> Optional[Tuple[Tuple[Any, ...], frozenset]]:
+        if payload.get("hasImages"):
+            return None
+        tokens = frozenset(_TOKEN_RE.findall(str(payload.get("questionText") or "").lower()))
+        if not tokens:
+            return None
+        return _signature(payload), tokens
+
+    def lookup(self, payload: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return ``(source question id, copy of its Pass A result)`` or ``None``."""
+        key = self._key(payload)
+        if key is None:
+            return None
+        signature, tokens = key
+        best: Optional[Tuple[float, str, Dict[str, Any]]] = None
+        for cached_tokens, source_id, result in self._entries.get(signature, ()):
+            score = _similarity(tokens, cached_tokens)
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, source_id, result)
+        if best is None:
+            return None
+        return best[1], copy.deepcopy(best[2])
+
+    def store(self, payload: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Remember a result; callers should only store confident ones."""
+        key = self._key(payload)
+        if key is None:
+            return
+        signature, tokens = key
+        self._entries.setdefault(signature, []).append(
+            (tokens, str(payload.get("questionId") or ""), copy.deepcopy(result))
+        )
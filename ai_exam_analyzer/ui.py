@@ -1,11 +1,13 @@
 """Streamlit UI for local execution of the AI exam analyzer."""
 
 import os
+import sys
 from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
 
 import streamlit as st
 
+from ai_exam_analyzer.cleanup import compile_spec
 from ai_exam_analyzer.config import CONFIG
 from ai_exam_analyzer.cost_tracking import format_eur
 from ai_exam_analyzer.image_store import QuestionImageStore
@@ -74,12 +76,12 @@ def _provider_ui_defaults(provider: str) -> Dict[str, Any]:
             "low_conf_maintenance_threshold": 0.72,
         }
     return {
-        "pass_a_temperature": float(CONFIG["PASSA_TEMPERATURE"]),
-        "pass_b_reasoning_effort": CONFIG["PASSB_REASONING_EFFORT"],
-        "trigger_answer_conf": float(CONFIG["TRIGGER_ANSWER_CONF"]),
-        "trigger_topic_conf": float(CONFIG["TRIGGER_TOPIC_CONF"]),
-        "apply_change_min_conf_b": float(CONFIG["APPLY_CHANGE_MIN_CONF_B"]),
-        "low_conf_maintenance_threshold": float(CONFIG["LOW_CONF_MAINTENANCE_THRESHOLD"]),
+        "pass_a_temperature": float(CONFIG.PASSA_TEMPERATURE),
+        "pass_b_reasoning_effort": CONFIG.PASSB_REASONING_EFFORT,
+        "trigger_answer_conf": float(CONFIG.TRIGGER_ANSWER_CONF),
+        "trigger_topic_conf": float(CONFIG.TRIGGER_TOPIC_CONF),
+        "apply_change_min_conf_b": float(CONFIG.APPLY_CHANGE_MIN_CONF_B),
+        "low_conf_maintenance_threshold": float(CONFIG.LOW_CONF_MAINTENANCE_THRESHOLD),
     }
 
 def _get_default_documents_dir() -> str:
@@ -108,13 +110,13 @@ def _profile_defaults_for_widgets(provider: str, profile_name: str) -> Dict[str,
 
 
 def _apply_settings_to_ui_state(settings: Dict[str, Any]) -> None:
-    provider = str(settings.get("llm_provider") or st.session_state.get("llm_provider") or CONFIG["LLM_PROVIDER"])
+    provider = str(settings.get("llm_provider") or st.session_state.get("llm_provider") or CONFIG.LLM_PROVIDER)
     if provider not in {"openai", "gemini"}:
-        provider = str(CONFIG["LLM_PROVIDER"])
+        provider = str(CONFIG.LLM_PROVIDER)
 
-    profile_name = str(settings.get("quality_cost_profile") or st.session_state.get("quality_cost_profile") or CONFIG["QUALITY_COST_PROFILE"])
+    profile_name = str(settings.get("quality_cost_profile") or st.session_state.get("quality_cost_profile") or CONFIG.QUALITY_COST_PROFILE)
     if profile_name not in QUALITY_PROFILE_OPTIONS:
-        profile_name = str(CONFIG["QUALITY_COST_PROFILE"])
+        profile_name = str(CONFIG.QUALITY_COST_PROFILE)
 
     st.session_state["llm_provider"] = provider
     st.session_state["quality_cost_profile"] = profile_name
@@ -297,12 +299,12 @@ def _build_args() -> SimpleNamespace:
     data_folder = st.session_state["data_folder"]
     output_folder = st.session_state["output_folder"]
 
-    input_default_name = os.path.basename(CONFIG["INPUT_PATH"]) or "export.json"
-    topics_default_name = os.path.basename(CONFIG["TOPICS_PATH"]) or "topic-tree.json"
-    output_default_name = os.path.basename(CONFIG["OUTPUT_PATH"]) or ""
-    images_zip_default_name = os.path.basename(CONFIG["IMAGES_ZIP_PATH"]) or "images.zip"
-    knowledge_zip_default_name = os.path.basename(CONFIG["KNOWLEDGE_ZIP_PATH"]) or "knowledge.zip"
-    knowledge_index_default_name = os.path.basename(CONFIG["KNOWLEDGE_INDEX_PATH"]) or "knowledge.index.json"
+    input_default_name = os.path.basename(CONFIG.INPUT_PATH) or "export.json"
+    topics_default_name = os.path.basename(CONFIG.TOPICS_PATH) or "topic-tree.json"
+    output_default_name = os.path.basename(CONFIG.OUTPUT_PATH) or ""
+    images_zip_default_name = os.path.basename(CONFIG.IMAGES_ZIP_PATH) or "images.zip"
+    knowledge_zip_default_name = os.path.basename(CONFIG.KNOWLEDGE_ZIP_PATH) or "knowledge.zip"
+    knowledge_index_default_name = os.path.basename(CONFIG.KNOWLEDGE_INDEX_PATH) or "knowledge.index.json"
 
     with st.sidebar:
         st.header("Einstellungen")
@@ -514,7 +516,7 @@ def _build_args() -> SimpleNamespace:
                 knowledge_index = ""
 
             inferred_subject_hint = _infer_subject_hint_from_topic_tree(topics_path)
-            subject_hint_default = inferred_subject_hint or CONFIG["KNOWLEDGE_SUBJECT_HINT"]
+            subject_hint_default = inferred_subject_hint or CONFIG.KNOWLEDGE_SUBJECT_HINT
             if "knowledge_subject_hint" not in st.session_state:
                 st.session_state["knowledge_subject_hint"] = subject_hint_default
             if "knowledge_subject_hint_last_default" not in st.session_state:
@@ -532,7 +534,7 @@ def _build_args() -> SimpleNamespace:
             llm_provider = st.selectbox(
                 "LLM Provider",
                 options=["openai", "gemini"],
-                index=0 if CONFIG["LLM_PROVIDER"] == "openai" else 1,
+                index=0 if CONFIG.LLM_PROVIDER == "openai" else 1,
                 key="llm_provider",
                 help="Wählt den Modellanbieter für alle KI-Schritte. OpenAI und Gemini verwenden unterschiedliche Modellnamen, Kostenstrukturen und Kontextfenster. Ein Wechsel setzt provider-spezifische Profildefaults; danach können die angezeigten Parameter weiter angepasst werden.",
             )
@@ -544,7 +546,7 @@ def _build_args() -> SimpleNamespace:
                 value=api_key_value,
                 help="API-Key für den Zugriff auf den gewählten Provider. Der Key wird für diese Sitzung als Umgebungsvariable gesetzt, aber nicht in gespeicherte UI-Konfigurationen geschrieben.",
             )
-            profile_default = str(CONFIG.get("QUALITY_COST_PROFILE", "quality"))
+            profile_default = str(CONFIG.QUALITY_COST_PROFILE)
             profile_default_index = QUALITY_PROFILE_OPTIONS.index(profile_default) if profile_default in QUALITY_PROFILE_OPTIONS else 1
             quality_cost_profile = st.selectbox(
                 "Priorität",
@@ -577,18 +579,18 @@ def _build_args() -> SimpleNamespace:
             )
         auto_dataset_tuning = bool(is_tuning_only)
 
-        checkpoint_every = int(CONFIG["CHECKPOINT_EVERY"])
-        text_cluster_similarity = float(CONFIG["TEXT_CLUSTER_SIMILARITY"])
-        abstraction_cluster_similarity = float(CONFIG["ABSTRACTION_CLUSTER_SIMILARITY"])
+        checkpoint_every = int(CONFIG.CHECKPOINT_EVERY)
+        text_cluster_similarity = float(CONFIG.TEXT_CLUSTER_SIMILARITY)
+        abstraction_cluster_similarity = float(CONFIG.ABSTRACTION_CLUSTER_SIMILARITY)
         enable_review_pass = False if is_explainer_only else bool(selected_profile.enable_review_pass)
-        review_min_maintenance_severity = int(CONFIG["REVIEW_MIN_MAINTENANCE_SEVERITY"])
+        review_min_maintenance_severity = int(CONFIG.REVIEW_MIN_MAINTENANCE_SEVERITY)
         enable_reconstruction_pass = False if is_explainer_only else bool(selected_profile.enable_reconstruction_pass)
         force_rerun_review = False
         force_rerun_reconstruction = False
         force_rerun_explainer = False
-        resume = bool(CONFIG["RESUME"])
-        limit = int(CONFIG["LIMIT"])
-        sleep_seconds = float(CONFIG["SLEEP"])
+        resume = bool(CONFIG.RESUME)
+        limit = int(CONFIG.LIMIT)
+        sleep_seconds = float(CONFIG.SLEEP)
         pass_a_model = str(default_pass_a_model)
         pass_b_model = str(default_pass_b_model)
         review_model = str(default_review_model)
@@ -599,16 +601,16 @@ def _build_args() -> SimpleNamespace:
         trigger_topic_conf = float(provider_defaults["trigger_topic_conf"])
         apply_change_min_conf_b = float(provider_defaults["apply_change_min_conf_b"])
         low_conf_maintenance_threshold = float(provider_defaults["low_conf_maintenance_threshold"])
-        enable_repeat_reconstruction = bool(CONFIG["ENABLE_REPEAT_RECONSTRUCTION"])
-        auto_apply_repeat_reconstruction = bool(CONFIG["AUTO_APPLY_REPEAT_RECONSTRUCTION"])
-        repeat_min_similarity = float(CONFIG["REPEAT_MIN_SIMILARITY"])
-        repeat_min_anchor_conf = float(CONFIG["REPEAT_MIN_ANCHOR_CONF"])
-        repeat_min_anchor_consensus = int(CONFIG["REPEAT_MIN_ANCHOR_CONSENSUS"])
-        repeat_min_match_ratio = float(CONFIG["REPEAT_MIN_MATCH_RATIO"])
-        enable_explainer_pass = bool(CONFIG["ENABLE_EXPLAINER_PASS"])
+        enable_repeat_reconstruction = bool(CONFIG.ENABLE_REPEAT_RECONSTRUCTION)
+        auto_apply_repeat_reconstruction = bool(CONFIG.AUTO_APPLY_REPEAT_RECONSTRUCTION)
+        repeat_min_similarity = float(CONFIG.REPEAT_MIN_SIMILARITY)
+        repeat_min_anchor_conf = float(CONFIG.REPEAT_MIN_ANCHOR_CONF)
+        repeat_min_anchor_consensus = int(CONFIG.REPEAT_MIN_ANCHOR_CONSENSUS)
+        repeat_min_match_ratio = float(CONFIG.REPEAT_MIN_MATCH_RATIO)
+        enable_explainer_pass = bool(CONFIG.ENABLE_EXPLAINER_PASS)
         explainer_model = str(default_explainer_model)
-        write_top_level = bool(CONFIG["WRITE_TOP_LEVEL"])
-        debug = bool(CONFIG["DEBUG"])
+        write_top_level = bool(CONFIG.WRITE_TOP_LEVEL)
+        debug = bool(CONFIG.DEBUG)
 
         if is_tuning_only:
             st.info("Parameter-Einstellung: Es werden nur Datenquellen, API und Knowledge-Base angezeigt. Die Detailparameter werden durch die Analyse ermittelt und anschließend als Konfig gespeichert.")
@@ -623,7 +625,7 @@ def _build_args() -> SimpleNamespace:
                 checkpoint_every = st.number_input(
                     "Checkpoint alle N Fragen",
                     min_value=1,
-                    value=int(CONFIG["CHECKPOINT_EVERY"]),
+                    value=int(CONFIG.CHECKPOINT_EVERY),
                     key="checkpoint_every",
                     help="Auch im Explainer-only-Modus werden Zwischenergebnisse geschrieben. Niedrigere Werte reduzieren Datenverlust bei Abbruch, höhere Werte schreiben seltener.",
                 )
@@ -631,7 +633,7 @@ def _build_args() -> SimpleNamespace:
                     "Question-Cluster Similarity",
                     0.0,
                     1.0,
-                    float(CONFIG["TEXT_CLUSTER_SIMILARITY"]),
+                    float(CONFIG.TEXT_CLUSTER_SIMILARITY),
                     0.01,
                     key="text_cluster_similarity",
                     help="Wird im Postprocessing-Kontext zur Aktualisierung von Frage-Clustern verwendet. Niedriger gruppiert mehr, höher ist strenger.",
@@ -640,7 +642,7 @@ def _build_args() -> SimpleNamespace:
                     "Abstraction-Cluster Similarity",
                     0.0,
                     1.0,
-                    float(CONFIG["ABSTRACTION_CLUSTER_SIMILARITY"]),
+                    float(CONFIG.ABSTRACTION_CLUSTER_SIMILARITY),
                     0.01,
                     key="abstraction_cluster_similarity",
                     help="Wird am Ende des Postprocessing-Laufs für Abstraktionscluster genutzt. Niedriger gruppiert breiter, höher trennt stärker.",
@@ -654,7 +656,7 @@ def _build_args() -> SimpleNamespace:
                 st.caption(f"Explainer Modell: `{explainer_model}`")
                 write_top_level = st.checkbox(
                     "Top-Level ai* Felder schreiben",
-                    value=CONFIG["WRITE_TOP_LEVEL"],
+                    value=CONFIG.WRITE_TOP_LEVEL,
                     key="write_top_level",
                     help="Wird auch in Postprocessing-Läufen angewendet. Aktiv aktualisiert praktische ai*-Kurzfelder auf Fragenebene; deaktiviert verändert nur aiAudit und hält den Export schlanker.",
                 )
@@ -664,7 +666,7 @@ def _build_args() -> SimpleNamespace:
                 checkpoint_every = st.number_input(
                     "Checkpoint alle N Fragen",
                     min_value=1,
-                    value=int(CONFIG["CHECKPOINT_EVERY"]),
+                    value=int(CONFIG.CHECKPOINT_EVERY),
                     key="checkpoint_every",
                     help="Postprocessing speichert ebenfalls Zwischenergebnisse. Niedrigere Werte reduzieren Datenverlust bei Abbruch, höhere Werte schreiben seltener.",
                 )
@@ -672,7 +674,7 @@ def _build_args() -> SimpleNamespace:
                     "Question-Cluster Similarity",
                     0.0,
                     1.0,
-                    float(CONFIG["TEXT_CLUSTER_SIMILARITY"]),
+                    float(CONFIG.TEXT_CLUSTER_SIMILARITY),
                     0.01,
                     key="text_cluster_similarity",
                     help="Postprocessing aktualisiert Frage-Cluster. Niedrigere Werte gruppieren mehr Fragen zusammen, höhere Werte sind konservativer.",
@@ -681,7 +683,7 @@ def _build_args() -> SimpleNamespace:
                     "Abstraction-Cluster Similarity",
                     0.0,
                     1.0,
-                    float(CONFIG["ABSTRACTION_CLUSTER_SIMILARITY"]),
+                    float(CONFIG.ABSTRACTION_CLUSTER_SIMILARITY),
                     0.01,
                     key="abstraction_cluster_similarity",
                     help="Postprocessing aktualisiert Abstraktionscluster. Niedrigere Werte erlauben breitere Gruppen, höhere Werte trennen stärker.",
@@ -697,7 +699,7 @@ def _build_args() -> SimpleNamespace:
                     review_min_maintenance_severity = st.select_slider(
                         "Pass C ab Wartungs-Severity",
                         options=[1, 2, 3],
-                        value=int(CONFIG["REVIEW_MIN_MAINTENANCE_SEVERITY"]),
+                        value=int(CONFIG.REVIEW_MIN_MAINTENANCE_SEVERITY),
                         key="review_min_maintenance_severity",
                         help="Pass C läuft nur ab diesem Wartungs-Schweregrad. Niedrigere Werte prüfen mehr Fragen gründlich und erhöhen Qualität/Kosten. Höhere Werte beschränken den teuren Review auf kritischere Fälle.",
                     )
@@ -721,7 +723,7 @@ def _build_args() -> SimpleNamespace:
                     )
                 enable_explainer_pass = st.checkbox(
                     "Explainer-Pass aktivieren",
-                    value=bool(CONFIG["ENABLE_EXPLAINER_PASS"]),
+                    value=bool(CONFIG.ENABLE_EXPLAINER_PASS),
                     key="enable_explainer_pass",
                     help="Erzeugt didaktische Erklärungen auf bestehendem aiAudit. Aktiv verbessert Nachvollziehbarkeit, erzeugt aber zusätzliche Modellkosten.",
                 )
@@ -735,7 +737,7 @@ def _build_args() -> SimpleNamespace:
                     )
                 write_top_level = st.checkbox(
                     "Top-Level ai* Felder schreiben",
-                    value=CONFIG["WRITE_TOP_LEVEL"],
+                    value=CONFIG.WRITE_TOP_LEVEL,
                     key="write_top_level",
                     help="Postprocessing kann ai*-Kurzfelder aus dem aktualisierten aiAudit neu schreiben. Aktiv erleichtert Weiterverarbeitung; deaktiviert belässt Änderungen primär im aiAudit.",
                 )
@@ -744,7 +746,7 @@ def _build_args() -> SimpleNamespace:
                 checkpoint_every = st.number_input(
                     "Checkpoint alle N Fragen",
                     min_value=1,
-                    value=int(CONFIG["CHECKPOINT_EVERY"]),
+                    value=int(CONFIG.CHECKPOINT_EVERY),
                     key="checkpoint_every",
                     help="Speichert regelmäßig Zwischenergebnisse. Niedrigere Werte reduzieren Datenverlust bei Abbruch, erzeugen aber mehr Schreibzugriffe. Höhere Werte sind etwas schneller, riskieren aber größere Wiederholungen nach Fehlern.",
                 )
@@ -752,7 +754,7 @@ def _build_args() -> SimpleNamespace:
                     "Question-Cluster Similarity",
                     0.0,
                     1.0,
-                    float(CONFIG["TEXT_CLUSTER_SIMILARITY"]),
+                    float(CONFIG.TEXT_CLUSTER_SIMILARITY),
                     0.01,
                     key="text_cluster_similarity",
                     help="Ähnlichkeitsschwelle für inhaltliche Frage-Cluster. Niedrigere Werte gruppieren mehr Fragen zusammen und können Wiederholungen stärker nutzen, riskieren aber falsche Cluster. Höhere Werte sind strenger und sicherer, finden aber weniger verwandte Fragen.",
@@ -761,7 +763,7 @@ def _build_args() -> SimpleNamespace:
                     "Abstraction-Cluster Similarity",
                     0.0,
                     1.0,
-                    float(CONFIG["ABSTRACTION_CLUSTER_SIMILARITY"]),
+                    float(CONFIG.ABSTRACTION_CLUSTER_SIMILARITY),
                     0.01,
                     key="abstraction_cluster_similarity",
                     help="Ähnlichkeitsschwelle für Cluster der abstrahierten Fragen. Niedrigere Werte erlauben breitere thematische Gruppen; höhere Werte halten Cluster enger und reduzieren falsch zusammengeführte Themen.",
@@ -777,7 +779,7 @@ def _build_args() -> SimpleNamespace:
                 review_min_maintenance_severity = st.select_slider(
                     "Pass C ab Wartungs-Severity",
                     options=[1, 2, 3],
-                    value=int(CONFIG["REVIEW_MIN_MAINTENANCE_SEVERITY"]),
+                    value=int(CONFIG.REVIEW_MIN_MAINTENANCE_SEVERITY),
                     key="review_min_maintenance_severity",
                     help="Pass C läuft nur ab diesem Wartungs-Schweregrad. Niedrigere Werte prüfen mehr Fragen gründlich und erhöhen Qualität/Kosten. Höhere Werte beschränken den teuren Review auf kritischere Fälle.",
                     disabled=not enable_review_pass,
@@ -790,12 +792,12 @@ def _build_args() -> SimpleNamespace:
                 )
                 reconstruction_model = str(default_reconstruction_model)
                 st.caption(f"Reconstruction Modell: `{reconstruction_model}`")
-                resume = st.checkbox("Resume aktiv", value=CONFIG["RESUME"], key="resume", help="Überspringt bereits abgeschlossene Fragen mit passender Pipeline-Version. Aktiv spart Kosten bei Fortsetzungen; deaktiviert erzwingt eine vollständige Neuberechnung und kann bestehende KI-Annotationen aktualisieren.")
-                limit = st.number_input("Limit (0 = alle Fragen)", min_value=0, value=int(CONFIG["LIMIT"]), key="limit", help="Begrenzt die Anzahl verarbeiteter Fragen. 0 verarbeitet alles. Kleine Werte eignen sich für kostengünstige Testläufe; höhere Werte bzw. 0 führen den kompletten Workflow aus.")
+                resume = st.checkbox("Resume aktiv", value=CONFIG.RESUME, key="resume", help="Überspringt bereits abgeschlossene Fragen mit passender Pipeline-Version. Aktiv spart Kosten bei Fortsetzungen; deaktiviert erzwingt eine vollständige Neuberechnung und kann bestehende KI-Annotationen aktualisieren.")
+                limit = st.number_input("Limit (0 = alle Fragen)", min_value=0, value=int(CONFIG.LIMIT), key="limit", help="Begrenzt die Anzahl verarbeiteter Fragen. 0 verarbeitet alles. Kleine Werte eignen sich für kostengünstige Testläufe; höhere Werte bzw. 0 führen den kompletten Workflow aus.")
                 sleep_seconds = st.number_input(
                     "Pause je Frage (Sek.)",
                     min_value=0.0,
-                    value=float(CONFIG["SLEEP"]),
+                    value=float(CONFIG.SLEEP),
                     step=0.05,
                     key="sleep_seconds",
                     help="Kurze Pause zwischen zwei API-Aufrufen. Höhere Werte schonen Rate-Limits und reduzieren temporäre API-Fehler, verlängern aber die Laufzeit. Niedrigere Werte sind schneller, können bei großen Datensätzen aber eher Rate-Limits treffen.",
@@ -826,24 +828,24 @@ def _build_args() -> SimpleNamespace:
                 low_conf_maintenance_threshold = st.slider("Wartung markieren unter Confidence", 0.0, 1.0, float(provider_defaults["low_conf_maintenance_threshold"]), 0.01, key=f"{llm_provider}_low_conf_maintenance_threshold", help="Unterhalb dieser Gesamt-Confidence wird eine Frage als Wartungskandidat markiert. Niedrigere Werte erzeugen weniger Warnungen, können Problemfälle übersehen. Höhere Werte markieren mehr Fragen zur Prüfung und erhöhen die Review-Last.")
                 enable_repeat_reconstruction = st.checkbox(
                     "Repeat-Reconstruction aktivieren",
-                    value=bool(CONFIG["ENABLE_REPEAT_RECONSTRUCTION"]),
+                    value=bool(CONFIG.ENABLE_REPEAT_RECONSTRUCTION),
                     key="enable_repeat_reconstruction",
                     help="Erkennt wiederholte Fragen über Jahrgänge und ergänzt entsprechende Audit-Signale. Aktiv kann Qualität verbessern und Kosten sparen, weil Muster genutzt werden. Deaktiviert vermeidet falsche Wiederholungsannahmen bei sehr heterogenen Datensätzen.",
                 )
                 auto_apply_repeat_reconstruction = st.checkbox(
                     "Repeat-Reconstruction Auto-Apply (nur Audit-Suggestion)",
-                    value=bool(CONFIG["AUTO_APPLY_REPEAT_RECONSTRUCTION"]),
+                    value=bool(CONFIG.AUTO_APPLY_REPEAT_RECONSTRUCTION),
                     key="auto_apply_repeat_reconstruction",
                     help="Wendet sichere Repeat-Reconstruction-Vorschläge automatisch als Audit-Suggestion an. Aktiv spart manuelle Prüfung bei klaren Wiederholungen; deaktiviert hält alle Vorschläge rein informativ.",
                     disabled=(not enable_repeat_reconstruction),
                 )
-                repeat_min_similarity = st.slider("Repeat: Min Similarity", 0.0, 1.0, float(CONFIG["REPEAT_MIN_SIMILARITY"]), 0.01, key="repeat_min_similarity", help="Mindestähnlichkeit, ab der Fragen als Wiederholungs-Kandidaten gelten. Niedrigere Werte finden mehr Kandidaten, riskieren aber falsche Matches. Höhere Werte sind sicherer, übersehen aber abgewandelte Wiederholungen.", disabled=(not enable_repeat_reconstruction))
-                repeat_min_anchor_conf = st.slider("Repeat: Min Anchor Confidence", 0.0, 1.0, float(CONFIG["REPEAT_MIN_ANCHOR_CONF"]), 0.01, key="repeat_min_anchor_conf", help="Mindestvertrauen für Ankerfragen, deren bekannte Bewertung Wiederholungen stützen darf. Niedriger nutzt mehr Anker, aber mit höherem Fehlerrisiko. Höher nutzt nur sehr sichere Anker und ist konservativer.", disabled=(not enable_repeat_reconstruction))
-                repeat_min_anchor_consensus = st.number_input("Repeat: Min Anchor Consensus", min_value=1, value=int(CONFIG["REPEAT_MIN_ANCHOR_CONSENSUS"]), step=1, key="repeat_min_anchor_consensus", help="Mindestanzahl unabhängiger Anker, die dieselbe Richtung stützen müssen. Niedrigere Werte sind sensitiver und günstiger; höhere Werte erhöhen Sicherheit, benötigen aber mehr passende Wiederholungen.", disabled=(not enable_repeat_reconstruction))
-                repeat_min_match_ratio = st.slider("Repeat: Min Match Ratio", 0.0, 1.0, float(CONFIG["REPEAT_MIN_MATCH_RATIO"]), 0.01, key="repeat_min_match_ratio", help="Mindestüberlappung zwischen Antworttexten von Anker und Ziel. Niedriger toleriert stärkere Umformulierungen, höher verlangt nahezu identische Antwortoptionen und reduziert Fehlübernahmen.", disabled=(not enable_repeat_reconstruction))
+                repeat_min_similarity = st.slider("Repeat: Min Similarity", 0.0, 1.0, float(CONFIG.REPEAT_MIN_SIMILARITY), 0.01, key="repeat_min_similarity", help="Mindestähnlichkeit, ab der Fragen als Wiederholungs-Kandidaten gelten. Niedrigere Werte finden mehr Kandidaten, riskieren aber falsche Matches. Höhere Werte sind sicherer, übersehen aber abgewandelte Wiederholungen.", disabled=(not enable_repeat_reconstruction))
+                repeat_min_anchor_conf = st.slider("Repeat: Min Anchor Confidence", 0.0, 1.0, float(CONFIG.REPEAT_MIN_ANCHOR_CONF), 0.01, key="repeat_min_anchor_conf", help="Mindestvertrauen für Ankerfragen, deren bekannte Bewertung Wiederholungen stützen darf. Niedriger nutzt mehr Anker, aber mit höherem Fehlerrisiko. Höher nutzt nur sehr sichere Anker und ist konservativer.", disabled=(not enable_repeat_reconstruction))
+                repeat_min_anchor_consensus = st.number_input("Repeat: Min Anchor Consensus", min_value=1, value=int(CONFIG.REPEAT_MIN_ANCHOR_CONSENSUS), step=1, key="repeat_min_anchor_consensus", help="Mindestanzahl unabhängiger Anker, die dieselbe Richtung stützen müssen. Niedrigere Werte sind sensitiver und günstiger; höhere Werte erhöhen Sicherheit, benötigen aber mehr passende Wiederholungen.", disabled=(not enable_repeat_reconstruction))
+                repeat_min_match_ratio = st.slider("Repeat: Min Match Ratio", 0.0, 1.0, float(CONFIG.REPEAT_MIN_MATCH_RATIO), 0.01, key="repeat_min_match_ratio", help="Mindestüberlappung zwischen Antworttexten von Anker und Ziel. Niedriger toleriert stärkere Umformulierungen, höher verlangt nahezu identische Antwortoptionen und reduziert Fehlübernahmen.", disabled=(not enable_repeat_reconstruction))
                 enable_explainer_pass = st.checkbox(
                     "Explainer-Pass aktivieren",
-                    value=bool(CONFIG["ENABLE_EXPLAINER_PASS"]),
+                    value=bool(CONFIG.ENABLE_EXPLAINER_PASS),
                     key="enable_explainer_pass",
                     help="Erzeugt eine didaktische Erklärung pro Frage im Audit. Aktiv liefert bessere Nachvollziehbarkeit für Lern-/Review-Zwecke, verursacht aber zusätzliche Modellkosten. Deaktiviert spart Kosten und Laufzeit.",
                 )
@@ -851,13 +853,13 @@ def _build_args() -> SimpleNamespace:
                 st.caption(f"Explainer Modell: `{explainer_model}`")
                 write_top_level = st.checkbox(
                     "Top-Level ai* Felder schreiben",
-                    value=CONFIG["WRITE_TOP_LEVEL"],
+                    value=CONFIG.WRITE_TOP_LEVEL,
                     key="write_top_level",
                     help="Schreibt zusätzliche ai*-Felder direkt in jede Frage. Aktiv erleichtert Export/Weiterverarbeitung. Deaktiviert hält die Ausgabe schlanker und belässt Details primär im aiAudit.",
                 )
                 debug = st.checkbox(
                     "Debug-Rohdaten speichern",
-                    value=CONFIG["DEBUG"],
+                    value=CONFIG.DEBUG,
                     key="debug",
                     help="Speichert detaillierte Rohantworten unter aiAudit._debug. Aktiv hilft bei Fehlersuche und Qualitätsprüfung, vergrößert aber Ausgaben und kann sensible Prompt-/Antwortdetails enthalten. Deaktiviert ist schlanker.",
                 )
@@ -866,7 +868,7 @@ def _build_args() -> SimpleNamespace:
         knowledge_top_k = int(kb_budget_defaults.knowledge_top_k)
         knowledge_max_chars = int(kb_budget_defaults.knowledge_max_chars)
         knowledge_min_score = float(kb_budget_defaults.knowledge_min_score)
-        knowledge_chunk_chars = int(CONFIG["KNOWLEDGE_CHUNK_CHARS"])
+        knowledge_chunk_chars = int(CONFIG.KNOWLEDGE_CHUNK_CHARS)
 
         if is_full_analysis or is_tuning_only:
             with st.expander("🧠 Knowledge Base", expanded=False):
@@ -905,7 +907,7 @@ def _build_args() -> SimpleNamespace:
                 knowledge_chunk_chars = st.number_input(
                     "Knowledge Chunk Chars",
                     min_value=200,
-                    value=int(CONFIG["KNOWLEDGE_CHUNK_CHARS"]),
+                    value=int(CONFIG.KNOWLEDGE_CHUNK_CHARS),
                     step=100,
                     key="knowledge_chunk_chars",
                     help="Chunk-Größe beim Parsen der Knowledge-ZIP. Kleinere Chunks erlauben präzisere Treffer, können aber Zusammenhänge zerlegen. Größere Chunks behalten Kontext, erhöhen jedoch Prompt-Länge und Kosten pro Treffer.",
@@ -1009,10 +1011,10 @@ def _build_args() -> SimpleNamespace:
         enable_review_pass=bool(enable_review_pass),
         review_model=review_model.strip(),
         review_min_maintenance_severity=int(review_min_maintenance_severity),
-        topic_candidate_top_k=int(CONFIG["TOPIC_CANDIDATE_TOP_K"]),
-        run_report=str(CONFIG.get("RUN_REPORT_PATH", "")),
-        cost_report=str(CONFIG.get("COST_REPORT_PATH", "")),
-        topic_candidate_outside_force_passb_conf=float(CONFIG["TOPIC_CANDIDATE_OUTSIDE_FORCE_PASSB_CONF"]),
+        topic_candidate_top_k=int(CONFIG.TOPIC_CANDIDATE_TOP_K),
+        run_report=str(CONFIG.RUN_REPORT_PATH),
+        cost_report=str(CONFIG.COST_REPORT_PATH),
+        topic_candidate_outside_force_passb_conf=float(CONFIG.TOPIC_CANDIDATE_OUTSIDE_FORCE_PASSB_CONF),
         enable_repeat_reconstruction=bool(enable_repeat_reconstruction),
         auto_apply_repeat_reconstruction=bool(auto_apply_repeat_reconstruction),
         repeat_min_similarity=float(repeat_min_similarity),
@@ -1127,13 +1129,14 @@ def main() -> None:
     env_name = "OPENAI_API_KEY" if args.llm_provider == "openai" else "GEMINI_API_KEY"
     os.environ[env_name] = args.api_key
 
+    image_store: Optional[QuestionImageStore] = None
     try:
         show_live_step("initialisierung", "Lade Topic-Tree …", progress=0.03, detail=args.topics)
         topic_tree = load_json(args.topics)
         show_live_step("initialisierung", "Baue Topic-Katalog …", progress=0.07)
         catalog, key_map = build_topic_catalog(topic_tree)
         topic_keys = [row["topicKey"] for row in catalog]
-        topic_catalog_text = format_topic_catalog_for_prompt(catalog)
+        topic_catalog_text = sys.intern(format_topic_catalog_for_prompt(catalog))
 
         show_live_step("initialisierung", f"Erzeuge JSON-Schemas für {len(topic_keys)} Topic-Keys …", progress=0.11)
         schema_a = schema_pass_a(topic_keys)
@@ -1157,7 +1160,7 @@ def main() -> None:
         show_live_step("initialisierung", f"Datensatz geladen ({len(questions)} Fragen).", progress=0.22)
         if args.cleanup_spec:
             show_live_step("initialisierung", "Lade Cleanup-Spezifikation …", progress=0.25, detail=args.cleanup_spec)
-        cleanup_spec = load_json(args.cleanup_spec) if args.cleanup_spec else None
+        cleanup_spec = compile_spec(load_json(args.cleanup_spec), share_leaves=True) if args.cleanup_spec else None
         if args.images_zip:
             show_live_step("initialisierung", "Bereite Fragenbilder vor …", progress=0.30, detail=args.images_zip)
         image_store = _prepare_image_store(args)
@@ -1319,6 +1322,9 @@ def main() -> None:
 
     except Exception as exc:
         st.exception(exc)
+    finally:
+        if image_store is not None:
+            image_store.close()
 
 
 if __name__ == "__main__":